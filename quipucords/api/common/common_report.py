@@ -11,14 +11,21 @@
 
 """Util for common report operations."""
 
+import base64
+import codecs
+import csv
+import hashlib
 import io
 import json
 import logging
 import os
 import tarfile
+import tempfile
 import time
+import zlib
 
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
 
 from quipucords.environment import server_version
 
@@ -33,6 +40,12 @@ REPORT_TYPE_CHOICES = (
     (REPORT_TYPE_DEPLOYMENT, REPORT_TYPE_DEPLOYMENT),
 )
 
+# Size of the chunks report bundles are written and streamed in
+TAR_CHUNK_SIZE = 64 * 1024
+
+# Prefix of the cached csv reports stored gzip compressed and base64 encoded
+COMPRESSED_CSV_PREFIX = "gzip+base64:"
+
 
 def create_report_version():
     """Create the report version string."""
@@ -128,6 +141,218 @@ def create_tar_buffer(files_data):
     return tar_buffer
 
 
+def iter_encoded_json(content, chunk_size=TAR_CHUNK_SIZE):
+    """Encode content as JSON in chunks of about chunk_size bytes.
+
+    The output is the same as encode_content(content, "json"), but only the
+    items of the top level dicts and lists are encoded at once.
+    :param content: the JSON serializable content
+    :param chunk_size: minimum size of the yielded chunks (but the last)
+    :yields: the JSON encoded content as bytes
+    """
+    renderer = JSONRenderer()
+    encoder = JSONEncoder(
+        ensure_ascii=renderer.ensure_ascii,
+        allow_nan=not renderer.strict,
+        separators=(",", ":"),
+    )
+
+    def _iter_json(value, depth):
+        if (
+            depth
+            and isinstance(value, dict)
+            and all(isinstance(key, str) for key in value)
+        ):
+            yield "{"
+            for index, (key, item) in enumerate(value.items()):
+                yield ("," if index else "") + encoder.encode(key) + ":"
+                yield from _iter_json(item, depth - 1)
+            yield "}"
+        elif depth and isinstance(value, (list, tuple)):
+            yield "["
+            for index, item in enumerate(value):
+                if index:
+                    yield ","
+                yield from _iter_json(item, depth - 1)
+            yield "]"
+        else:
+            yield encoder.encode(value)
+
+    pending = []
+    pending_size = 0
+    for piece in _iter_json(content, depth=3):
+        # same escaping done by JSONRenderer
+        pending.append(piece.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029"))
+        pending_size += len(piece)
+        if pending_size >= chunk_size:
+            yield "".join(pending).encode("utf-8")
+            pending = []
+            pending_size = 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def iter_encoded_text(content, chunk_size=TAR_CHUNK_SIZE):
+    """Encode text content as UTF-8 in chunks of chunk_size characters.
+
+    :param content: str to encode
+    :param chunk_size: number of characters encoded at once
+    :yields: the encoded content as bytes
+    """
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size].encode("utf-8")
+
+
+def iter_csv_rows(rows, chunk_size=TAR_CHUNK_SIZE):
+    """Format rows as CSV in chunks of about chunk_size characters.
+
+    :param rows: iterable of rows (lists of values)
+    :param chunk_size: minimum size of the yielded chunks (but the last)
+    :yields: the CSV text as str
+    """
+    csv_buffer = io.StringIO()
+    csv_writer = csv.writer(csv_buffer, delimiter=",")
+    for row in rows:
+        csv_writer.writerow(row)
+        if csv_buffer.tell() >= chunk_size:
+            yield csv_buffer.getvalue()
+            csv_buffer.seek(0)
+            csv_buffer.truncate()
+    if csv_buffer.tell():
+        yield csv_buffer.getvalue()
+
+
+def cache_csv(csv_chunks, save_cached_csv):
+    """Yield csv_chunks and cache them compressed once all were yielded.
+
+    :param csv_chunks: iterable of the CSV text chunks
+    :param save_cached_csv: function saving the cached CSV (a str)
+    :yields: csv_chunks
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    compressed_chunks = []
+    for chunk in csv_chunks:
+        compressed_chunks.append(compressor.compress(chunk.encode("utf-8")))
+        yield chunk
+    compressed_chunks.append(compressor.flush())
+    save_cached_csv(
+        COMPRESSED_CSV_PREFIX + base64.b64encode(b"".join(compressed_chunks)).decode()
+    )
+
+
+def iter_cached_csv(cached_csv, chunk_size=TAR_CHUNK_SIZE):
+    """Yield the CSV text of a csv report cached by cache_csv.
+
+    :param cached_csv: the cached CSV, compressed or, if cached by a previous
+        version, plain text
+    :param chunk_size: size of the compressed chunks decompressed at once
+    :yields: the CSV text as str
+    """
+    if not cached_csv.startswith(COMPRESSED_CSV_PREFIX):
+        yield cached_csv
+        return
+    compressed = base64.b64decode(cached_csv[len(COMPRESSED_CSV_PREFIX) :])
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(compressed), chunk_size):
+        chunk = decoder.decode(
+            decompressor.decompress(compressed[start : start + chunk_size])
+        )
+        if chunk:
+            yield chunk
+    chunk = decoder.decode(decompressor.flush(), final=True)
+    if chunk:
+        yield chunk
+
+
+class _ChunkSink:
+    """Write only file object collecting the chunks written to it."""
+
+    def __init__(self):
+        """Initialize _ChunkSink."""
+        self.chunks = []
+
+    def write(self, data):
+        """Collect data."""
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Return and forget the chunks written so far."""
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def _tar_member_blocks(tar_file, info, fileobj, chunk_size):
+    """Write a member to a tar stream, one block at a time.
+
+    Unlike TarFile.addfile, this lets the caller drain the written data
+    between blocks instead of once the whole member was compressed.
+    :param tar_file: the TarFile opened in stream mode
+    :param info: the TarInfo of the member, with its size
+    :param fileobj: file object to read the member data from
+    :param chunk_size: size of the blocks read from fileobj
+    :yields: None after each block written
+    """
+    header = info.tobuf(tar_file.format, tar_file.encoding, tar_file.errors)
+    tar_file.fileobj.write(header)
+    tar_file.offset += len(header)
+    yield
+    remaining = info.size
+    while remaining:
+        data = fileobj.read(min(chunk_size, remaining))
+        if not data:
+            raise OSError("unexpected end of data")
+        tar_file.fileobj.write(data)
+        remaining -= len(data)
+        yield
+    blocks, remainder = divmod(info.size, tarfile.BLOCKSIZE)
+    if remainder:
+        tar_file.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+        blocks += 1
+    tar_file.offset += blocks * tarfile.BLOCKSIZE
+    tar_file.members.append(info)
+    yield
+
+
+def stream_tar_gz(files_data, sha256sum_name=None, chunk_size=TAR_CHUNK_SIZE):
+    """Generate a tar.gz file incrementally.
+
+    The size of a file must be known before it is added, so each file is
+    first spooled to a temporary file (kept in memory up to chunk_size bytes,
+    then written to disk) while it is hashed. It is then compressed and
+    yielded chunk_size bytes at a time.
+    :param files_data: iterable of (filepath, iterable of bytes chunks)
+    :param sha256sum_name: filepath of a file with the SHA256 of the other
+        files, added as the last file of the tarball if provided
+    :param chunk_size: size of the buffers used to write the tarball
+    :yields: the tar.gz file as bytes chunks
+    """
+    sink = _ChunkSink()
+    sha256sum_content = ""
+    with tarfile.open(fileobj=sink, mode="w|gz", bufsize=chunk_size) as tar_file:
+        for file_name, file_chunks in files_data:
+            sha256 = hashlib.sha256()
+            with tempfile.SpooledTemporaryFile(max_size=chunk_size) as file_buffer:
+                for chunk in file_chunks:
+                    sha256.update(chunk)
+                    file_buffer.write(chunk)
+                info = tarfile.TarInfo(name=file_name)
+                info.size = file_buffer.tell()
+                file_buffer.seek(0)
+                for _ in _tar_member_blocks(tar_file, info, file_buffer, chunk_size):
+                    yield from sink.drain()
+            sha256sum_content += (
+                f"{sha256.hexdigest()}  {file_name.rsplit('/', 1)[-1]}\n"
+            )
+        if sha256sum_name:
+            sha256sum_data = encode_content(sha256sum_content, "plaintext")
+            info = tarfile.TarInfo(name=sha256sum_name)
+            info.size = len(sha256sum_data)
+            tar_file.addfile(tarinfo=info, fileobj=io.BytesIO(sha256sum_data))
+    yield from sink.drain()
+
+
 class CSVHelper:
     """Helper for CSV serialization of list/dict values."""
 
@@ -184,25 +409,31 @@ class CSVHelper:
         return result
 
     @staticmethod
-    def generate_headers(fact_list, exclude=None):
-        """Generate column headers from fact list."""
-        # pylint: disable=too-many-nested-blocks
-        headers = set()
+    def products_presence(fact):
+        """Return the presence of the products of a fact by lower case name."""
+        presence = {}
+        for prod in fact.get("products") or []:
+            prod_name = prod.get("name")
+            if prod_name:
+                presence[prod_name.lower()] = prod.get("presence", "unknown")
+        return presence
+
+    @classmethod
+    def generate_headers(cls, fact_list, exclude=None, known_headers=None):
+        """Generate column headers from fact list.
+
+        Products are not a column, but each product found is. Their values
+        are given by products_presence.
+        :param fact_list: list of facts (dicts) to generate headers for
+        :param exclude: set of headers to leave out
+        :param known_headers: headers included even if no fact has them
+        :returns: sorted list of headers
+        """
+        headers = set(known_headers or ())
+        headers.discard("products")
         for fact in fact_list:
-            fact_addon = {}
-            for fact_key in fact.keys():
-                if fact_key == "products":
-                    prods = fact.get(fact_key, [])
-                    if prods:
-                        for prod in prods:
-                            prod_name = prod.get("name")
-                            if prod_name:
-                                prod_name = prod_name.lower()
-                                headers.add(prod_name)
-                                fact_addon[prod_name] = prod.get("presence", "unknown")
-                else:
-                    headers.add(fact_key)
-            fact.update(fact_addon)
+            headers.update(fact_key for fact_key in fact if fact_key != "products")
+            headers.update(cls.products_presence(fact))
 
         if exclude and isinstance(exclude, set):
             headers = headers - exclude
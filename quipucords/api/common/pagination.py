@@ -10,7 +10,11 @@
 #
 """Common pagination class."""
 
-from rest_framework.pagination import PageNumberPagination
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -19,3 +23,89 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 1000
+
+
+class KeysetResultsPagination(CursorPagination):
+    """Paginate results by keyset on an ordering field and id.
+
+    CursorPagination only keeps the value of the first ordering field and
+    skips the rows sharing it with an offset. Here the cursor keeps the
+    (value, id) of the last row of a page instead, so every page is fetched
+    with the same range query no matter how deep it is, and no count of the
+    results is made.
+    """
+
+    page_size = StandardResultsSetPagination.page_size
+    page_size_query_param = StandardResultsSetPagination.page_size_query_param
+    max_page_size = StandardResultsSetPagination.max_page_size
+
+    def __init__(self, ordering):
+        """Initialize KeysetResultsPagination.
+
+        :param ordering: field to order the results by, prefixed with "-" for
+            descending order. Results with the same value are ordered by id.
+        """
+        self.ordering = (ordering, "id")
+        self.field = ordering.lstrip("-")
+        self.descending = ordering.startswith("-")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of queryset after (or before) the cursor."""
+        # pylint: disable=attribute-defined-outside-init
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor.reverse)
+
+        descending = self.descending != self.reverse
+        id_ordering = "-id" if self.reverse else "id"
+        queryset = queryset.order_by(
+            f"-{self.field}" if descending else self.field, id_ordering
+        )
+        if self.cursor is not None:
+            value, pk = self.decode_position(self.cursor.position)
+            field_lookup = "lt" if descending else "gt"
+            id_lookup = "lt" if self.reverse else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{field_lookup}": value})
+                | Q(**{self.field: value, f"id__{id_lookup}": pk})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def decode_position(self, position):
+        """Return the (value, id) of the row a cursor position points to."""
+        try:
+            value, pk = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)  # pylint: disable=W0707
+        # results are ordered by text fields; anything else was tampered with
+        if (
+            not isinstance(value, str)
+            or not isinstance(pk, int)
+            or isinstance(pk, bool)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def position_link(self, instance, reverse):
+        """Return the link to the results after (or before) instance."""
+        position = json.dumps([getattr(instance, self.field), instance.id])
+        return self.encode_cursor(Cursor(offset=0, reverse=reverse, position=position))
+
+    def get_next_link(self):
+        """Return the link to the next page, if any."""
+        if not self.page or not (self.has_more or self.reverse):
+            return None
+        return self.position_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Return the link to the previous page, if any."""
+        if not self.page or not (self.has_more if self.reverse else self.cursor):
+            return None
+        return self.position_link(self.page[0], reverse=True)
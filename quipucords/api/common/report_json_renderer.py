@@ -0,0 +1,52 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""JSON renderer for reports holding already encoded JSON."""
+
+from rest_framework.renderers import JSONRenderer
+
+
+class EncodedJSON:
+    """JSON value that is already encoded, like a cached report section."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded):
+        """Initialize EncodedJSON.
+
+        :param encoded: str with the JSON encoded value
+        """
+        self.encoded = encoded
+
+
+class ReportJSONRenderer(JSONRenderer):
+    """Render reports as JSON, splicing EncodedJSON values as they are.
+
+    Report dicts whose values include EncodedJSON are rendered without
+    decoding and re-encoding those values.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data as JSON."""
+        if not isinstance(data, dict) or not any(
+            isinstance(value, EncodedJSON) for value in data.values()
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        members = []
+        for key, value in data.items():
+            if isinstance(value, EncodedJSON):
+                encoded_value = value.encoded.encode()
+            elif value is None:
+                encoded_value = b"null"
+            else:
+                encoded_value = super().render(value)
+            members.append(super().render(str(key)) + b":" + encoded_value)
+        return b"{" + b",".join(members) + b"}"
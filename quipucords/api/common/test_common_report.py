@@ -0,0 +1,165 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the streaming of report bundles."""
+
+import hashlib
+import os
+import tarfile
+import tracemalloc
+import uuid
+from copy import deepcopy
+from io import BytesIO
+
+import pytest
+
+from api.common.common_report import (
+    COMPRESSED_CSV_PREFIX,
+    CSVHelper,
+    cache_csv,
+    encode_content,
+    iter_cached_csv,
+    iter_csv_rows,
+    iter_encoded_json,
+    iter_encoded_text,
+    stream_tar_gz,
+)
+
+REPORT = {
+    "report_id": 1,
+    "report_platform_id": uuid.UUID("c9ee5d2f-6bd7-47e3-9b6f-4e61f5ba6f9a"),
+    "sources": [
+        {
+            "source_name": "ção",
+            "facts": [
+                {"name": "host ", "cpus": 2, "ips": ("1.2.3.4",), 1: True},
+                {"name": None, "nested": {"a": [1, {"b": 2.5}]}},
+            ],
+        },
+        {"source_name": "empty", "facts": []},
+    ],
+    "empty": {},
+    "flag": False,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 10, 100000])
+@pytest.mark.parametrize("content", [REPORT, [], {}, "text", None, [REPORT] * 3])
+def test_iter_encoded_json(content, chunk_size):
+    """Test JSON chunks are the same as the JSONRenderer output."""
+    chunks = list(iter_encoded_json(content, chunk_size=chunk_size))
+    expected = encode_content(content, "json") if content is not None else b"null"
+    assert b"".join(chunks) == expected
+    assert all(len(chunk) >= chunk_size for chunk in chunks[:-1])
+
+
+def test_iter_encoded_text():
+    """Test text is encoded in chunks."""
+    assert list(iter_encoded_text("çãoab", chunk_size=2)) == [
+        "çã".encode(),
+        b"oa",
+        b"b",
+    ]
+    assert not list(iter_encoded_text(""))
+
+
+def test_stream_tar_gz():
+    """Test files are written to the tarball with their SHA256 sums."""
+    files_data = [
+        ("report_id_1/a.json", [b'{"a":', b"1}"]),
+        ("report_id_1/empty.csv", []),
+        ("report_id_1/b.csv", iter_encoded_text("x" * 1000, chunk_size=7)),
+    ]
+    chunks = list(stream_tar_gz(files_data, "report_id_1/SHA256SUM", chunk_size=512))
+    assert len(chunks) > 1
+    with tarfile.open(fileobj=BytesIO(b"".join(chunks))) as tar:
+        assert tar.getnames() == [
+            "report_id_1/a.json",
+            "report_id_1/empty.csv",
+            "report_id_1/b.csv",
+            "report_id_1/SHA256SUM",
+        ]
+        contents = {
+            member.name.rsplit("/", 1)[1]: tar.extractfile(member).read()
+            for member in tar.getmembers()
+        }
+    assert contents["a.json"] == b'{"a":1}'
+    assert contents["b.csv"] == b"x" * 1000
+    assert contents.pop("SHA256SUM").decode() == "".join(
+        f"{hashlib.sha256(content).hexdigest()}  {name}\n"
+        for name, content in contents.items()
+    )
+
+
+def test_stream_tar_gz_memory():
+    """Test memory used to stream a tarball is bounded by the chunk size."""
+    file_size = 8 * 2**20
+    chunk_size = 2**16
+
+    def file_chunks():
+        # incompressible, so a member is as big compressed as it is raw
+        for _ in range(file_size // chunk_size):
+            yield os.urandom(chunk_size)
+
+    tracemalloc.start()
+    try:
+        streamed = 0
+        for chunk in stream_tar_gz(
+            [("big.json", file_chunks())], "SHA256SUM", chunk_size=chunk_size
+        ):
+            streamed += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert streamed > file_size
+    assert peak < file_size / 8
+
+
+def test_iter_csv_rows():
+    """Test rows are formatted as CSV in chunks."""
+    rows = [["a", 1], [], ["b;c", None]] * 3
+    chunks = list(iter_csv_rows(rows, chunk_size=10))
+    assert "".join(chunks) == "a,1\r\n\r\nb;c,\r\n" * 3
+    assert all(len(chunk) >= 10 for chunk in chunks[:-1])
+    assert not list(iter_csv_rows([]))
+
+
+def test_cached_csv():
+    """Test csv chunks are cached compressed and read back."""
+    csv_text = "".join(f"ção,{number}\r\n" for number in range(10000))
+    saved = []
+    chunks = cache_csv(iter_csv_rows([], chunk_size=10), saved.append)
+    assert not list(chunks)
+    chunks = cache_csv(
+        (csv_text[start : start + 1000] for start in range(0, len(csv_text), 1000)),
+        saved.append,
+    )
+    assert "".join(chunks) == csv_text
+    cached_csv = saved[-1]
+    assert cached_csv.startswith(COMPRESSED_CSV_PREFIX)
+    assert len(cached_csv) < len(csv_text) / 2
+    assert "".join(iter_cached_csv(cached_csv, chunk_size=7)) == csv_text
+    assert not list(iter_cached_csv(saved[0]))
+    # csv cached uncompressed by previous versions
+    assert list(iter_cached_csv(csv_text)) == [csv_text]
+
+
+def test_generate_headers():
+    """Test headers include product names and known headers."""
+    facts = [
+        {"name": "a", "products": [{"name": "JBoss EAP", "presence": "absent"}]},
+        {"cpu_count": 1, "products": [{"name": "JBoss Fuse"}]},
+    ]
+    original_facts = deepcopy(facts)
+    headers = CSVHelper.generate_headers(
+        facts, exclude={"id"}, known_headers={"id", "products", "os_name"}
+    )
+    assert headers == ["cpu_count", "jboss eap", "jboss fuse", "name", "os_name"]
+    assert facts == original_facts
+    assert CSVHelper.products_presence(facts[1]) == {"jboss fuse": "unknown"}
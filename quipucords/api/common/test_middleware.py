@@ -0,0 +1,62 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the server version middleware."""
+
+import time
+
+import pytest
+from django.http import HttpResponse
+
+from api.common import middleware
+from quipucords import environment
+from quipucords.release import infer_version
+
+
+@pytest.fixture
+def version_middleware():
+    """Return ServerVersionMiddle wrapping a noop view."""
+    return middleware.ServerVersionMiddle(lambda request: HttpResponse())
+
+
+@pytest.fixture
+def git_commit(monkeypatch):
+    """Force the commit to be collected from git."""
+    monkeypatch.delenv("QUIPUCORDS_COMMIT", raising=False)
+    environment.commit.cache_clear()
+    yield
+    environment.commit.cache_clear()
+
+
+def test_server_version_header(version_middleware):
+    """Test the server version is added to responses."""
+    response = version_middleware(None)
+    assert response["X-Server-Version"] == environment.server_version()
+
+
+def time_requests(version_middleware, requests=50):
+    """Return the average time spent handling a request, in seconds."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        version_middleware(None)
+    return (time.perf_counter() - start) / requests
+
+
+@pytest.mark.slow
+def test_benchmark_cached_server_version(mocker, git_commit, version_middleware):
+    """Compare the middleware overhead with and without the cached commit."""
+
+    def uncached_server_version():
+        return f"{infer_version()}.{environment.commit.__wrapped__()}"
+
+    mocker.patch.object(middleware, "server_version", uncached_server_version)
+    uncached = time_requests(version_middleware)
+    mocker.patch.object(middleware, "server_version", environment.server_version)
+    cached = time_requests(version_middleware)
+    assert cached < uncached
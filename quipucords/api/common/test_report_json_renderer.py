@@ -0,0 +1,56 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the report JSON renderer."""
+
+import json
+import uuid
+
+import pytest
+
+from api.common.report_json_renderer import EncodedJSON, ReportJSONRenderer
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        None,
+        [1, 2],
+        {"report_id": 1, "system_fingerprints": [{"name": "ção"}]},
+    ],
+)
+def test_render_without_encoded_json(data):
+    """Test data without EncodedJSON is rendered like JSONRenderer does."""
+    assert ReportJSONRenderer().render(data) == (
+        b"" if data is None else json.dumps(data, ensure_ascii=False).encode()
+    ).replace(b", ", b",").replace(b": ", b":")
+
+
+def test_render_encoded_json():
+    """Test EncodedJSON values are spliced in the rendered report."""
+    fingerprints = [{"name": "ção", "ip_addresses": ["1.2.3.4"]}, {"name": None}]
+    platform_id = uuid.uuid4()
+    report = {
+        "report_id": 1,
+        "status": "completed",
+        "report_platform_id": platform_id,
+        "report_type": None,
+        "system_fingerprints": EncodedJSON(json.dumps(fingerprints)),
+    }
+    rendered = ReportJSONRenderer().render(report)
+    assert rendered.endswith(
+        f',"system_fingerprints":{json.dumps(fingerprints)}}}'.encode()
+    )
+    assert json.loads(rendered) == {
+        "report_id": 1,
+        "status": "completed",
+        "report_platform_id": str(platform_id),
+        "report_type": None,
+        "system_fingerprints": fingerprints,
+    }
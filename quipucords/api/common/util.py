@@ -132,6 +132,19 @@ def validate_query_param_bool(param, param_name="mask"):
     raise ValidationError(error)
 
 
+def report_etag(request, *identifiers):
+    """Return the ETag of a report representation.
+
+    Completed reports don't change, so their ETag is made of the
+    identifiers of the report and of the format it is rendered in.
+    :param request: the request for the report
+    :param identifiers: values identifying the report content
+    :returns: the quoted ETag
+    """
+    parts = [*identifiers, request.accepted_renderer.format]
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
 def check_for_existing_name(queryset, name, error_message, search_id=None):
     """Look for existing (different object) with same name.
 
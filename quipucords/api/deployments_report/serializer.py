@@ -11,6 +11,7 @@
 
 """Serializer for system fingerprint models."""
 
+from django.db import connection
 from rest_framework.serializers import (
     BooleanField,
     CharField,
@@ -19,6 +20,7 @@ from rest_framework.serializers import (
     FloatField,
     IntegerField,
     JSONField,
+    ListSerializer,
     ModelSerializer,
     PrimaryKeyRelatedField,
     UUIDField,
@@ -62,6 +64,51 @@ class EntitlementSerializer(NotEmptySerializer):
 default_args = {"required": False, "allow_null": True}
 
 
+class SystemFingerprintListSerializer(ListSerializer):
+    """Serializer for lists of system fingerprints.
+
+    Fingerprints, products and entitlements are saved with bulk inserts.
+    """
+
+    def create(self, validated_data):
+        """Create system fingerprints with their products and entitlements."""
+        fingerprints = []
+        nested_data = []
+        for fingerprint_data in validated_data:
+            fingerprint_data = dict(fingerprint_data)
+            nested_data.append(
+                (
+                    fingerprint_data.pop("products", None) or [],
+                    fingerprint_data.pop("entitlements", None) or [],
+                )
+            )
+            fingerprints.append(SystemFingerprint(**fingerprint_data))
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            SystemFingerprint.objects.bulk_create(fingerprints)
+        else:
+            # primary keys are required to link products and entitlements
+            for fingerprint in fingerprints:
+                fingerprint.save()
+
+        products = []
+        entitlements = []
+        for fingerprint, (products_data, entitlements_data) in zip(
+            fingerprints, nested_data
+        ):
+            products.extend(
+                Product(fingerprint=fingerprint, **product_data)
+                for product_data in products_data
+            )
+            entitlements.extend(
+                Entitlement(fingerprint=fingerprint, **entitlement_data)
+                for entitlement_data in entitlements_data
+            )
+        Product.objects.bulk_create(products)
+        Entitlement.objects.bulk_create(entitlements)
+        return fingerprints
+
+
 class SystemFingerprintSerializer(ModelSerializer):
     """Serializer for the Fingerprint model."""
 
@@ -140,6 +187,7 @@ class SystemFingerprintSerializer(ModelSerializer):
 
         model = SystemFingerprint
         fields = "__all__"
+        list_serializer_class = SystemFingerprintListSerializer
 
     def create(self, validated_data):
         """Create a system fingerprint."""
@@ -173,8 +221,6 @@ class DeploymentReportSerializer(NotEmptySerializer):
     report_id = IntegerField(read_only=True)
     cached_fingerprints = CustomJSONField(read_only=True)
     cached_masked_fingerprints = CustomJSONField(read_only=True)
-    cached_csv = CharField(read_only=True)
-    cached_masked_csv = CharField(read_only=True)
     cached_insights = CharField(read_only=True)
 
     status = ChoiceField(read_only=True, choices=DeploymentsReport.STATUS_CHOICES)
@@ -184,4 +230,4 @@ class DeploymentReportSerializer(NotEmptySerializer):
         """Meta class for DeploymentReportSerializer."""
 
         model = DeploymentsReport
-        fields = "__all__"
+        exclude = ("cached_csv", "cached_masked_csv")
@@ -0,0 +1,140 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the deployments report view."""
+
+import json
+
+import pytest
+from rest_framework import status
+
+from api.common.common_report import COMPRESSED_CSV_PREFIX
+from api.models import DeploymentsReport
+from api.serializers import DeploymentReportSerializer
+from tests.factories import DeploymentReportFactory
+
+FINGERPRINTS = [{"name": "host-1", "ip_addresses": ["1.2.3.4"]}, {"name": "ção"}]
+MASKED_FINGERPRINTS = [{"name": "-1", "ip_addresses": ["-2"]}, {"name": "-3"}]
+
+
+@pytest.fixture
+def deployments_report():
+    """Return a completed deployments report with cached fingerprints."""
+    return DeploymentReportFactory(
+        number_of_fingerprints=0,
+        status=DeploymentsReport.STATUS_COMPLETE,
+        cached_fingerprints=json.dumps(FINGERPRINTS),
+        cached_masked_fingerprints=json.dumps(MASKED_FINGERPRINTS),
+    )
+
+
+def url(report, query=""):
+    """Return the deployments report url."""
+    return f"/api/v1/reports/{report.report_id}/deployments/{query}"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query,fingerprints",
+    [("", FINGERPRINTS), ("?mask=True", MASKED_FINGERPRINTS)],
+)
+def test_cached_fingerprints(client, mocker, deployments_report, query, fingerprints):
+    """Test cached fingerprints are returned without being decoded."""
+    loads = mocker.spy(json, "loads")
+    response = client.get(url(deployments_report, query))
+    assert response.status_code == status.HTTP_200_OK
+    loads.assert_not_called()
+    assert response.json() == {
+        "report_id": deployments_report.id,
+        "status": DeploymentsReport.STATUS_COMPLETE,
+        "report_type": "deployments",
+        "report_version": "REPORT_VERSION",
+        "report_platform_id": str(deployments_report.report_platform_id),
+        "system_fingerprints": fingerprints,
+    }
+
+
+@pytest.mark.django_db
+def test_etag(client, deployments_report):
+    """Test repeated downloads of a report are answered with 304."""
+    response = client.get(url(deployments_report))
+    etag = response["ETag"]
+    assert etag == (
+        f'"deployments-{deployments_report.id}-REPORT_VERSION-'
+        f'{deployments_report.report_platform_id}-unmasked-json"'
+    )
+
+    response = client.get(url(deployments_report), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not response.content
+
+    etags = {etag}
+    for query in ("?mask=True", "?format=csv", "?format=tar.gz"):
+        response = client.get(url(deployments_report, query), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        etags.add(response["ETag"])
+    assert len(etags) == 4
+
+
+@pytest.mark.django_db
+def test_no_etag_for_incomplete_report(client):
+    """Test reports that are not complete have no ETag."""
+    report = DeploymentReportFactory(
+        number_of_fingerprints=0, status=DeploymentsReport.STATUS_FAILED
+    )
+    response = client.get(url(report), HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == status.HTTP_424_FAILED_DEPENDENCY
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["?format=csv", "?format=csv&mask=true"])
+def test_csv_streamed(client, mocker, deployments_report, query):
+    """Test the csv report is streamed and cached compressed."""
+    response = client.get(url(deployments_report, query))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    csv_report = b"".join(response.streaming_content).decode()
+    assert csv_report.startswith(
+        "Report ID,Report Type,Report Version,Report Platform ID\r\n"
+    )
+
+    deployments_report.refresh_from_db()
+    cached_csv = (
+        deployments_report.cached_masked_csv
+        if "mask" in query
+        else deployments_report.cached_csv
+    )
+    assert cached_csv.startswith(COMPRESSED_CSV_PREFIX)
+
+    loads = mocker.spy(json, "loads")
+    response = client.get(url(deployments_report, query))
+    assert b"".join(response.streaming_content).decode() == csv_report
+    loads.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_json_after_csv_cached(client, deployments_report):
+    """Test the cached csv is not part of the json report."""
+    for query in ("?format=csv", "?format=csv&mask=True"):
+        response = client.get(url(deployments_report, query))
+        b"".join(response.streaming_content)
+    deployments_report.refresh_from_db()
+    assert deployments_report.cached_csv.startswith(COMPRESSED_CSV_PREFIX)
+    assert deployments_report.cached_masked_csv.startswith(COMPRESSED_CSV_PREFIX)
+
+    for query in ("", "?mask=True"):
+        response = client.get(url(deployments_report, query))
+        assert response.status_code == status.HTTP_200_OK
+        assert "cached_csv" not in response.json()
+        assert "cached_masked_csv" not in response.json()
+    json_report = DeploymentReportSerializer(deployments_report).data
+    assert "cached_csv" not in json_report
+    assert "cached_masked_csv" not in json_report
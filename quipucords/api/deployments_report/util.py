@@ -11,12 +11,17 @@
 
 """Util for deployments report."""
 
-import csv
+import json
 import logging
-from copy import deepcopy
-from io import StringIO
 
-from api.common.common_report import CSVHelper, sanitize_row
+from api.common.common_report import (
+    CSVHelper,
+    cache_csv,
+    iter_cached_csv,
+    iter_csv_rows,
+    sanitize_row,
+)
+from api.common.report_json_renderer import EncodedJSON
 from api.common.util import validate_query_param_bool
 from api.models import DeploymentsReport, Source, SystemFingerprint
 
@@ -56,15 +61,21 @@ def compute_source_info(sources):
 
 def create_deployments_csv(deployments_report_dict, request):
     """Create deployments report csv."""
-    deployments_report_dict = deepcopy(deployments_report_dict)
+    csv_chunks = deployments_csv_chunks(deployments_report_dict, request)
+    if csv_chunks is None:
+        return None
+    return "".join(csv_chunks)
+
+
+def deployments_csv_chunks(deployments_report_dict, request):
+    """Return the deployments report csv in chunks.
+
+    The csv is cached compressed once all of it was generated.
+    :param deployments_report_dict: the deployments report
+    :param request: the request for the csv
+    :returns: iterator over the csv text chunks, or None if there is no csv
+    """
     mask_report = request.query_params.get("mask", False)
-    source_headers = {
-        NETWORK_DETECTION_KEY,
-        VCENTER_DETECTION_KEY,
-        SATELLITE_DETECTION_KEY,
-        OPENSHIFT_DETECTION_KEY,
-        SOURCES_KEY,
-    }
     report_id = deployments_report_dict.get("report_id")
     if report_id is None:
         return None
@@ -74,48 +85,54 @@ def create_deployments_csv(deployments_report_dict, request):
         return None
 
     # Check for a cached copy of csv
-    cached_csv = deployment_report.cached_csv
+    cached_csv_field = "cached_csv"
     if validate_query_param_bool(mask_report):
-        cached_csv = deployment_report.cached_masked_csv
+        cached_csv_field = "cached_masked_csv"
+    cached_csv = getattr(deployment_report, cached_csv_field)
     if cached_csv:
         logger.info("Using cached csv results for deployment report %d", report_id)
-        return cached_csv
+        return iter_cached_csv(cached_csv)
     logger.info("No cached csv results for deployment report %d", report_id)
 
-    csv_helper = CSVHelper()
-    deployment_report_buffer = StringIO()
-    csv_writer = csv.writer(deployment_report_buffer, delimiter=",")
-
-    csv_writer.writerow(
-        ["Report ID", "Report Type", "Report Version", "Report Platform ID"]
-    )
-    csv_writer.writerow(
-        [
-            report_id,
-            deployment_report.report_type,
-            deployment_report.report_version,
-            deployment_report.report_platform_id,
-        ]
-    )
-    csv_writer.writerow([])
-    csv_writer.writerow([])
-
     systems_list = deployments_report_dict.get("system_fingerprints")
+    if isinstance(systems_list, EncodedJSON):
+        systems_list = json.loads(systems_list.encoded)
     if not systems_list:
         return None
 
-    csv_writer.writerow(["System Fingerprints:"])
+    def save_cached_csv(cached_csv):
+        logger.info("Caching csv results for deployment report %d", report_id)
+        setattr(deployment_report, cached_csv_field, cached_csv)
+        deployment_report.save(update_fields=[cached_csv_field])
+
+    csv_rows = _deployments_csv_rows(report_id, deployment_report, systems_list)
+    return cache_csv(iter_csv_rows(csv_rows), save_cached_csv)
+
+
+def _deployments_csv_rows(report_id, deployment_report, systems_list):
+    """Generate the rows of the deployments report csv."""
+    source_headers = {
+        NETWORK_DETECTION_KEY,
+        VCENTER_DETECTION_KEY,
+        SATELLITE_DETECTION_KEY,
+        OPENSHIFT_DETECTION_KEY,
+        SOURCES_KEY,
+    }
+    csv_helper = CSVHelper()
+    yield ["Report ID", "Report Type", "Report Version", "Report Platform ID"]
+    yield [
+        report_id,
+        deployment_report.report_type,
+        deployment_report.report_version,
+        deployment_report.report_platform_id,
+    ]
+    yield []
+    yield []
+    yield ["System Fingerprints:"]
 
     valid_fact_attributes = {
         field.name for field in SystemFingerprint._meta.get_fields()
     }
-
-    # Add fields to just one fingerprint
-    system = systems_list[0]
-    for attr in valid_fact_attributes:
-        if not system.get(attr, None):
-            system[attr] = None
-
     headers = csv_helper.generate_headers(
         systems_list,
         exclude={
@@ -126,20 +143,30 @@ def create_deployments_csv(deployments_report_dict, request):
             "cpu_core_per_socket",
             "system_purpose",
         },
+        known_headers=valid_fact_attributes,
     )
     if SOURCES_KEY in headers:
         headers += source_headers
         headers = sorted(list(set(headers)))
 
     # Add source headers
-    csv_writer.writerow(headers)
-    for system in systems_list:
+    yield headers
+    for index, system in enumerate(systems_list):
+        if not index:
+            # empty facts of the first system are always written as empty values
+            system = {
+                **system,
+                **{
+                    attr: None for attr in valid_fact_attributes if not system.get(attr)
+                },
+            }
         row = []
         system_sources = system.get(SOURCES_KEY)
         if system_sources is not None:
             sources_info = compute_source_info(system_sources)
         else:
             sources_info = None
+        products_presence = csv_helper.products_presence(system)
         for header in headers:
             fact_value = None
             if header in source_headers:
@@ -148,19 +175,19 @@ def create_deployments_csv(deployments_report_dict, request):
             elif header == "entitlements":
                 fact_value = system.get(header)
                 if fact_value:
-                    for entitlement in fact_value:
-                        entitlement.pop("metadata")
+                    fact_value = [
+                        {
+                            key: value
+                            for key, value in entitlement.items()
+                            if key != "metadata"
+                        }
+                        for entitlement in fact_value
+                    ]
+            elif header in products_presence:
+                fact_value = products_presence[header]
             else:
                 fact_value = system.get(header)
             row.append(csv_helper.serialize_value(header, fact_value))
-        csv_writer.writerow(sanitize_row(row))
+        yield sanitize_row(row)
 
-    csv_writer.writerow([])
-    logger.info("Caching csv results for deployment report %d", report_id)
-    cached_csv = deployment_report_buffer.getvalue()
-    if validate_query_param_bool(mask_report):
-        deployment_report.cached_masked_csv = cached_csv
-    else:
-        deployment_report.cached_csv = cached_csv
-    deployment_report.save()
-    return cached_csv
+    yield []
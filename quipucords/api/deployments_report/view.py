@@ -14,8 +14,10 @@ import json
 import logging
 import os
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import (
@@ -25,14 +27,16 @@ from rest_framework.decorators import (
     renderer_classes,
 )
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from api import messages
 from api.common.report_json_gzip_renderer import ReportJsonGzipRenderer
-from api.common.util import is_int, validate_query_param_bool
+from api.common.report_json_renderer import EncodedJSON, ReportJSONRenderer
+from api.common.util import is_int, report_etag, validate_query_param_bool
 from api.deployments_report.csv_renderer import DeploymentCSVRenderer
+from api.deployments_report.util import deployments_csv_chunks
 from api.models import DeploymentsReport
 from api.user.authentication import QuipucordsExpiringTokenAuthentication
 
@@ -49,13 +53,41 @@ else:
     perm_classes = ()
 
 
+def deployments_etag(request, pk=None):
+    """Return the ETag of a completed deployments report."""
+    if not is_int(pk):
+        return None
+    report = (
+        DeploymentsReport.objects.filter(report_id=pk)
+        .only("id", "report_version", "report_platform_id", "status")
+        .first()
+    )
+    if report is None or report.status != DeploymentsReport.STATUS_COMPLETE:
+        return None
+    mask_report = validate_query_param_bool(request.query_params.get("mask", False))
+    return report_etag(
+        request,
+        "deployments",
+        report.id,
+        report.report_version,
+        report.report_platform_id,
+        "masked" if mask_report else "unmasked",
+    )
+
+
 # pylint: disable=inconsistent-return-statements
 @api_view(["GET"])
 @authentication_classes(auth_classes)
 @permission_classes(perm_classes)
 @renderer_classes(
-    (JSONRenderer, BrowsableAPIRenderer, DeploymentCSVRenderer, ReportJsonGzipRenderer)
+    (
+        ReportJSONRenderer,
+        BrowsableAPIRenderer,
+        DeploymentCSVRenderer,
+        ReportJsonGzipRenderer,
+    )
 )
+@condition(etag_func=deployments_etag)
 def deployments(request, pk=None):
     """Lookup and return a deployment system report."""
     if not is_int(pk):
@@ -71,8 +103,20 @@ def deployments(request, pk=None):
             },
             status=status.HTTP_424_FAILED_DEPENDENCY,
         )
-    deployments_report = build_cached_json_report(report, mask_report)
+    deployments_report = build_cached_json_report(
+        report,
+        mask_report,
+        encoded=not isinstance(request.accepted_renderer, ReportJsonGzipRenderer),
+    )
     if deployments_report:
+        if isinstance(request.accepted_renderer, DeploymentCSVRenderer):
+            csv_chunks = deployments_csv_chunks(deployments_report, request)
+            if csv_chunks is not None:
+                return StreamingHttpResponse(
+                    csv_chunks,
+                    content_type=f"{DeploymentCSVRenderer.media_type}; "
+                    f"charset={DeploymentCSVRenderer.charset}",
+                )
         return Response(deployments_report)
     error = {
         "detail": f"Deployments report {report.id} could not be masked."
@@ -82,22 +126,27 @@ def deployments(request, pk=None):
     return Response(error, status=status.HTTP_428_PRECONDITION_REQUIRED)
 
 
-def build_cached_json_report(report, mask_report):
+def build_cached_json_report(report, mask_report, encoded=False):
     """Create a count report based on the fingerprints and the group.
 
     :param report: the DeploymentsReport used to group count
     :param mask_report: <boolean> bool associated with whether
         or not we should mask the report.
+    :param encoded: <boolean> keep the cached fingerprints JSON encoded,
+        for renderers splicing EncodedJSON values and csv renderers.
     :returns: json report data
     :raises: Raises validation error group_count on non-existent field.
     """
     if validate_query_param_bool(mask_report):
-        if report.cached_masked_fingerprints:
-            system_fingerprints = json.loads(report.cached_masked_fingerprints)
-        else:
+        cached_fingerprints = report.cached_masked_fingerprints
+        if not cached_fingerprints:
             return None
     else:
-        system_fingerprints = json.loads(report.cached_fingerprints)
+        cached_fingerprints = report.cached_fingerprints
+    if encoded:
+        system_fingerprints = EncodedJSON(cached_fingerprints)
+    else:
+        system_fingerprints = json.loads(cached_fingerprints)
     return {
         "report_id": report.id,
         "status": report.status,
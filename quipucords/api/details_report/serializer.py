@@ -26,11 +26,9 @@ class DetailsReportSerializer(NotEmptySerializer):
     sources = CustomJSONField(required=True)
     report_id = IntegerField(read_only=True)
     report_platform_id = UUIDField(format="hex_verbose", read_only=True)
-    cached_csv = CharField(required=False, read_only=True)
-    cached_masked_csv = CharField(required=False, read_only=True)
 
     class Meta:
         """Meta class for DetailsReportSerializer."""
 
         model = DetailsReport
-        exclude = ("id", "deployment_report")
+        exclude = ("id", "deployment_report", "cached_csv", "cached_masked_csv")
@@ -120,6 +120,37 @@ class DetailReportTest(TestCase):
         response_json = self.retrieve_expect_200(identifier)
         self.assertEqual(response_json["report_id"], identifier)
 
+    def test_details_after_csv_cached(self):
+        """Get details for a report via API once its csv was cached."""
+        request_json = {
+            "report_type": "details",
+            "sources": [
+                {
+                    "server_id": self.server_id,
+                    "report_version": create_report_version(),
+                    "source_name": self.net_source.name,
+                    "source_type": self.net_source.source_type,
+                    "facts": [{"key": "value"}],
+                }
+            ],
+        }
+
+        response_json = self.create_expect_201(request_json)
+        identifier = response_json["report_id"]
+        for query_param in ("?format=csv", "?format=csv&mask=True"):
+            url = "/api/v1/reports/" + str(identifier) + "/details/" + query_param
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            b"".join(response.streaming_content)
+        details_report = DetailsReport.objects.get(report_id=identifier)
+        self.assertIsNotNone(details_report.cached_csv)
+        self.assertIsNotNone(details_report.cached_masked_csv)
+
+        response_json = self.retrieve_expect_200(identifier)
+        self.assertNotIn("cached_csv", response_json)
+        self.assertNotIn("cached_masked_csv", response_json)
+        self.assertEqual(response_json["sources"], request_json["sources"])
+
     def test_details_masked(self):
         """Get details report with masked values for a report via API."""
         request_json = {
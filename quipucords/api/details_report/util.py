@@ -11,14 +11,19 @@
 
 """Util for validating and persisting source facts."""
 
-import csv
 import logging
-from io import StringIO
 
 from django.utils.translation import gettext as _
 
 from api import messages
-from api.common.common_report import CSVHelper, create_report_version, sanitize_row
+from api.common.common_report import (
+    CSVHelper,
+    cache_csv,
+    create_report_version,
+    iter_cached_csv,
+    iter_csv_rows,
+    sanitize_row,
+)
 from api.common.util import mask_data_general, validate_query_param_bool
 from api.models import DetailsReport, ScanTask, ServerInformation, Source
 from api.serializers import DetailsReportSerializer
@@ -198,7 +203,20 @@ def create_details_report(report_version, json_details_report):
 
 def create_details_csv(details_report_dict, request):
     """Create details csv."""
-    # pylint: disable=too-many-locals
+    csv_chunks = details_csv_chunks(details_report_dict, request)
+    if csv_chunks is None:
+        return None
+    return "".join(csv_chunks)
+
+
+def details_csv_chunks(details_report_dict, request):
+    """Return the details report csv in chunks.
+
+    The csv is cached compressed once all of it was generated.
+    :param details_report_dict: the details report
+    :param request: the request for the csv
+    :returns: iterator over the csv text chunks, or None if there is no csv
+    """
     report_id = details_report_dict.get("report_id")
     if report_id is None:
         return None
@@ -208,92 +226,81 @@ def create_details_csv(details_report_dict, request):
         return None
     mask_report = request.query_params.get("mask", False)
     # Check for a cached copy of csv
-    cached_csv = details_report.cached_csv
+    cached_csv_field = "cached_csv"
     if validate_query_param_bool(mask_report):
-        cached_csv = details_report.cached_masked_csv
+        cached_csv_field = "cached_masked_csv"
+    cached_csv = getattr(details_report, cached_csv_field)
     if cached_csv:
         logger.info("Using cached csv results for details report %d", report_id)
-        return cached_csv
+        return iter_cached_csv(cached_csv)
     logger.info("No cached csv results for details report %d", report_id)
 
-    csv_helper = CSVHelper()
-    details_report_csv_buffer = StringIO()
-    csv_writer = csv.writer(details_report_csv_buffer, delimiter=",")
-
     sources = details_report_dict.get("sources")
+    csv_rows = _details_csv_rows(report_id, details_report, sources)
+    if sources is None:
+        return iter_csv_rows(csv_rows)
 
-    csv_writer.writerow(
-        [
-            "Report ID",
-            "Report Type",
-            "Report Version",
-            "Report Platform ID",
-            "Number Sources",
-        ]
-    )
+    def save_cached_csv(cached_csv):
+        logger.info("Caching csv results for details report %d", report_id)
+        setattr(details_report, cached_csv_field, cached_csv)
+        details_report.save(update_fields=[cached_csv_field])
+
+    return cache_csv(iter_csv_rows(csv_rows), save_cached_csv)
+
+
+def _details_csv_rows(report_id, details_report, sources):
+    """Generate the rows of the details report csv."""
+    csv_helper = CSVHelper()
+    yield [
+        "Report ID",
+        "Report Type",
+        "Report Version",
+        "Report Platform ID",
+        "Number Sources",
+    ]
+    yield [
+        report_id,
+        details_report.report_type,
+        details_report.report_version,
+        details_report.report_platform_id,
+        len(sources) if sources is not None else 0,
+    ]
     if sources is None:
-        csv_writer.writerow(
-            [
-                report_id,
-                details_report.report_type,
-                details_report.report_version,
-                details_report.report_platform_id,
-                0,
-            ]
-        )
-        return details_report_csv_buffer.getvalue()
-
-    csv_writer.writerow(
-        [
-            report_id,
-            details_report.report_type,
-            details_report.report_version,
-            details_report.report_platform_id,
-            len(sources),
-        ]
-    )
-    csv_writer.writerow([])
-    csv_writer.writerow([])
+        return
+    yield []
+    yield []
 
     for source in sources:
-        csv_writer.writerow(["Source"])
-        csv_writer.writerow(["Server Identifier", "Source Name", "Source Type"])
-        csv_writer.writerow(
-            [
-                source.get("server_id"),
-                source.get("source_name"),
-                source.get("source_type"),
-            ]
-        )
-        csv_writer.writerow(["Facts"])
+        yield ["Source"]
+        yield ["Server Identifier", "Source Name", "Source Type"]
+        yield [
+            source.get("server_id"),
+            source.get("source_name"),
+            source.get("source_type"),
+        ]
+        yield ["Facts"]
         fact_list = source.get("facts")
         if not fact_list:
             # write a space line and move to next
-            csv_writer.writerow([])
+            yield []
             continue
         headers = csv_helper.generate_headers(fact_list)
-        csv_writer.writerow(headers)
+        yield headers
 
         for fact in fact_list:
             row = []
+            products_presence = csv_helper.products_presence(fact)
             for header in headers:
-                fact_value = fact.get(header)
+                if header in products_presence:
+                    fact_value = products_presence[header]
+                else:
+                    fact_value = fact.get(header)
                 row.append(csv_helper.serialize_value(header, fact_value))
 
-            csv_writer.writerow(sanitize_row(row))
-
-        csv_writer.writerow([])
-        csv_writer.writerow([])
-
-    logger.info("Caching csv results for details report %d", report_id)
-    cached_csv = details_report_csv_buffer.getvalue()
-    if validate_query_param_bool(mask_report):
-        details_report.cached_masked_csv = cached_csv
-    else:
-        details_report.cached_csv = cached_csv
-    details_report.save()
+            yield sanitize_row(row)
 
-    return cached_csv
+        yield []
+        yield []
 
 
 def mask_details_facts(report):
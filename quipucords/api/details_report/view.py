@@ -14,6 +14,7 @@
 import logging
 import os
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
 from rest_framework import mixins, status, viewsets
@@ -36,6 +37,7 @@ from api.common.util import is_int, validate_query_param_bool
 from api.details_report.csv_renderer import DetailsCSVRenderer
 from api.details_report.util import (
     create_details_report,
+    details_csv_chunks,
     mask_details_facts,
     validate_details_report_json,
 )
@@ -75,9 +77,14 @@ def details(request, pk=None):
     mask_report = request.query_params.get("mask", False)
     if validate_query_param_bool(mask_report):
         json_details = mask_details_facts(json_details)
-    http_accept = request.META.get("HTTP_ACCEPT")
-    if http_accept and "text/csv" not in http_accept:
-        json_details.pop("cached_csv", None)
+    if isinstance(request.accepted_renderer, DetailsCSVRenderer):
+        csv_chunks = details_csv_chunks(json_details, request)
+        if csv_chunks is not None:
+            return StreamingHttpResponse(
+                csv_chunks,
+                content_type=f"{DetailsCSVRenderer.media_type}; "
+                f"charset={DetailsCSVRenderer.charset}",
+            )
     return Response(json_details)
 
 
@@ -23,19 +23,60 @@ from api.status import get_server_id
 from quipucords.environment import server_version
 
 default_kwargs = {"required": False}
+SCANNER_IDENTITY = "scanner_identity"
 
 # pylint: disable=abstract-method,fixme
 # Serializer has update/create as pseudo-abstract methods we don't need to implement
 # disable complaints about 'fixme' until DISCOVERY-130 is done
 
 
+def get_scanner_identity():
+    """Collect the data identifying this server in insights reports."""
+    hostname = socket.getfqdn()
+    return {
+        "data_collector": settings.QPC_INSIGHTS_DATA_COLLECTOR_LABEL,
+        "hostname": hostname,
+        "ip_address": socket.gethostbyname(hostname),
+        "server_id": get_server_id(),
+        "server_version": server_version(),
+    }
+
+
+def scanner_identity(context):
+    """Return the scanner identity stored in serializer context.
+
+    The identity is collected the first time it is required and shared by
+    every serializer of the same report, since context belongs to the root
+    serializer.
+    """
+    if SCANNER_IDENTITY not in context:
+        context[SCANNER_IDENTITY] = get_scanner_identity()
+    return context[SCANNER_IDENTITY]
+
+
+class ScannerIdentityDefault:
+    """Field default reading an attribute from the scanner identity."""
+
+    requires_context = True
+
+    def __init__(self, key):
+        """Initialize ScannerIdentityDefault."""
+        self.key = key
+
+    def __call__(self, serializer_field):
+        """Return the default value for serializer_field."""
+        return scanner_identity(serializer_field.context)[self.key]
+
+
 class FactsSerializer(Serializer):
     """Serializer for HBI facts."""
 
     source_types = fields.ListField()
     last_discovered = fields.DateTimeField()
-    qpc_server_version = fields.CharField(default=server_version)
-    qpc_server_id = fields.CharField(default=get_server_id)
+    qpc_server_version = fields.CharField(
+        default=ScannerIdentityDefault("server_version")
+    )
+    qpc_server_id = fields.CharField(default=ScannerIdentityDefault("server_id"))
     rh_products_installed = fields.ListField(child=fields.CharField())
 
 
@@ -97,16 +138,15 @@ class YupanaHostSerializer(NotEmptyMixin, Serializer):
 
     def get_tags(self, host: HostEntity):
         """Format tags to appear as inventory labels."""
-        data_collector = settings.QPC_INSIGHTS_DATA_COLLECTOR_LABEL
-        hostname = socket.getfqdn()
-        ip_address = socket.gethostbyname(hostname)
+        identity = scanner_identity(self.context)
+        data_collector = identity["data_collector"]
         tags = {
             "data-collector": data_collector,
             "last-discovered": host.last_discovered,
-            "scanner-hostname": hostname,
-            "scanner-id": get_server_id(),
-            "scanner-ip-address": ip_address,
-            "scanner-version": server_version(),
+            "scanner-hostname": identity["hostname"],
+            "scanner-id": identity["server_id"],
+            "scanner-ip-address": identity["ip_address"],
+            "scanner-version": identity["server_version"],
         }
         # this differ from actual HBI format due to yupana constraints
         # yupana will format this accordingly
@@ -149,8 +189,10 @@ class YupanaSourceSerializer(Serializer):
     report_type = fields.CharField(default="insights")
     report_version = fields.CharField()
     qpc_server_report_id = fields.IntegerField(source="report_id")
-    qpc_server_version = fields.CharField(default=server_version)
-    qpc_server_id = fields.CharField(default=get_server_id)
+    qpc_server_version = fields.CharField(
+        default=ScannerIdentityDefault("server_version")
+    )
+    qpc_server_id = fields.CharField(default=ScannerIdentityDefault("server_id"))
 
 
 class ReportSliceSerializer(Serializer):
@@ -9,6 +9,8 @@
 
 """Test insigths serializers."""
 
+import socket
+
 import pytest
 
 from api.common.entities import ReportEntity
@@ -66,3 +68,39 @@ def test_payload_serializer(db, report_entity: ReportEntity):
         assert {"namespace": "qpc", "key": "data-collector", "value": "qpc"} in host[
             "tags"
         ]
+
+
+@pytest.mark.dbcompat
+def test_scanner_identity_collected_once(db, mocker, report_entity):
+    """Test scanner hostname and ip address are resolved once per report."""
+    getfqdn = mocker.patch("socket.getfqdn", return_value="scanner.example.com")
+    gethostbyname = mocker.patch("socket.gethostbyname", return_value="10.0.0.1")
+    data = YupanaPayloadSerializer(report_entity).data
+    getfqdn.assert_called_once()
+    gethostbyname.assert_called_once_with("scanner.example.com")
+
+    hosts = [
+        host
+        for file_name, slice_data in data.items()
+        if not file_name.endswith("metadata.json")
+        for host in slice_data["hosts"]
+    ]
+    assert len(hosts) == 10
+    for host in hosts:
+        assert {
+            "namespace": "qpc",
+            "key": "scanner-ip-address",
+            "value": "10.0.0.1",
+        } in host["tags"]
+
+
+@pytest.mark.slow
+@pytest.mark.dbcompat
+def test_benchmark_payload_serializer(db, mocker):
+    """Test a large report payload resolves the scanner identity once."""
+    deployment_report = DeploymentReportFactory.create(number_of_fingerprints=2000)
+    report_entity = ReportEntity.from_report_id(deployment_report.id)
+    getfqdn = mocker.patch("socket.getfqdn", wraps=socket.getfqdn)
+    data = YupanaPayloadSerializer(report_entity).data
+    assert len(data) == len(report_entity.slices) + 1
+    getfqdn.assert_called_once()
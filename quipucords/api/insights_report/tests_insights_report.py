@@ -193,6 +193,36 @@ class InsightsReportTest(TestCase):
         for key in response_json:
             self.assertIn(f"report_id_{deployment_report.id}/", key)
 
+    def test_get_insights_report_304_not_modified(self):
+        """Retrieve insights report already downloaded."""
+        deployment_report = DeploymentReportFactory(
+            status=DeploymentsReport.STATUS_COMPLETE,
+        )
+        url = f"/api/v1/reports/{deployment_report.id}/insights/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        with patch("api.insights_report.view._get_report") as get_report:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        get_report.assert_not_called()
+
+        response = self.client.get(
+            f"{url}?format=tar.gz",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # an upgraded server generates a different payload
+        with patch(
+            "api.insights_report.view.server_version", return_value="99.0.0.abc"
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
     def test_get_insights_report_404_no_canonical(self):
         """Retrieve insights report."""
         url = "/api/v1/reports/1/insights/"
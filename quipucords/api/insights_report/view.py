@@ -13,7 +13,9 @@
 import logging
 import os
 
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import (
     api_view,
@@ -27,11 +29,13 @@ from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 
 from api.common.entities import ReportEntity
+from api.common.util import report_etag
 from api.exceptions import FailedDependencyError
 from api.insights_report.insights_gzip_renderer import InsightsGzipRenderer
 from api.insights_report.serializers import YupanaPayloadSerializer
 from api.models import DeploymentsReport, SystemFingerprint
 from api.user.authentication import QuipucordsExpiringTokenAuthentication
+from quipucords.environment import server_version
 
 # pylint: disable=invalid-name
 # Get an instance of a logger
@@ -46,10 +50,35 @@ else:
     perm_classes = ()
 
 
+def insights_etag(request, pk=None):
+    """Return the ETag of the insights report of a completed deployments report."""
+    deployment_report = (
+        DeploymentsReport.objects.filter(pk=pk)
+        .only("id", "report_version", "report_platform_id", "status")
+        .first()
+    )
+    if (
+        deployment_report is None
+        or deployment_report.status != DeploymentsReport.STATUS_COMPLETE
+    ):
+        return None
+    return report_etag(
+        request,
+        "insights",
+        deployment_report.id,
+        deployment_report.report_version,
+        deployment_report.report_platform_id,
+        settings.QPC_INSIGHTS_REPORT_SLICE_SIZE,
+        # the payload embeds the version of the server generating it
+        server_version(),
+    )
+
+
 @api_view(["GET"])
 @authentication_classes(auth_classes)
 @permission_classes(perm_classes)
 @renderer_classes((JSONRenderer, InsightsGzipRenderer, BrowsableAPIRenderer))
+@condition(etag_func=insights_etag)
 def insights(request, pk=None):
     """Lookup and return a insights system report."""
     deployment_report = get_object_or_404(
@@ -10,20 +10,73 @@
 #
 """tar.gz renderer for reports."""
 
-import hashlib
 import logging
+import tempfile
 
 from rest_framework import renderers
 
-from api import messages
-from api.common.common_report import create_filename, create_tar_buffer, encode_content
-from api.deployments_report.util import create_deployments_csv
-from api.details_report.util import create_details_csv
+from api.common.common_report import (
+    TAR_CHUNK_SIZE,
+    create_filename,
+    iter_encoded_json,
+    stream_tar_gz,
+)
+from api.deployments_report.util import deployments_csv_chunks
+from api.details_report.util import details_csv_chunks
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
+def create_reports_bundle(reports_dict, request):
+    """Create a tar.gz bundle with the details and deployments reports.
+
+    The bundle has both reports as JSON and CSV files, plus a SHA256SUM file.
+    :param reports_dict: dict with the report_id, details_json and
+        deployments_json
+    :param request: the request for the bundle
+    :returns: iterator over the tar.gz bytes chunks, or None if the reports
+        can't be bundled
+    """
+    if not bool(reports_dict):
+        return None
+    report_id = reports_dict.get("report_id")
+    # Collect Json Data
+    details_json = reports_dict.get("details_json")
+    deployments_json = reports_dict.get("deployments_json")
+    if any(value is None for value in [report_id, details_json, deployments_json]):
+        return None
+
+    # Collect CSV Data
+    details_csv = details_csv_chunks(details_json, request)
+    deployments_csv = deployments_csv_chunks(deployments_json, request)
+    if any(value is None for value in [details_csv, deployments_csv]):
+        return None
+
+    # map the file names to the file data, encoded while the tarball is written
+    files_data = [
+        (
+            create_filename("details", "json", report_id),
+            iter_encoded_json(details_json),
+        ),
+        (
+            create_filename("deployments", "json", report_id),
+            iter_encoded_json(deployments_json),
+        ),
+        (
+            create_filename("details", "csv", report_id),
+            (chunk.encode("utf-8") for chunk in details_csv),
+        ),
+        (
+            create_filename("deployments", "csv", report_id),
+            (chunk.encode("utf-8") for chunk in deployments_csv),
+        ),
+    ]
+    return stream_tar_gz(
+        files_data, sha256sum_name=create_filename("SHA256SUM", None, report_id)
+    )
+
+
 class ReportsGzipRenderer(renderers.BaseRenderer):
     """Class to render all reports as tar.gz."""
 
@@ -33,50 +86,18 @@ class ReportsGzipRenderer(renderers.BaseRenderer):
     render_style = "binary"
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        """Render all reports as gzip."""
-        # pylint: disable=too-many-locals
-        request = renderer_context.get("request")
-        reports_dict = data
-        if not bool(reports_dict):
-            return None
-        report_id = reports_dict.get("report_id")
-        # Collect Json Data
-        details_json = reports_dict.get("details_json")
-        deployments_json = reports_dict.get("deployments_json")
-        if any(value is None for value in [report_id, details_json, deployments_json]):
-            return None
-
-        # Collect CSV Data
-        details_csv = create_details_csv(details_json, request)
-        deployments_csv = create_deployments_csv(deployments_json, request)
-        if any(value is None for value in [details_csv, deployments_csv]):
-            return None
-
-        # create the file names
-        details_json_name = create_filename("details", "json", report_id)
-        deployments_json_name = create_filename("deployments", "json", report_id)
-        details_csv_name = create_filename("details", "csv", report_id)
-        deployments_csv_name = create_filename("deployments", "csv", report_id)
-        sha256sum_name = create_filename("SHA256SUM", None, report_id)
+        """Render all reports as gzip.
 
-        # map the file names to the file data
-        files_data = {
-            details_json_name: encode_content(details_json, "json"),
-            deployments_json_name: encode_content(deployments_json, "json"),
-            details_csv_name: encode_content(details_csv, "csv"),
-            deployments_csv_name: encode_content(deployments_csv, "csv"),
-        }
-
-        # generate hashes
-        sha256sum_content = ""
-        for full_file_name, content in files_data.items():
-            file_name = full_file_name.rsplit("/", 1)[1]
-            sha256 = hashlib.sha256(content).hexdigest()
-            sha256sum_content += f"{sha256}  {file_name}\n"
-        files_data[sha256sum_name] = encode_content(sha256sum_content, "plaintext")
-
-        tar_buffer = create_tar_buffer(files_data)
-        if tar_buffer is None:
-            logger.error(messages.REPORTS_TAR_ERROR)
+        A rendered response can't be streamed, so the bundle is spooled to a
+        temporary file; the reports view streams it with create_reports_bundle.
+        """
+        request = renderer_context.get("request")
+        bundle = create_reports_bundle(data, request)
+        if bundle is None:
             return None
+        # pylint: disable=consider-using-with
+        tar_buffer = tempfile.SpooledTemporaryFile(max_size=TAR_CHUNK_SIZE)
+        for chunk in bundle:
+            tar_buffer.write(chunk)
+        tar_buffer.seek(0)
         return tar_buffer
@@ -14,6 +14,7 @@ import hashlib
 import json
 import sys
 import tarfile
+from io import BytesIO
 
 from django.core import management
 from django.test import TestCase
@@ -315,3 +316,24 @@ class ReportsTest(TestCase):
             new_hash = hashlib.sha256(file_contents).hexdigest()
             new_file2hash[hashed_filename] = new_hash
         assert new_file2hash == file2hash, "SHA256SUM content is incorrect"
+
+    def test_reports_streamed(self):
+        """Get the tar.gz bundle of a report streamed by the API."""
+        reports_dict = self.create_reports_dict()
+        response = self.client.get("/api/v1/reports/1/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        with tarfile.open(fileobj=BytesIO(b"".join(response.streaming_content))) as tar:
+            self.assertEqual(
+                tar.getnames(),
+                [
+                    "report_id_1/details.json",
+                    "report_id_1/deployments.json",
+                    "report_id_1/details.csv",
+                    "report_id_1/deployments.csv",
+                    "report_id_1/SHA256SUM",
+                ],
+            )
+            deployments_json = tar.extractfile("report_id_1/deployments.json").read()
+        self.assertEqual(json.loads(deployments_json), reports_dict["deployments_json"])
@@ -14,6 +14,7 @@
 import logging
 import os
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
 from rest_framework import status
@@ -33,7 +34,7 @@ from api.common.util import is_int, validate_query_param_bool
 from api.deployments_report.view import build_cached_json_report
 from api.details_report.util import mask_details_facts
 from api.models import DeploymentsReport, DetailsReport
-from api.reports.reports_gzip_renderer import ReportsGzipRenderer
+from api.reports.reports_gzip_renderer import ReportsGzipRenderer, create_reports_bundle
 from api.serializers import DetailsReportSerializer
 from api.user.authentication import QuipucordsExpiringTokenAuthentication
 
@@ -69,7 +70,6 @@ def reports(request, pk=None):
     json_details = serializer.data
     if validate_query_param_bool(mask_report):
         json_details = mask_details_facts(json_details)
-    json_details.pop("cached_csv", None)
     reports_dict["details_json"] = json_details
     # deployments
     deployments_data = get_object_or_404(DeploymentsReport.objects.all(), report_id=pk)
@@ -85,7 +85,12 @@ def reports(request, pk=None):
     deployments_report = build_cached_json_report(deployments_data, mask_report)
     if deployments_report:
         reports_dict["deployments_json"] = deployments_report
-        return Response(reports_dict)
+        bundle = create_reports_bundle(reports_dict, request)
+        if bundle is None:
+            return Response(reports_dict)
+        return StreamingHttpResponse(
+            bundle, content_type=request.accepted_renderer.media_type
+        )
     error = {
         "detail": f"Deployments report {pk} could not be masked."
         " Rerun the scan to generate a masked deployments report."
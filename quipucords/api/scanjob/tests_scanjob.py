@@ -13,7 +13,9 @@
 # pylint: disable=unused-argument,invalid-name,too-many-lines
 
 import json
+from base64 import b64encode
 from unittest.mock import patch
+from urllib.parse import urlencode
 
 from django.core import management
 from django.test import TestCase
@@ -702,6 +704,102 @@ class ScanJobTest(TestCase):
 
         self.assertEqual(json_response, expected)
 
+    def walk_cursor_pages(self, url):
+        """Follow the next and then the previous links of cursor paged results.
+
+        :returns: tuple with the pages following next and following previous
+        """
+        next_pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()
+            self.assertNotIn("count", page)
+            next_pages.append([result["name"] for result in page["results"]])
+            previous_url, url = page["previous"], page["next"]
+        previous_pages = []
+        url = previous_url
+        while url:
+            page = self.client.get(url).json()
+            previous_pages.insert(0, [result["name"] for result in page["results"]])
+            url = page["previous"]
+        return next_pages, previous_pages
+
+    def test_connection_cursor_paging(self):
+        """Test cursor paging for scanjob connection results."""
+        # pylint: disable=no-member
+        source2 = Source(name="source2", source_type="network", port=22)
+        source2.save()
+        source2.credentials.add(self.cred)
+        scan_job, scan_tasks = create_scan_job_two_tasks(
+            self.source, source2, ScanTask.SCAN_TYPE_CONNECT
+        )
+        statuses = [
+            SystemConnectionResult.SUCCESS,
+            SystemConnectionResult.FAILED,
+            SystemConnectionResult.UNREACHABLE,
+        ]
+        for index in range(11):
+            SystemConnectionResult.objects.create(
+                name=f"system-{index % 4}",
+                source=self.source,
+                credential=self.cred,
+                status=statuses[index % 3],
+                task_connection_result=scan_tasks[index % 2].connection_result,
+            )
+
+        url = reverse("scanjob-detail", args=(scan_job.id,)) + "connection/"
+        for ordering in ["status", "-status", "name", "-name"]:
+            expected = [
+                result["name"]
+                for result in self.client.get(
+                    f"{url}?ordering={ordering}&page_size=20"
+                ).json()["results"]
+            ]
+            next_pages, previous_pages = self.walk_cursor_pages(
+                f"{url}?ordering={ordering}&page_size=3&pagination=cursor"
+            )
+            self.assertEqual([len(page) for page in next_pages], [3, 3, 3, 2])
+            self.assertEqual(sum(next_pages, []), expected)
+            self.assertEqual(previous_pages, next_pages[:-1])
+
+        response = self.client.get(f"{url}?status=failed&pagination=cursor")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "next": None,
+                "previous": None,
+                "results": [
+                    {
+                        "name": f"system-{index % 4}",
+                        "status": "failed",
+                        "source": {
+                            "id": self.source.id,
+                            "name": "source1",
+                            "source_type": "network",
+                        },
+                        "credential": {"id": self.cred.id, "name": "cred1"},
+                    }
+                    for index in [1, 4, 7, 10]
+                ],
+            },
+        )
+
+    def test_connection_bad_pagination(self):
+        """Test the pagination of connection results is validated."""
+        scan_job, _ = create_scan_job(self.source, ScanTask.SCAN_TYPE_CONNECT)
+        url = reverse("scanjob-detail", args=(scan_job.id,)) + "connection/"
+        response = self.client.get(f"{url}?pagination=offset")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"{url}?pagination=cursor&cursor=bad")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        for position in (["a", "x"], [{}, 1], ["a", True], [None, 1], ["a"]):
+            querystring = urlencode({"p": json.dumps(position)})
+            cursor = b64encode(querystring.encode("ascii")).decode("ascii")
+            response = self.client.get(url, {"pagination": "cursor", "cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_connection_results_with_none(self):
         """Test connection results with no results for one task."""
         # pylint: disable=no-member
@@ -982,6 +1080,102 @@ class ScanJobTest(TestCase):
         }
         self.assertEqual(json_response, expected)
 
+    def test_inspection_cursor_paging(self):
+        """Test cursor paging of ScanJob inspection results."""
+        # pylint: disable=no-member
+        scan_job, scan_task = create_scan_job(self.source, ScanTask.SCAN_TYPE_INSPECT)
+        for index in range(7):
+            inspect_sys_result = SystemInspectionResult.objects.create(
+                name=f"system-{index % 3}",
+                status=SystemConnectionResult.SUCCESS,
+                source=self.source,
+                task_inspection_result=scan_task.inspection_result,
+            )
+            RawFact.objects.create(
+                name="index",
+                value=str(index),
+                system_inspection_result=inspect_sys_result,
+            )
+
+        url = reverse("scanjob-detail", args=(scan_job.id,)) + "inspection/"
+        next_pages, previous_pages = self.walk_cursor_pages(
+            f"{url}?ordering=-name&page_size=2&pagination=cursor"
+        )
+        self.assertEqual(
+            next_pages,
+            [
+                ["system-2", "system-2"],
+                ["system-1", "system-1"],
+                ["system-0", "system-0"],
+                ["system-0"],
+            ],
+        )
+        self.assertEqual(previous_pages, next_pages[:-1])
+        response = self.client.get(f"{url}?ordering=-name&pagination=cursor")
+        self.assertEqual(
+            [result["facts"] for result in response.json()["results"]],
+            [[{"name": "index", "value": index}] for index in [2, 5, 1, 4, 0, 3, 6]],
+        )
+
+    def test_results_query_count(self):
+        """Test results pages are fetched with the same number of queries."""
+        # pylint: disable=no-member
+        source2 = Source.objects.create(name="source2", source_type="network", port=22)
+        conn_job, conn_tasks = create_scan_job_two_tasks(
+            self.source, source2, ScanTask.SCAN_TYPE_CONNECT
+        )
+        inspect_job, inspect_tasks = create_scan_job_two_tasks(
+            self.source, source2, ScanTask.SCAN_TYPE_INSPECT, "inspect"
+        )
+        inspect_tasks = inspect_tasks.filter(scan_type=ScanTask.SCAN_TYPE_INSPECT)
+        conn_url = reverse("scanjob-detail", args=(conn_job.id,)) + "connection/"
+        inspect_url = reverse("scanjob-detail", args=(inspect_job.id,)) + "inspection/"
+
+        for systems in (1, 20):
+            for index in range(systems):
+                source = (self.source, source2)[index % 2]
+                SystemConnectionResult.objects.create(
+                    name=f"system-{index}",
+                    source=source,
+                    credential=self.cred,
+                    status=SystemConnectionResult.SUCCESS,
+                    task_connection_result=conn_tasks[index % 2].connection_result,
+                )
+                inspect_sys_result = SystemInspectionResult.objects.create(
+                    name=f"system-{index}",
+                    source=source,
+                    status=SystemConnectionResult.SUCCESS,
+                    task_inspection_result=inspect_tasks[index % 2].inspection_result,
+                )
+                for fact in range(5):
+                    RawFact.objects.create(
+                        name=f"fact-{fact}",
+                        value=json.dumps(fact),
+                        system_inspection_result=inspect_sys_result,
+                    )
+
+            # job, count, systems, sources and credentials or facts
+            with self.assertNumQueries(5):
+                response = self.client.get(f"{conn_url}?page_size=100")
+            self.assertTrue(
+                all(
+                    result["credential"] == {"id": self.cred.id, "name": "cred1"}
+                    for result in response.json()["results"]
+                )
+            )
+            with self.assertNumQueries(5):
+                response = self.client.get(f"{inspect_url}?page_size=100")
+            self.assertTrue(
+                all(
+                    result["facts"]
+                    == [{"name": f"fact-{fact}", "value": fact} for fact in range(5)]
+                    for result in response.json()["results"]
+                )
+            )
+            # no count with cursor pagination
+            with self.assertNumQueries(4):
+                self.client.get(f"{inspect_url}?page_size=100&pagination=cursor")
+
     def test_inspection_ordering_by_name(self):
         """Tests inspection result ordering by name."""
         # pylint: disable=too-many-locals
@@ -27,9 +27,16 @@ from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
 from api import messages
-from api.common.pagination import StandardResultsSetPagination
+from api.common.pagination import KeysetResultsPagination, StandardResultsSetPagination
 from api.common.util import is_int
-from api.models import Credential, RawFact, ScanJob, ScanTask, Source
+from api.models import (
+    Credential,
+    ScanJob,
+    ScanTask,
+    Source,
+    SystemConnectionResult,
+    SystemInspectionResult,
+)
 from api.scanjob.serializer import expand_scanjob
 from api.serializers import (
     ScanJobSerializer,
@@ -45,50 +52,62 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 RESULTS_KEY = "task_results"
 
 
-def expand_source(system):
-    """Expand the json source."""
-    if "source" in system.keys():
-        source_id = system["source"]
-        if source_id is None:
-            system["source"] = "deleted"
-        else:
-            system["source"] = (
-                Source.objects.filter(id=source_id)
-                .values("id", "name", "source_type")
-                .first()
-            )
+def expand_sources(systems):
+    """Expand the json source of systems.
+
+    :param systems: A list of dictionaries for system results.
+    """
+    source_ids = {system.get("source") for system in systems} - {None}
+    sources = {
+        source["id"]: source
+        for source in Source.objects.filter(id__in=source_ids).values(
+            "id", "name", "source_type"
+        )
+    }
+    for system in systems:
+        if "source" in system.keys():
+            source_id = system["source"]
+            if source_id is None:
+                system["source"] = "deleted"
+            else:
+                system["source"] = sources.get(source_id)
 
 
-def expand_system_connection(system):
+def expand_system_connections(systems):
     """Expand the system connection results.
 
-    :param system: A dictionary for a conn system result.
+    :param systems: A list of dictionaries for conn system results.
     """
-    expand_source(system)
-    if "credential" in system.keys():
-        cred_id = system["credential"]
-        system["credential"] = (
-            Credential.objects.filter(id=cred_id).values("id", "name").first()
+    expand_sources(systems)
+    cred_ids = {system.get("credential") for system in systems} - {None}
+    credentials = {
+        credential["id"]: credential
+        for credential in Credential.objects.filter(id__in=cred_ids).values(
+            "id", "name"
         )
+    }
+    for system in systems:
+        if "credential" in system.keys():
+            system["credential"] = credentials.get(system["credential"])
 
 
-def expand_system_inspection(system):
+def expand_system_inspections(systems, system_results):
     """Expand the system inspection results.
 
-    :param system: A dictionary for a inspection system result.
+    :param systems: A list of dictionaries for inspection system results.
+    :param system_results: The SystemInspectionResult instances systems were
+        serialized from, with their facts prefetched.
     """
-    expand_source(system)
-    if "facts" in system.keys():
-        facts = []
-        fact_ids = system["facts"]
-        for fact_id in fact_ids:
-            raw_fact = (
-                RawFact.objects.filter(id=fact_id).values("name", "value").first()
-            )
-            if raw_fact.get("value") is not None:
-                raw_fact["value"] = json.loads(raw_fact["value"])
-            facts.append(raw_fact)
-        system["facts"] = facts
+    expand_sources(systems)
+    for system, system_result in zip(systems, system_results):
+        if "facts" in system.keys():
+            facts = []
+            for raw_fact in system_result.facts.all():
+                value = raw_fact.value
+                if value is not None:
+                    value = json.loads(value)
+                facts.append({"name": raw_fact.name, "value": value})
+            system["facts"] = facts
 
 
 class ScanJobFilter(FilterSet):
@@ -171,6 +190,29 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
 
         return (ordering_filter, status_filter, source_id_filter)
 
+    @staticmethod
+    def get_results_paginator(request, ordering_filter):
+        """Get the paginator of system results or return validation errors.
+
+        Results are paginated by page number unless pagination=cursor is
+        requested, which pages them by keyset so deep pages are as cheap to
+        fetch as the first one.
+        @param request: The incoming request
+        @param ordering_filter: The validated ordering filter
+        @returns: A paginator instance
+        """
+        valid_pagination_modes = ["page", "cursor"]
+        pagination_param = "pagination"
+        pagination_mode = request.query_params.get(pagination_param, "page")
+        if pagination_mode not in valid_pagination_modes:
+            valid_list = ", ".join(valid_pagination_modes)
+            message = _(messages.QUERY_PARAM_INVALID % (pagination_param, valid_list))
+            error = {"detail": [message]}
+            raise ValidationError(error)
+        if pagination_mode == "cursor":
+            return KeysetResultsPagination(ordering_filter)
+        return StandardResultsSetPagination()
+
     # pylint: disable=too-many-locals
     @action(detail=True, methods=["get"])
     def connection(self, request, pk=None):
@@ -179,35 +221,29 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
             request
         )
 
+        paginator = self.get_results_paginator(request, ordering_filter)
+
         try:
             scan_job = get_object_or_404(self.queryset, pk=pk)
-            all_tasks = scan_job.connection_results.task_results.all()
         except ValueError:
             return Response(status=400)
 
-        system_result_queryset = None
-        for task_result in all_tasks:
-            if system_result_queryset is None:
-                system_result_queryset = task_result.systems.all()
-            else:
-                system_result_queryset = (
-                    system_result_queryset | task_result.systems.all()
-                )
         # create ordered queryset and assign the paginator
-        ordered_query_set = system_result_queryset.order_by(ordering_filter)
+        ordered_query_set = SystemConnectionResult.objects.filter(
+            task_connection_result__job_connection_result=scan_job.connection_results_id
+        ).order_by(ordering_filter, "id")
         if status_filter:
             ordered_query_set = ordered_query_set.filter(status=status_filter)
         if source_id_filter:
             ordered_query_set = ordered_query_set.filter(source__id=source_id_filter)
 
-        paginator = StandardResultsSetPagination()
         page = paginator.paginate_queryset(ordered_query_set, request)
 
         if page is not None:
             serializer = SystemConnectionResultSerializer(page, many=True)
-            for system in serializer.data:
-                expand_system_connection(system)
-            return paginator.get_paginated_response(serializer.data)
+            systems = serializer.data
+            expand_system_connections(systems)
+            return paginator.get_paginated_response(systems)
         return Response(status=404)
 
     # pylint: disable=too-many-locals
@@ -218,22 +254,23 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
             request
         )
 
+        paginator = self.get_results_paginator(request, ordering_filter)
+
         try:
             scan_job = get_object_or_404(self.queryset, pk=pk)
-            all_tasks = scan_job.inspection_results.task_results.all()
         except ValueError:
             return Response(status=400)
-        system_result_queryset = None
-        for task_result in all_tasks:
-            if system_result_queryset is None:
-                system_result_queryset = task_result.systems.all()
-            else:
-                system_result_queryset = (
-                    system_result_queryset | task_result.systems.all()
-                )
+
         # create ordered queryset and assign the paginator
-        paginator = StandardResultsSetPagination()
-        ordered_query_set = system_result_queryset.order_by(ordering_filter)
+        ordered_query_set = (
+            SystemInspectionResult.objects.filter(
+                task_inspection_result__job_inspection_result=(
+                    scan_job.inspection_results_id
+                )
+            )
+            .prefetch_related("facts")
+            .order_by(ordering_filter, "id")
+        )
         if status_filter:
             ordered_query_set = ordered_query_set.filter(status=status_filter)
         if source_id_filter:
@@ -243,9 +280,9 @@ class ScanJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
 
         if page is not None:
             serializer = SystemInspectionResultSerializer(page, many=True)
-            for system in serializer.data:
-                expand_system_inspection(system)
-            return paginator.get_paginated_response(serializer.data)
+            systems = serializer.data
+            expand_system_inspections(systems, page)
+            return paginator.get_paginated_response(systems)
         return Response(status=404)
 
     @action(detail=True, methods=["put"])
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Date parsing for fingerprint date facts."""
+
+from collections import Counter
+from datetime import datetime
+
+from fingerprinter.utils import strip_suffix
+
+# Max number of raw date values whose parsed date is remembered
+DATE_CACHE_SIZE = 100000
+
+
+class DateParser:
+    """Parse date facts trying multiple strptime patterns.
+
+    The pattern that last matched a fact of a source is tried first for the
+    next values of that fact, and dates parsed from repeated raw values are
+    remembered. Values that can't be parsed are counted per source and fact
+    instead of being reported one by one.
+    """
+
+    def __init__(self, cache_size=DATE_CACHE_SIZE):
+        """Initialize DateParser.
+
+        :param cache_size: max number of parsed raw values to remember
+        """
+        self.cache_size = cache_size
+        # last matched pattern by (source_type, source_name, raw_fact_key)
+        self._matched_patterns = {}
+        # parsed date (or None) by (raw date value, patterns)
+        self._parsed_dates = {}
+        # unparsed values count by (source_type, source_name, raw_fact_key)
+        self.misses = Counter()
+        # first unparsed value by (source_type, source_name, raw_fact_key)
+        self.unparsed_values = {}
+
+    def parse(self, source, raw_fact_key, date_value, patterns):
+        """Parse date_value with the first matching pattern.
+
+        :param source: The source that provided this fact.
+        :param raw_fact_key: fact key with date.
+        :param date_value: date value to parse
+        :param patterns: strptime patterns date_value might be formatted with
+        :returns: parsed date or None
+        """
+        if not date_value:
+            return None
+        raw_date_value = strip_suffix(date_value, " UTC")
+        fact_key = (source["source_type"], source["source_name"], raw_fact_key)
+        cache_key = (raw_date_value, tuple(patterns))
+        try:
+            parsed_date = self._parsed_dates[cache_key]
+        except KeyError:
+            parsed_date = self._strptime(fact_key, raw_date_value, patterns)
+            if len(self._parsed_dates) < self.cache_size:
+                self._parsed_dates[cache_key] = parsed_date
+
+        if parsed_date is None:
+            self.misses[fact_key] += 1
+            self.unparsed_values.setdefault(fact_key, raw_date_value)
+        return parsed_date
+
+    def _strptime(self, fact_key, raw_date_value, patterns):
+        """Parse raw_date_value, starting with the last pattern matched for fact."""
+        matched_pattern = self._matched_patterns.get(fact_key)
+        if matched_pattern in patterns:
+            patterns = [matched_pattern] + [
+                pattern for pattern in patterns if pattern != matched_pattern
+            ]
+        for pattern in patterns:
+            try:
+                parsed_date = datetime.strptime(raw_date_value, pattern).date()
+            except ValueError:
+                continue
+            self._matched_patterns[fact_key] = pattern
+            return parsed_date
+        return None
+
+    def update_misses(self, misses, unparsed_values):
+        """Add the unparsed values counted by another DateParser.
+
+        :param misses: DateParser.misses of the other parser
+        :param unparsed_values: DateParser.unparsed_values of the other parser
+        """
+        self.misses.update(misses)
+        for fact_key, raw_date_value in unparsed_values.items():
+            self.unparsed_values.setdefault(fact_key, raw_date_value)
+
+    def pop_misses(self):
+        """Return and reset the unparsed values counted so far.
+
+        :returns: tuple with the misses Counter and the first unparsed values
+        """
+        misses, unparsed_values = self.misses, self.unparsed_values
+        self.misses = Counter()
+        self.unparsed_values = {}
+        return misses, unparsed_values
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Compact representation of fingerprint fact metadata."""
+
+from collections.abc import Mapping
+from typing import NamedTuple
+
+
+class SourceDescriptor(NamedTuple):
+    """Source that provided a fingerprint fact."""
+
+    server_id: str
+    source_name: str
+    source_type: str
+
+
+FACT_METADATA_KEYS = SourceDescriptor._fields + ("raw_fact_key", "has_sudo")
+
+
+class FactMetadata(Mapping):
+    """Metadata of a single fingerprint fact.
+
+    Reads like the dict stored in SystemFingerprint.metadata, but every fact
+    found by a source references the same SourceDescriptor instead of
+    holding its own copy of the source information.
+    """
+
+    __slots__ = ("source", "raw_fact_key", "has_sudo")
+
+    def __init__(self, source, raw_fact_key, has_sudo):
+        """Initialize FactMetadata.
+
+        :param source: SourceDescriptor of the source that found the fact
+        :param raw_fact_key: raw fact(s) the fingerprint fact comes from
+        :param has_sudo: whether the fact was collected with sudo
+        """
+        self.source = source
+        self.raw_fact_key = raw_fact_key
+        self.has_sudo = has_sudo
+
+    def __getitem__(self, key):
+        """Return the metadata value for key."""
+        if key in SourceDescriptor._fields:
+            return getattr(self.source, key)
+        if key in ("raw_fact_key", "has_sudo"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        """Iterate over metadata keys."""
+        return iter(FACT_METADATA_KEYS)
+
+    def __len__(self):
+        """Return the number of metadata keys."""
+        return len(FACT_METADATA_KEYS)
+
+    def __repr__(self):
+        """Represent metadata as the dict it stands for."""
+        return repr(dict(self))
+
+    def __reduce__(self):
+        """Pickle metadata without its slots dict."""
+        return (self.__class__, (self.source, self.raw_fact_key, self.has_sudo))
+
+
+def expand_metadata(metadata):
+    """Convert fingerprint metadata back to plain, JSON serializable dicts.
+
+    :param metadata: dict of FactMetadata (or dicts) by fingerprint fact
+    :returns: dict of dicts by fingerprint fact
+    """
+    return {
+        fact_name: dict(fact_metadata) for fact_name, fact_metadata in metadata.items()
+    }
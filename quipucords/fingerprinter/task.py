@@ -12,12 +12,18 @@
 import json
 import logging
 import math
+import multiprocessing
 import uuid
-from copy import deepcopy
-from datetime import datetime
-
-from django.db import DataError
-from rest_framework.serializers import DateField, DateTimeField
+from copy import copy
+
+from django.conf import settings
+from django.db import DataError, connections, transaction
+from rest_framework.serializers import (
+    DateField,
+    DateTimeField,
+    HiddenField,
+    ValidationError,
+)
 
 from api.common.common_report import create_report_version
 from api.common.util import (
@@ -47,10 +53,12 @@ from fingerprinter.constants import (
     PRODUCTS_KEY,
     SOURCES_KEY,
 )
+from fingerprinter.dateparse import DateParser
 from fingerprinter.jboss_brms import detect_jboss_brms
 from fingerprinter.jboss_eap import detect_jboss_eap
 from fingerprinter.jboss_fuse import detect_jboss_fuse
 from fingerprinter.jboss_web_server import detect_jboss_ws
+from fingerprinter.metadata import FactMetadata, SourceDescriptor, expand_metadata
 from fingerprinter.utils import strip_suffix
 from scanner.openshift import formatters as ocp_formatters
 from scanner.task import ScanTaskRunner
@@ -117,6 +125,28 @@ VCENTER_KEY = Source.VCENTER_SOURCE_TYPE
 SATELLITE_KEY = Source.SATELLITE_SOURCE_TYPE
 OPENSHIFT_KEY = Source.OPENSHIFT_SOURCE_TYPE
 
+# Number of facts per source converted to fingerprints by each worker task
+FACT_CHUNK_SIZE = 500
+
+# Task runner used by the fingerprint worker processes
+_worker_task_runner = None
+
+
+def _init_fingerprint_worker(task_runner):
+    """Set the task runner of a fingerprint worker process."""
+    global _worker_task_runner  # pylint: disable=global-statement
+    _worker_task_runner = task_runner
+
+
+def _process_source_chunk(source):
+    """Convert the facts of a source chunk to fingerprints in a worker process.
+
+    :returns: tuple with the fingerprints and the date parse misses of chunk
+    """
+    # pylint: disable=protected-access
+    fingerprints = _worker_task_runner._process_source(source)
+    return fingerprints, _worker_task_runner._date_parser.pop_misses()
+
 
 class FingerprintTaskRunner(ScanTaskRunner):
     """ConnectTaskRunner system connection capabilities.
@@ -129,6 +159,17 @@ class FingerprintTaskRunner(ScanTaskRunner):
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-arguments,too-few-public-methods
 
+    def __init__(self, scan_job, scan_task):
+        """Set context for task execution.
+
+        :param scan_job: the scan job that contains this task
+        :param scan_task: the scan task model for this task
+        """
+        super().__init__(scan_job, scan_task)
+        # SourceDescriptors referenced by fact metadata, interned per source
+        self._source_descriptors = {}
+        self._date_parser = DateParser()
+
     @staticmethod
     def format_certs(redhat_certs):
         """Strip the .pem from each cert in the list.
@@ -277,7 +318,6 @@ class FingerprintTaskRunner(ScanTaskRunner):
         number_valid = 0
         number_invalid = 0
         self.scan_task.log_message("START FINGERPRINT PERSISTENCE")
-        status_count = 0
         total_count = len(fingerprints_list)
         deployment_report = details_report.deployment_report
         date_field = DateField()
@@ -295,133 +335,109 @@ class FingerprintTaskRunner(ScanTaskRunner):
         insights_last_reported = datetime_field.to_representation(
             self.scan_task.start_time
         )
-        for fingerprint_dict in fingerprints_list:
-            found_canonical_facts = False
-            # Remove keys that are not part of SystemFingerprint model
-            fingerprint_attributes = set(fingerprint_dict.keys())
-            invalid_attributes = fingerprint_attributes - valid_fact_attributes
-            for invalid_attribute in invalid_attributes:
-                fingerprint_dict.pop(invalid_attribute, None)
-
-            status_count += 1
-            name = fingerprint_dict.get("name", "unknown")
-            os_release = fingerprint_dict.get("os_release", "unknown")
+        batch_size = settings.QPC_FINGERPRINT_BATCH_SIZE
+        for batch_start in range(0, total_count, batch_size):
+            if batch_start:
+                self.check_for_interrupt(manager_interrupt)
+            batch = fingerprints_list[batch_start : batch_start + batch_size]
+            saved_fingerprints = self._save_fingerprints(
+                batch, deployment_report, valid_fact_attributes
+            )
+            number_invalid += len(batch) - len(saved_fingerprints)
             self.scan_task.log_message(
-                f"FINGERPRINT {status_count} of {total_count} SAVED - Fingerprint "
-                f"(name={name}, os_release={os_release})"
+                f"FINGERPRINTS {batch_start + len(batch)} of {total_count} "
+                f"PROCESSED - (saved={len(saved_fingerprints)}, "
+                f"invalid={len(batch) - len(saved_fingerprints)})"
             )
+            for fingerprint_dict, fingerprint in saved_fingerprints:
+                found_canonical_facts = False
 
-            if status_count % 100 == 0:
-                self.check_for_interrupt(manager_interrupt)
-            fingerprint_dict["deployment_report"] = deployment_report.id
-            serializer = SystemFingerprintSerializer(data=fingerprint_dict)
-            if serializer.is_valid():
-                try:
-                    fingerprint = serializer.save()
-
-                    # Add auto-generated fields for the insights report
-                    fingerprint_dict["id"] = fingerprint.id
-
-                    # Serialize the date
-                    for field in SystemFingerprint.DATE_FIELDS:
-                        if fingerprint_dict.get(field, None):
-                            fingerprint_dict[field] = date_field.to_representation(
-                                fingerprint_dict.get(field)
-                            )
-                    final_fingerprint_list.append(fingerprint_dict)
-
-                    # Check if fingerprint has canonical facts
-                    for fact in CANONICAL_FACTS:
-                        if fingerprint_dict.get(fact):
-                            found_canonical_facts = True
-                            break
-                    if found_canonical_facts:
-                        not_null_facts = {
-                            "bios_uuid": "bios_uuid",
-                            "ip_addresses": "ip_addresses",
-                            "mac_addresses": "mac_addresses",
-                            "insights_id": "insights_client_id",
-                            "subscription_manager_id": "subscription_manager_id",
-                            "rhel_machine_id": "etc_machine_id",
-                            "fqdn": "name",
-                        }
-                        insights_host = {}
-                        insights_host["display_name"] = fingerprint_dict.get("name")
-                        for host_inv_fact, qpc_fact in not_null_facts.items():
-                            if fingerprint_dict.get(qpc_fact):
-                                insights_host[host_inv_fact] = fingerprint_dict.get(
-                                    qpc_fact
-                                )
-                        nested_facts = {
-                            "rh_product_certs": self.format_certs(
-                                fingerprint_dict.get("redhat_certs", [])
-                            ),
-                            "rh_products_installed": self.format_products(
-                                fingerprint_dict.get("products", []),
-                                fingerprint_dict.get("is_redhat"),
-                            ),
-                            "last_reported": insights_last_reported,
-                        }
-                        if fingerprint_dict.get("virtual_host_name"):
-                            nested_facts["virtual_host_name"] = fingerprint_dict.get(
-                                "virtual_host_name"
-                            )
-                        if fingerprint_dict.get("virtual_host_uuid"):
-                            nested_facts["virtual_host_uuid"] = fingerprint_dict.get(
-                                "virtual_host_uuid"
-                            )
-                        if fingerprint_dict.get("system_purpose"):
-                            nested_facts["system_purpose"] = fingerprint_dict.get(
-                                "system_purpose"
+                # Add auto-generated fields for the insights report
+                fingerprint_dict["id"] = fingerprint.id
+
+                # Serialize the date
+                for field in SystemFingerprint.DATE_FIELDS:
+                    if fingerprint_dict.get(field, None):
+                        fingerprint_dict[field] = date_field.to_representation(
+                            fingerprint_dict.get(field)
+                        )
+                final_fingerprint_list.append(fingerprint_dict)
+
+                # Check if fingerprint has canonical facts
+                for fact in CANONICAL_FACTS:
+                    if fingerprint_dict.get(fact):
+                        found_canonical_facts = True
+                        break
+                if found_canonical_facts:
+                    not_null_facts = {
+                        "bios_uuid": "bios_uuid",
+                        "ip_addresses": "ip_addresses",
+                        "mac_addresses": "mac_addresses",
+                        "insights_id": "insights_client_id",
+                        "subscription_manager_id": "subscription_manager_id",
+                        "rhel_machine_id": "etc_machine_id",
+                        "fqdn": "name",
+                    }
+                    insights_host = {}
+                    insights_host["display_name"] = fingerprint_dict.get("name")
+                    for host_inv_fact, qpc_fact in not_null_facts.items():
+                        if fingerprint_dict.get(qpc_fact):
+                            insights_host[host_inv_fact] = fingerprint_dict.get(
+                                qpc_fact
                             )
-                        system_sources = fingerprint_dict.get(SOURCES_KEY)
-                        source_types = []
-                        if system_sources is not None:
-                            sources_info = compute_source_info(system_sources)
-                            if sources_info.get(NETWORK_DETECTION_KEY):
-                                source_types.append("network")
-                            if sources_info.get(VCENTER_DETECTION_KEY):
-                                source_types.append("vcenter")
-                            if sources_info.get(SATELLITE_DETECTION_KEY):
-                                source_types.append("satellite")
-                            if sources_info.get(OPENSHIFT_DETECTION_KEY):
-                                source_types.append("openshift")
-                        if source_types:
-                            nested_facts["source_types"] = source_types
-
-                        facts = {"namespace": "qpc", "facts": nested_facts}
-                        insights_host["facts"] = [facts]
-                        system_profile = self.format_system_profile(fingerprint_dict)
-                        if system_profile:
-                            insights_host["system_profile"] = system_profile
-                        insights_hosts.append(insights_host)
-                        insights_valid += 1
-                    else:
-                        invalid_hosts.append(fingerprint_dict.get("name"))
-
-                    number_valid += 1
-                except DataError as error:
-                    number_invalid += 1
-                    self.scan_task.log_message(
-                        "The fingerprint could not be saved. "
-                        f"Fingerprint: {str(error).strip()}. Error: {fingerprint_dict}",
-                        log_level=logging.ERROR,
-                        exception=error,
-                    )
-            else:
-                number_invalid += 1
-                self.scan_task.log_message(
-                    f"Invalid fingerprint: {fingerprint_dict}",
-                    log_level=logging.ERROR,
-                )
+                    nested_facts = {
+                        "rh_product_certs": self.format_certs(
+                            fingerprint_dict.get("redhat_certs", [])
+                        ),
+                        "rh_products_installed": self.format_products(
+                            fingerprint_dict.get("products", []),
+                            fingerprint_dict.get("is_redhat"),
+                        ),
+                        "last_reported": insights_last_reported,
+                    }
+                    if fingerprint_dict.get("virtual_host_name"):
+                        nested_facts["virtual_host_name"] = fingerprint_dict.get(
+                            "virtual_host_name"
+                        )
+                    if fingerprint_dict.get("virtual_host_uuid"):
+                        nested_facts["virtual_host_uuid"] = fingerprint_dict.get(
+                            "virtual_host_uuid"
+                        )
+                    if fingerprint_dict.get("system_purpose"):
+                        nested_facts["system_purpose"] = fingerprint_dict.get(
+                            "system_purpose"
+                        )
+                    system_sources = fingerprint_dict.get(SOURCES_KEY)
+                    source_types = []
+                    if system_sources is not None:
+                        sources_info = compute_source_info(system_sources)
+                        if sources_info.get(NETWORK_DETECTION_KEY):
+                            source_types.append("network")
+                        if sources_info.get(VCENTER_DETECTION_KEY):
+                            source_types.append("vcenter")
+                        if sources_info.get(SATELLITE_DETECTION_KEY):
+                            source_types.append("satellite")
+                        if sources_info.get(OPENSHIFT_DETECTION_KEY):
+                            source_types.append("openshift")
+                    if source_types:
+                        nested_facts["source_types"] = source_types
+
+                    facts = {"namespace": "qpc", "facts": nested_facts}
+                    insights_host["facts"] = [facts]
+                    system_profile = self.format_system_profile(fingerprint_dict)
+                    if system_profile:
+                        insights_host["system_profile"] = system_profile
+                    insights_hosts.append(insights_host)
+                    insights_valid += 1
+                else:
+                    invalid_hosts.append(fingerprint_dict.get("name"))
+
+                number_valid += 1
                 self.scan_task.log_message(
-                    f"Fingerprint errors: {serializer.errors}",
-                    log_level=logging.ERROR,
+                    f"Fingerprints (report id={details_report.id}): "
+                    f"{fingerprint_dict}",
+                    log_level=logging.DEBUG,
                 )
-            self.scan_task.log_message(
-                f"Fingerprints (report id={details_report.id}): {fingerprint_dict}",
-                log_level=logging.DEBUG,
-            )
 
         # Mark completed because engine has processed raw facts
         status = ScanTask.COMPLETED
@@ -476,6 +492,77 @@ class FingerprintTaskRunner(ScanTaskRunner):
 
         return status_message, status
 
+    def _save_fingerprints(self, fingerprints, deployment_report, valid_attributes):
+        """Validate a batch of fingerprints and save the valid ones in bulk.
+
+        :param fingerprints: list of fingerprint dicts
+        :param deployment_report: DeploymentsReport owning the fingerprints
+        :param valid_attributes: names of the SystemFingerprint fields
+        :returns: list of (fingerprint dict, SystemFingerprint) tuples for
+        the fingerprints that were saved
+        """
+        bulk_serializer = SystemFingerprintSerializer(many=True)
+        # reuse the same fields to validate every fingerprint of the batch
+        validator = bulk_serializer.child
+        # and don't query the deployments report once per fingerprint
+        validator.fields["deployment_report"] = HiddenField(default=deployment_report)
+
+        valid_fingerprints = []
+        for fingerprint_dict in fingerprints:
+            # Remove keys that are not part of SystemFingerprint model
+            invalid_attributes = set(fingerprint_dict.keys()) - valid_attributes
+            for invalid_attribute in invalid_attributes:
+                fingerprint_dict.pop(invalid_attribute, None)
+
+            if META_DATA_KEY in fingerprint_dict:
+                fingerprint_dict[META_DATA_KEY] = expand_metadata(
+                    fingerprint_dict[META_DATA_KEY]
+                )
+            fingerprint_dict["deployment_report"] = deployment_report.id
+            try:
+                validated_data = validator.run_validation(fingerprint_dict)
+            except ValidationError as error:
+                self.scan_task.log_message(
+                    f"Invalid fingerprint: {fingerprint_dict}",
+                    log_level=logging.ERROR,
+                )
+                self.scan_task.log_message(
+                    f"Fingerprint errors: {error.detail}",
+                    log_level=logging.ERROR,
+                )
+                continue
+            valid_fingerprints.append((fingerprint_dict, validated_data))
+        if not valid_fingerprints:
+            return []
+
+        try:
+            with transaction.atomic():
+                saved = bulk_serializer.create(
+                    [validated_data for _, validated_data in valid_fingerprints]
+                )
+            return [
+                (fingerprint_dict, fingerprint)
+                for (fingerprint_dict, _), fingerprint in zip(valid_fingerprints, saved)
+            ]
+        except DataError:
+            # save them one at a time to skip the ones the database rejects
+            pass
+
+        saved_fingerprints = []
+        for fingerprint_dict, validated_data in valid_fingerprints:
+            try:
+                with transaction.atomic():
+                    (fingerprint,) = bulk_serializer.create([validated_data])
+                saved_fingerprints.append((fingerprint_dict, fingerprint))
+            except DataError as error:
+                self.scan_task.log_message(
+                    "The fingerprint could not be saved. "
+                    f"Fingerprint: {str(error).strip()}. Error: {fingerprint_dict}",
+                    log_level=logging.ERROR,
+                    exception=error,
+                )
+        return saved_fingerprints
+
     @staticmethod
     def _format_count_message(fingerprint_map, total_only=False):
         if not total_only:
@@ -523,6 +610,7 @@ class FingerprintTaskRunner(ScanTaskRunner):
         source_list = details_report.get_sources()
         total_source_count = len(source_list)
         self.scan_task.log_message(f"{total_source_count} sources to process")
+        fingerprints_per_source = self._process_source_list(source_list)
         source_count = 0
         for source in source_list:
             source_count += 1
@@ -534,7 +622,7 @@ class FingerprintTaskRunner(ScanTaskRunner):
                 + f" server={source.get('server_id')})"
             )
 
-            source_fingerprints = self._process_source(source)
+            source_fingerprints = next(fingerprints_per_source)
             fingerprint_map[source_type].extend(source_fingerprints)
 
             self.scan_task.log_message(
@@ -648,8 +736,21 @@ class FingerprintTaskRunner(ScanTaskRunner):
         )
 
         self._post_process_merged_fingerprints(fingerprint_map[COMBINED_KEY])
+        self._log_date_parse_misses()
         return fingerprint_map[COMBINED_KEY]
 
+    def _log_date_parse_misses(self):
+        """Log the date facts that couldn't be parsed, once per source and fact."""
+        misses, unparsed_values = self._date_parser.pop_misses()
+        for fact_key, count in misses.items():
+            source_type, source_name, raw_fact_key = fact_key
+            self.scan_task.log_message(
+                f"Fingerprinter ({source_type}, {source_name}) - "
+                f"Could not parse date for {raw_fact_key} of {count} system(s). "
+                f"Unsupported date format: '{unparsed_values[fact_key]}'.",
+                log_level=logging.ERROR,
+            )
+
     def _post_process_merged_fingerprints(self, fingerprints):
         """Normalize cross source fingerprint values.
 
@@ -698,9 +799,59 @@ class FingerprintTaskRunner(ScanTaskRunner):
             fingerprint[META_DATA_KEY][sys_creation_key] = system_creation_date_metadata
         else:
             raw_fact_key = "/".join(RAW_DATE_KEYS.keys())
-            system_creation_date_metadata["raw_fact_key"] = raw_fact_key
+            # metadata entries can be shared between merged fingerprints
+            system_creation_date_metadata = {
+                **system_creation_date_metadata,
+                "raw_fact_key": raw_fact_key,
+            }
             fingerprint[META_DATA_KEY][sys_creation_key] = system_creation_date_metadata
 
+    def _process_source_list(self, source_list):
+        """Convert the facts of each source to fingerprints.
+
+        With settings.QPC_FINGERPRINT_WORKERS > 1, facts are split in chunks
+        of FACT_CHUNK_SIZE and converted by a pool of worker processes.
+        Results are gathered in order, so fingerprints are the same as the
+        ones produced in the current process.
+        :param source_list: list of sources with their facts
+        :returns: iterator over the fingerprints of each source
+        """
+        workers = settings.QPC_FINGERPRINT_WORKERS
+        if workers <= 1:
+            for source in source_list:
+                yield self._process_source(source)
+            return
+
+        chunk_counts = []
+        chunks = []
+        for source in source_list:
+            facts = source.get("facts", [])
+            source_info = {
+                key: value for key, value in source.items() if key != "facts"
+            }
+            chunk_counts.append(math.ceil(len(facts) / FACT_CHUNK_SIZE))
+            chunks.extend(
+                {**source_info, "facts": facts[start : start + FACT_CHUNK_SIZE]}
+                for start in range(0, len(facts), FACT_CHUNK_SIZE)
+            )
+
+        context = multiprocessing.get_context("fork")
+        # forked processes must not share the parent database connections
+        connections.close_all()
+        with context.Pool(
+            processes=workers,
+            initializer=_init_fingerprint_worker,
+            initargs=(self,),
+        ) as pool:
+            results = pool.imap(_process_source_chunk, chunks)
+            for chunk_count in chunk_counts:
+                source_fingerprints = []
+                for _ in range(chunk_count):
+                    chunk_fingerprints, date_misses = next(results)
+                    source_fingerprints.extend(chunk_fingerprints)
+                    self._date_parser.update_misses(*date_misses)
+                yield source_fingerprints
+
     def _process_source(self, source):
         """Process facts and convert to fingerprints.
 
@@ -875,9 +1026,11 @@ class FingerprintTaskRunner(ScanTaskRunner):
         if not fingerprint_list:
             return fingerprint_list
 
-        result_list = deepcopy(fingerprint_list)
+        result_list = fingerprint_list
         for id_key in id_key_list:
             unique_dict = {}
+            # id values whose fingerprint is a copy owned by this pass
+            merged_values = set()
             no_global_id_list = []
             for fingerprint in result_list:
                 unique_id_value = fingerprint.get(id_key)
@@ -885,8 +1038,15 @@ class FingerprintTaskRunner(ScanTaskRunner):
                     # Add or update fingerprint value
                     existing_fingerprint = unique_dict.get(unique_id_value)
                     if existing_fingerprint:
-                        unique_dict[unique_id_value] = self._merge_fingerprint(
-                            existing_fingerprint, fingerprint
+                        if unique_id_value not in merged_values:
+                            # copy on first merge, later merges happen in place
+                            existing_fingerprint = self._copy_fingerprint(
+                                existing_fingerprint
+                            )
+                            unique_dict[unique_id_value] = existing_fingerprint
+                            merged_values.add(unique_id_value)
+                        self._merge_fingerprint(
+                            existing_fingerprint, fingerprint, in_place=True
                         )
                     else:
                         unique_dict[unique_id_value] = fingerprint
@@ -897,11 +1057,31 @@ class FingerprintTaskRunner(ScanTaskRunner):
 
             # Strip id key from fingerprints if requested
             if remove_key:
-                for fingerprint in result_list:
-                    fingerprint.pop(id_key, None)
+                result_list = [
+                    {key: value for key, value in fingerprint.items() if key != id_key}
+                    if id_key in fingerprint
+                    else fingerprint
+                    for fingerprint in result_list
+                ]
 
         return result_list
 
+    @staticmethod
+    def _copy_fingerprint(fingerprint):
+        """Copy a fingerprint so it can be merged into in place.
+
+        Only the containers updated by _merge_fingerprint are copied. Fact
+        values, metadata entries and sources are shared with fingerprint
+        and must be treated as read-only.
+        :param fingerprint: fingerprint to copy
+        :returns: the fingerprint copy
+        """
+        fingerprint_copy = fingerprint.copy()
+        for key in (META_DATA_KEY, SOURCES_KEY):
+            if key in fingerprint_copy:
+                fingerprint_copy[key] = copy(fingerprint_copy[key])
+        return fingerprint_copy
+
     def _create_index_for_fingerprints(
         self, id_key, fingerprint_list, create_global_id=True
     ):
@@ -922,11 +1102,13 @@ class FingerprintTaskRunner(ScanTaskRunner):
         result_by_key = {}
         key_not_found_list = []
         number_duplicates = 0
-        fingerprint_list = deepcopy(fingerprint_list)
         for value_dict in fingerprint_list:
             # Add globally unique key for de-duplication later
             if create_global_id:
-                value_dict[FINGERPRINT_GLOBAL_ID_KEY] = str(uuid.uuid4())
+                value_dict = {
+                    **value_dict,
+                    FINGERPRINT_GLOBAL_ID_KEY: str(uuid.uuid4()),
+                }
             id_key_value = value_dict.get(id_key)
             if id_key_value:
                 if isinstance(id_key_value, list):
@@ -955,7 +1137,11 @@ class FingerprintTaskRunner(ScanTaskRunner):
     # pylint: disable=too-many-branches, too-many-locals
     # pylint: disable=too-many-statements
     def _merge_fingerprint(
-        self, priority_fingerprint, to_merge_fingerprint, reverse_priority_keys=None
+        self,
+        priority_fingerprint,
+        to_merge_fingerprint,
+        reverse_priority_keys=None,
+        in_place=False,
     ):
         """Merge two fingerprints.
 
@@ -970,9 +1156,11 @@ class FingerprintTaskRunner(ScanTaskRunner):
         that should reverse the priority.  In other words, the value
         of to_merge_fingerprint should be used instead of the
         priority_fingerprint value.
+        :param in_place: If True, priority_fingerprint is updated and returned
+        instead of a copy of it. to_merge_fingerprint is never modified.
         """
-        priority_fingerprint = deepcopy(priority_fingerprint)
-        to_merge_fingerprint = deepcopy(to_merge_fingerprint)
+        if not in_place:
+            priority_fingerprint = self._copy_fingerprint(priority_fingerprint)
         priority_keys = set(priority_fingerprint.keys())
         to_merge_keys = set(to_merge_fingerprint.keys())
 
@@ -1122,13 +1310,21 @@ class FingerprintTaskRunner(ScanTaskRunner):
             actual_fact_value = convert_to_int(actual_fact_value)
 
         fingerprint[fingerprint_key] = actual_fact_value
-        fingerprint[META_DATA_KEY][fingerprint_key] = {
-            "server_id": source["server_id"],
-            "source_name": source["source_name"],
-            "source_type": source["source_type"],
-            "raw_fact_key": raw_fact_key,
-            "has_sudo": raw_fact.get("user_has_sudo", False),
-        }
+        fingerprint[META_DATA_KEY][fingerprint_key] = FactMetadata(
+            self._get_source_descriptor(source),
+            raw_fact_key,
+            raw_fact.get("user_has_sudo", False),
+        )
+
+    def _get_source_descriptor(self, source):
+        """Return the SourceDescriptor shared by all facts found by source.
+
+        :param source: Source used to gather raw facts.
+        """
+        descriptor = SourceDescriptor(
+            source["server_id"], source["source_name"], source["source_type"]
+        )
+        return self._source_descriptors.setdefault(descriptor, descriptor)
 
     def _add_products_to_fingerprint(self, source, raw_fact, fingerprint):
         """Create the fingerprint products with fact and metadata.
@@ -1778,25 +1974,11 @@ class FingerprintTaskRunner(ScanTaskRunner):
     def _multi_format_dateparse(self, source, raw_fact_key, date_value, patterns):
         """Attempt multiple patterns for strptime.
 
+        Values that can't be parsed are counted and logged by
+        _log_date_parse_misses.
         :param source: The source that provided this fact.
         :param raw_fact_key: fact key with date.
         :param date_value: date value to parse
         :returns: parsed date
         """
-        if date_value:
-            raw_date_value = strip_suffix(date_value, " UTC")
-            date_error = None
-            for pattern in patterns:
-                try:
-                    date_date_value = datetime.strptime(raw_date_value, pattern)
-                    return date_date_value.date()
-                except ValueError as error:
-                    date_error = error
-
-            self.scan_task.log_message(
-                f"Fingerprinter ({source['source_type']}, {source['source_name']}) - "
-                f"Could not parse date for {raw_fact_key}. "
-                f"Unsupported date format: '{raw_date_value}'. Error: {date_error}",
-                log_level=logging.ERROR,
-            )
-        return None
+        return self._date_parser.parse(source, raw_fact_key, date_value, patterns)
@@ -0,0 +1,162 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the date parsing of fingerprint date facts."""
+
+# pylint: disable=protected-access
+
+import logging
+from datetime import date, datetime
+
+import pytest
+
+from api.models import DetailsReport, ScanTask, Source
+from fingerprinter.dateparse import DateParser
+from fingerprinter.task import FingerprintTaskRunner
+from scanner.satellite.utils import raw_facts_template as satellite_template
+
+SOURCE = {"source_type": "satellite", "source_name": "sat"}
+PATTERNS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S %z"]
+
+
+@pytest.fixture
+def strptime(mocker):
+    """Spy on the strptime calls of DateParser."""
+    patched_datetime = mocker.patch("fingerprinter.dateparse.datetime")
+    patched_datetime.strptime.side_effect = datetime.strptime
+    return patched_datetime.strptime
+
+
+def test_parse():
+    """Test dates are parsed with any of the patterns."""
+    parser = DateParser()
+    assert parser.parse(SOURCE, "key", "2018-4-7 12:45:02", PATTERNS) == date(
+        2018, 4, 7
+    )
+    assert parser.parse(SOURCE, "key", "2018-4-8 12:45:02 -0400", PATTERNS) == date(
+        2018, 4, 8
+    )
+    assert parser.parse(SOURCE, "key", "2018-4-9 12:45:02 UTC", PATTERNS) == date(
+        2018, 4, 9
+    )
+    assert parser.parse(SOURCE, "key", None, PATTERNS) is None
+    assert not parser.misses
+
+
+def test_matched_pattern_tried_first(strptime):
+    """Test the pattern last matched by a fact of a source is tried first."""
+    parser = DateParser()
+    parser.parse(SOURCE, "key", "2018-4-7 12:45:02 -0400", PATTERNS)
+    assert strptime.call_count == 2
+
+    strptime.reset_mock()
+    parser.parse(SOURCE, "key", "2018-4-8 12:45:02 -0400", PATTERNS)
+    strptime.assert_called_once_with("2018-4-8 12:45:02 -0400", PATTERNS[1])
+
+    # other facts and sources learn their own pattern
+    strptime.reset_mock()
+    parser.parse(SOURCE, "other_key", "2018-4-9 12:45:02 -0400", PATTERNS)
+    assert strptime.call_count == 2
+
+
+def test_parsed_dates_cached(strptime):
+    """Test repeated raw values are only parsed once."""
+    parser = DateParser()
+    for _ in range(3):
+        assert parser.parse(SOURCE, "key", "2018-4-7 12:45:02", PATTERNS) == date(
+            2018, 4, 7
+        )
+        assert parser.parse(SOURCE, "key", "bogus", PATTERNS) is None
+    assert strptime.call_count == 3
+
+
+def test_parsed_dates_cache_size(strptime):
+    """Test no more than cache_size raw values are remembered."""
+    parser = DateParser(cache_size=1)
+    for _ in range(2):
+        parser.parse(SOURCE, "key", "2018-4-7 12:45:02", PATTERNS)
+        parser.parse(SOURCE, "key", "2018-4-8 12:45:02", PATTERNS)
+    assert strptime.call_count == 3
+    assert len(parser._parsed_dates) == 1
+
+
+def test_misses():
+    """Test unparsed values are counted per source and fact."""
+    parser = DateParser()
+    parser.parse(SOURCE, "key", "bogus", PATTERNS)
+    parser.parse(SOURCE, "key", "bogus 2", PATTERNS)
+    parser.parse(SOURCE, "key", "bogus", PATTERNS)
+    parser.parse({**SOURCE, "source_name": "other"}, "key", "bogus UTC", PATTERNS)
+
+    other = DateParser()
+    other.parse(SOURCE, "key", "other bogus", PATTERNS)
+    other.parse(SOURCE, "other_key", "bogus", PATTERNS)
+    parser.update_misses(*other.pop_misses())
+    assert not other.misses
+
+    misses, unparsed_values = parser.pop_misses()
+    assert misses == {
+        ("satellite", "sat", "key"): 4,
+        ("satellite", "other", "key"): 1,
+        ("satellite", "sat", "other_key"): 1,
+    }
+    assert unparsed_values == {
+        ("satellite", "sat", "key"): "bogus",
+        ("satellite", "other", "key"): "bogus",
+        ("satellite", "sat", "other_key"): "bogus",
+    }
+    assert parser.pop_misses() == ({}, {})
+
+
+def satellite_source(hosts, registration_times):
+    """Return a satellite source with hosts registered at registration_times."""
+    facts = []
+    for host in range(hosts):
+        fact = satellite_template()
+        fact["hostname"] = f"host-{host}"
+        fact["registration_time"] = registration_times[host % len(registration_times)]
+        fact["last_checkin_time"] = registration_times[host % len(registration_times)]
+        facts.append(fact)
+    return {
+        "server_id": "<ID>",
+        "source_name": "sat",
+        "source_type": Source.SATELLITE_SOURCE_TYPE,
+        "facts": facts,
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_misses_logged_once(mocker, settings, workers):
+    """Test unparsed dates are logged once per source and fact."""
+    settings.QPC_FINGERPRINT_WORKERS = workers
+    mocker.patch("fingerprinter.task.FACT_CHUNK_SIZE", 3)
+    scan_task = mocker.MagicMock(spec=ScanTask)
+    runner = FingerprintTaskRunner(scan_task.job, scan_task)
+    details_report = mocker.MagicMock(spec=DetailsReport)
+    details_report.get_sources.return_value = [
+        satellite_source(10, ["2018-4-7 12:45:02 UTC", "bogus", "2018-4-7"])
+    ]
+
+    fingerprints = runner._process_sources(details_report)
+
+    assert sorted(fp["system_creation_date"] is None for fp in fingerprints) == (
+        [False] * 4 + [True] * 6
+    )
+    errors = [
+        call.args[0]
+        for call in scan_task.log_message.call_args_list
+        if call.kwargs.get("log_level") == logging.ERROR
+    ]
+    assert sorted(errors) == [
+        "Fingerprinter (satellite, sat) - Could not parse date for "
+        "last_checkin_time of 6 system(s). Unsupported date format: 'bogus'.",
+        "Fingerprinter (satellite, sat) - Could not parse date for "
+        "registration_time of 6 system(s). Unsupported date format: 'bogus'.",
+    ]
+    assert not runner._date_parser.misses
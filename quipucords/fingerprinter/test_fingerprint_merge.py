@@ -0,0 +1,252 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Compare the fingerprint merge engine with its deepcopy based predecessor."""
+
+# pylint: disable=protected-access
+
+import logging
+import random
+import uuid
+from copy import deepcopy
+
+import pytest
+
+from api.models import DetailsReport, ScanTask, Source
+from fingerprinter.constants import (
+    ENTITLEMENTS_KEY,
+    META_DATA_KEY,
+    PRODUCTS_KEY,
+    SOURCES_KEY,
+)
+from fingerprinter.task import FINGERPRINT_GLOBAL_ID_KEY, FingerprintTaskRunner
+
+logger = logging.getLogger(__file__)
+
+PRODUCT_NAMES = ["JBoss EAP", "JBoss Fuse", "JBoss BRMS", "JBoss Web Server"]
+
+
+class DeepcopyFingerprintTaskRunner(FingerprintTaskRunner):
+    """FingerprintTaskRunner merging fingerprints the way it used to.
+
+    Every fingerprint list and fingerprint is deep copied before being
+    indexed, de-duplicated or merged.
+    """
+
+    def _remove_duplicate_fingerprints(
+        self, id_key_list, fingerprint_list, remove_key=False
+    ):
+        if not fingerprint_list:
+            return fingerprint_list
+
+        result_list = deepcopy(fingerprint_list)
+        for id_key in id_key_list:
+            unique_dict = {}
+            no_global_id_list = []
+            for fingerprint in result_list:
+                unique_id_value = fingerprint.get(id_key)
+                if unique_id_value:
+                    existing_fingerprint = unique_dict.get(unique_id_value)
+                    if existing_fingerprint:
+                        unique_dict[unique_id_value] = self._merge_fingerprint(
+                            existing_fingerprint, fingerprint
+                        )
+                    else:
+                        unique_dict[unique_id_value] = fingerprint
+                else:
+                    no_global_id_list.append(fingerprint)
+
+            result_list = no_global_id_list + list(unique_dict.values())
+            if remove_key:
+                for fingerprint in result_list:
+                    fingerprint.pop(id_key, None)
+
+        return result_list
+
+    def _create_index_for_fingerprints(
+        self, id_key, fingerprint_list, create_global_id=True
+    ):
+        result_by_key = {}
+        key_not_found_list = []
+        fingerprint_list = deepcopy(fingerprint_list)
+        for value_dict in fingerprint_list:
+            if create_global_id:
+                value_dict[FINGERPRINT_GLOBAL_ID_KEY] = str(uuid.uuid4())
+            id_key_value = value_dict.get(id_key)
+            if id_key_value:
+                if isinstance(id_key_value, list):
+                    for list_value in id_key_value:
+                        result_by_key.setdefault(list_value, value_dict)
+                else:
+                    result_by_key.setdefault(id_key_value, value_dict)
+            else:
+                key_not_found_list.append(value_dict)
+        return result_by_key, key_not_found_list
+
+    def _merge_fingerprint(
+        self,
+        priority_fingerprint,
+        to_merge_fingerprint,
+        reverse_priority_keys=None,
+        in_place=False,
+    ):
+        return super()._merge_fingerprint(
+            deepcopy(priority_fingerprint),
+            deepcopy(to_merge_fingerprint),
+            reverse_priority_keys,
+            in_place=True,
+        )
+
+
+def fake_fingerprint(rng, source, facts):
+    """Return a fingerprint found by source with the given facts."""
+    source_key = f"{source['server_id']}+{source['source_name']}"
+    fingerprint = {
+        ENTITLEMENTS_KEY: [
+            {"name": name, "entitlement_id": name[-1]}
+            for name in rng.sample(["ent-a", "ent-b", "ent-c"], rng.randint(0, 2))
+        ],
+        PRODUCTS_KEY: [
+            {"name": name, "presence": rng.choice(["absent", "present", "potential"])}
+            for name in PRODUCT_NAMES
+        ],
+        SOURCES_KEY: {source_key: dict(source)},
+        META_DATA_KEY: {},
+    }
+    for fact_name, fact_value in facts.items():
+        if fact_value is None and rng.random() < 0.5:
+            continue
+        fingerprint[fact_name] = fact_value
+        fingerprint[META_DATA_KEY][fact_name] = {
+            "server_id": source["server_id"],
+            "source_name": source["source_name"],
+            "source_type": source["source_type"],
+            "raw_fact_key": fact_name,
+            "has_sudo": rng.random() < 0.5,
+        }
+    return fingerprint
+
+
+def fake_sources(seed, systems=60):
+    """Return sources with fingerprints of overlapping systems."""
+    rng = random.Random(seed)
+
+    def maybe(value, probability=0.7):
+        return value if rng.random() < probability else None
+
+    def macs():
+        return sorted(
+            {f"mac-{rng.randrange(systems)}" for _ in range(rng.randint(0, 3))}
+        )
+
+    def system_facts():
+        system = rng.randrange(systems)
+        return {
+            "name": f"host-{system}",
+            "cpu_count": rng.randint(1, 8),
+            "infrastructure_type": rng.choice(["virtualized", "bare_metal"]),
+            "mac_addresses": macs(),
+            "date_yum_history": rng.choice(["2020-01-02", "bogus"]),
+            "registration_time": maybe("2021-03-04 05:06:07"),
+        }, system
+
+    sources = []
+    for source_type, count in (
+        (Source.NETWORK_SOURCE_TYPE, 2),
+        (Source.SATELLITE_SOURCE_TYPE, 1),
+        (Source.VCENTER_SOURCE_TYPE, 2),
+    ):
+        for index in range(count):
+            source = {
+                "server_id": "<ID>",
+                "source_name": f"{source_type}-{index}",
+                "source_type": source_type,
+            }
+            fingerprints = []
+            for _ in range(systems):
+                facts, system = system_facts()
+                if source_type == Source.NETWORK_SOURCE_TYPE:
+                    facts["subscription_manager_id"] = maybe(f"subman-{system}")
+                    facts["bios_uuid"] = maybe(f"uuid-{system}")
+                    facts["os_release"] = rng.choice(["RHEL 7", "RHEL 8", None])
+                elif source_type == Source.SATELLITE_SOURCE_TYPE:
+                    facts["subscription_manager_id"] = maybe(f"subman-{system}")
+                    facts["os_release"] = rng.choice(["RHEL 8", None])
+                else:
+                    facts["vm_uuid"] = maybe(f"uuid-{system}")
+                    facts["vm_state"] = rng.choice(["poweredOn", "poweredOff"])
+                fingerprints.append(fake_fingerprint(rng, source, facts))
+            sources.append({**source, "fingerprints": fingerprints})
+    return sources
+
+
+@pytest.fixture
+def scan_task(mocker):
+    """Scan task mocked to only log messages."""
+
+    def _log_message(message, log_level=logging.INFO, **kwargs):
+        logger.log(level=log_level, msg=message)
+
+    patched_scan_task = mocker.MagicMock(spec=ScanTask)
+    patched_scan_task.log_message.side_effect = _log_message
+    return patched_scan_task
+
+
+def process_sources(mocker, runner_class, scan_task, sources):
+    """Run _process_sources over the fake fingerprints of sources."""
+    runner = runner_class(scan_task.job, scan_task)
+    mocker.patch.object(
+        runner,
+        "_process_source",
+        side_effect=lambda source: deepcopy(source["fingerprints"]),
+    )
+    details_report = mocker.MagicMock(spec=DetailsReport)
+    details_report.get_sources.return_value = sources
+    return runner._process_sources(details_report)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_same_fingerprints_as_deepcopy_merge(mocker, scan_task, seed):
+    """Test merged fingerprints match the ones from the deepcopy based merge."""
+    sources = fake_sources(seed)
+    expected = process_sources(
+        mocker, DeepcopyFingerprintTaskRunner, scan_task, sources
+    )
+    original_sources = deepcopy(sources)
+    fingerprints = process_sources(mocker, FingerprintTaskRunner, scan_task, sources)
+
+    assert fingerprints == expected
+    # systems were actually merged
+    assert len(fingerprints) < sum(len(source["fingerprints"]) for source in sources)
+    # the fingerprints being merged were left untouched
+    assert sources == original_sources
+
+
+def test_merge_fingerprint_keeps_inputs(scan_task):
+    """Test _merge_fingerprint only modifies priority_fingerprint in place."""
+    runner = FingerprintTaskRunner(scan_task.job, scan_task)
+    rng = random.Random(0)
+    source = {"server_id": "<ID>", "source_name": "s", "source_type": "network"}
+    priority = fake_fingerprint(rng, source, {"name": "a", "cpu_count": None})
+    to_merge = fake_fingerprint(
+        rng, {**source, "source_name": "t"}, {"name": "b", "cpu_count": 2}
+    )
+    original_priority = deepcopy(priority)
+    original_to_merge = deepcopy(to_merge)
+
+    merged = runner._merge_fingerprint(priority, to_merge, {"cpu_count"})
+    assert merged is not priority
+    assert merged["cpu_count"] == 2
+    assert len(merged[SOURCES_KEY]) == 2
+    assert priority == original_priority
+    assert to_merge == original_to_merge
+
+    merged = runner._merge_fingerprint(priority, to_merge, in_place=True)
+    assert merged is priority
+    assert to_merge == original_to_merge
@@ -0,0 +1,80 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the compact fingerprint fact metadata."""
+
+# pylint: disable=protected-access
+
+import json
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from api.models import ScanTask
+from fingerprinter.constants import META_DATA_KEY
+from fingerprinter.metadata import FactMetadata, SourceDescriptor, expand_metadata
+from fingerprinter.task import FingerprintTaskRunner
+from scanner.network.utils import raw_facts_template
+
+SOURCE = {"server_id": "<ID>", "source_name": "source", "source_type": "network"}
+
+
+@pytest.fixture
+def task_runner(mocker):
+    """Return a FingerprintTaskRunner."""
+    scan_task = mocker.MagicMock(spec=ScanTask)
+    return FingerprintTaskRunner(scan_task.job, scan_task)
+
+
+def test_fact_metadata_reads_as_dict():
+    """Test FactMetadata has the keys and values of the metadata dict."""
+    metadata = FactMetadata(SourceDescriptor("<ID>", "source", "network"), "a", True)
+    expected = {**SOURCE, "raw_fact_key": "a", "has_sudo": True}
+    assert metadata == expected
+    assert expected == metadata
+    assert list(metadata.items()) == list(expected.items())
+    assert metadata.get("has_sudo") is True
+    assert metadata.get("missing") is None
+    assert {**metadata, "raw_fact_key": "b"} == {**expected, "raw_fact_key": "b"}
+    assert repr(metadata) == repr(expected)
+    assert pickle.loads(pickle.dumps(metadata)) == metadata
+    assert deepcopy(metadata) == metadata
+
+
+def test_expand_metadata():
+    """Test metadata is converted back to the JSON stored for fingerprints."""
+    source = SourceDescriptor("<ID>", "source", "network")
+    metadata = {
+        "name": FactMetadata(source, "uname_hostname", False),
+        "system_creation_date": {**SOURCE, "raw_fact_key": "date_machine_id"},
+    }
+    assert json.loads(json.dumps(expand_metadata(metadata))) == {
+        "name": {**SOURCE, "raw_fact_key": "uname_hostname", "has_sudo": False},
+        "system_creation_date": {**SOURCE, "raw_fact_key": "date_machine_id"},
+    }
+
+
+def test_source_descriptor_interned(task_runner):
+    """Test facts found by the same source share its SourceDescriptor."""
+    first = task_runner._process_network_fact(dict(SOURCE), raw_facts_template())
+    second = task_runner._process_network_fact(dict(SOURCE), raw_facts_template())
+    other = task_runner._process_network_fact(
+        {**SOURCE, "source_name": "other"}, raw_facts_template()
+    )
+    sources = {
+        id(metadata.source)
+        for fingerprint in (first, second)
+        for metadata in fingerprint[META_DATA_KEY].values()
+    }
+    assert len(sources) == 1
+    assert (
+        other[META_DATA_KEY]["name"].source is not first[META_DATA_KEY]["name"].source
+    )
+    assert other[META_DATA_KEY]["name"]["source_name"] == "other"
@@ -0,0 +1,134 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the bulk persistence of fingerprints."""
+
+# pylint: disable=protected-access
+
+import json
+from multiprocessing import Value
+
+import pytest
+from django.db import DataError
+
+from api.models import Entitlement, Product, ScanJob, ScanTask, SystemFingerprint
+from api.serializers import SystemFingerprintSerializer
+from fingerprinter.task import FingerprintTaskRunner
+from tests.factories import DeploymentReportFactory, ScanTaskFactory
+
+
+def fingerprint(number, **facts):
+    """Return a fingerprint dict with products and entitlements."""
+    metadata = {"source_name": "source", "source_type": "network"}
+    return {
+        "name": f"host-{number}",
+        "etc_machine_id": f"machine-{number}",
+        "infrastructure_type": "virtualized",
+        "metadata": {"name": metadata},
+        "sources": [metadata],
+        "products": [
+            {"name": "JBoss EAP", "presence": "absent", "metadata": metadata},
+            {"name": "JBoss Fuse", "presence": "present", "metadata": metadata},
+        ],
+        "entitlements": [
+            {"name": f"ent-{number}", "entitlement_id": "1", "metadata": metadata}
+        ],
+        **facts,
+    }
+
+
+@pytest.fixture
+def details_report():
+    """Return a details report with a deployments report."""
+    return DeploymentReportFactory(number_of_fingerprints=0).details_report
+
+
+@pytest.fixture
+def task_runner():
+    """Return a FingerprintTaskRunner."""
+    scan_task = ScanTaskFactory(scan_type=ScanTask.SCAN_TYPE_FINGERPRINT)
+    return FingerprintTaskRunner(scan_task.job, scan_task)
+
+
+def process_fingerprints(mocker, task_runner, details_report, fingerprints):
+    """Persist fingerprints with _process_details_report."""
+    mocker.patch.object(task_runner, "_process_sources", return_value=fingerprints)
+    return task_runner._process_details_report(
+        Value("i", ScanJob.JOB_RUN), details_report
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_persistence(mocker, settings, task_runner, details_report):
+    """Test fingerprints are saved in batches, skipping invalid ones."""
+    settings.QPC_FINGERPRINT_BATCH_SIZE = 2
+    fingerprints = [
+        fingerprint(1),
+        fingerprint(2, cpu_count=-1),
+        fingerprint(3),
+        fingerprint(4, infrastructure_type="invalid"),
+        fingerprint(5),
+    ]
+    bulk_create = mocker.spy(
+        SystemFingerprintSerializer.Meta.list_serializer_class, "create"
+    )
+
+    _, status = process_fingerprints(mocker, task_runner, details_report, fingerprints)
+
+    assert status == ScanTask.COMPLETED
+    assert bulk_create.call_count == 3
+    deployment_report = details_report.deployment_report
+    saved = SystemFingerprint.objects.filter(deployment_report=deployment_report)
+    assert sorted(saved.values_list("name", flat=True)) == [
+        "host-1",
+        "host-3",
+        "host-5",
+    ]
+    for system in saved:
+        number = system.name.split("-")[1]
+        assert sorted(system.products.values_list("name", "presence")) == [
+            ("JBoss EAP", "absent"),
+            ("JBoss Fuse", "present"),
+        ]
+        assert list(system.entitlements.values_list("name", flat=True)) == [
+            f"ent-{number}"
+        ]
+    cached_fingerprints = json.loads(deployment_report.cached_fingerprints)
+    assert {fp["id"] for fp in cached_fingerprints} == set(
+        saved.values_list("id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_persistence_data_error(mocker, task_runner, details_report):
+    """Test fingerprints rejected by the database don't discard their batch."""
+    original_save = SystemFingerprint.save
+
+    def save(system, *args, **kwargs):
+        if system.name == "host-2":
+            raise DataError()
+        return original_save(system, *args, **kwargs)
+
+    mocker.patch.object(SystemFingerprint, "save", save)
+    mocker.patch(
+        "api.deployments_report.serializer.connection.features"
+        ".can_return_rows_from_bulk_insert",
+        False,
+    )
+    fingerprints = [fingerprint(1), fingerprint(2), fingerprint(3)]
+
+    _, status = process_fingerprints(mocker, task_runner, details_report, fingerprints)
+
+    assert status == ScanTask.COMPLETED
+    saved = SystemFingerprint.objects.filter(
+        deployment_report=details_report.deployment_report
+    )
+    assert sorted(saved.values_list("name", flat=True)) == ["host-1", "host-3"]
+    assert Product.objects.filter(fingerprint__in=saved).count() == 4
+    assert Entitlement.objects.filter(fingerprint__in=saved).count() == 2
@@ -0,0 +1,137 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test fingerprints computed by a pool of worker processes."""
+
+# pylint: disable=protected-access
+
+import json
+import logging
+import multiprocessing
+
+import pytest
+
+from api.models import DetailsReport, ScanTask, Source
+from fingerprinter.constants import META_DATA_KEY
+from fingerprinter.metadata import expand_metadata
+from fingerprinter.task import FingerprintTaskRunner
+from scanner.network.utils import raw_facts_template as network_template
+from scanner.satellite.utils import raw_facts_template as satellite_template
+from scanner.vcenter.utils import raw_facts_template as vcenter_template
+
+logger = logging.getLogger(__file__)
+
+
+def network_facts(system):
+    """Return network facts of system."""
+    return {
+        **network_template(),
+        "uname_hostname": f"host-{system}",
+        "dmi_system_uuid": f"uuid-{system}",
+        "ifconfig_mac_addresses": [f"mac-{system}"],
+        "subscription_manager_id": f"subman-{system}",
+        "cpu_count": system % 8 + 1,
+        "virt_what_type": "kvm" if system % 2 else "bare metal",
+        "date_machine_id": "2020-01-02",
+    }
+
+
+def vcenter_facts(system):
+    """Return vcenter facts of system."""
+    return {
+        **vcenter_template(),
+        "vm.name": f"host-{system}",
+        "vm.uuid": f"uuid-{system}",
+        "vm.mac_addresses": [f"mac-{system}"],
+        "vm.cpu_count": 2,
+        "vm.state": "poweredOn",
+        "vm.os": "Red Hat Enterprise Linux 8",
+    }
+
+
+def satellite_facts(system):
+    """Return satellite facts of system."""
+    return {
+        **satellite_template(),
+        "hostname": f"host-{system}",
+        "uuid": f"subman-{system}",
+        "mac_addresses": [f"mac-{system}"],
+        "os_release": "RHEL 8",
+        "registration_time": "2021-03-04 05:06:07 UTC",
+    }
+
+
+def sources(systems):
+    """Return sources finding overlapping systems."""
+    return [
+        {
+            "server_id": "<ID>",
+            "source_name": f"{source_type}-source",
+            "source_type": source_type,
+            "facts": [facts(system) for system in range(offset, offset + systems)],
+        }
+        for source_type, facts, offset in (
+            (Source.NETWORK_SOURCE_TYPE, network_facts, 0),
+            (Source.VCENTER_SOURCE_TYPE, vcenter_facts, systems // 2),
+            (Source.SATELLITE_SOURCE_TYPE, satellite_facts, systems // 3),
+        )
+    ]
+
+
+@pytest.fixture
+def scan_task(mocker):
+    """Scan task mocked to only log messages."""
+
+    def _log_message(message, log_level=logging.INFO, **kwargs):
+        logger.log(level=log_level, msg=message)
+
+    patched_scan_task = mocker.MagicMock(spec=ScanTask)
+    patched_scan_task.log_message.side_effect = _log_message
+    return patched_scan_task
+
+
+def process_sources(mocker, scan_task, source_list):
+    """Run _process_sources and return its fingerprints as JSON."""
+    runner = FingerprintTaskRunner(scan_task.job, scan_task)
+    details_report = mocker.MagicMock(spec=DetailsReport)
+    details_report.get_sources.return_value = source_list
+    fingerprints = runner._process_sources(details_report)
+    return json.dumps(
+        [
+            {**fingerprint, META_DATA_KEY: expand_metadata(fingerprint[META_DATA_KEY])}
+            for fingerprint in fingerprints
+        ],
+        default=str,
+    )
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(2, 1), (2, 7), (3, 500)])
+def test_same_fingerprints_as_serial(mocker, settings, scan_task, workers, chunk_size):
+    """Test fingerprints from worker processes match the serial ones."""
+    source_list = sources(20)
+    settings.QPC_FINGERPRINT_WORKERS = 1
+    expected = process_sources(mocker, scan_task, source_list)
+
+    settings.QPC_FINGERPRINT_WORKERS = workers
+    mocker.patch("fingerprinter.task.FACT_CHUNK_SIZE", chunk_size)
+    get_context = mocker.spy(multiprocessing, "get_context")
+    fingerprints = process_sources(mocker, scan_task, source_list)
+
+    get_context.assert_called_once_with("fork")
+    assert fingerprints == expected
+    # systems were merged across sources
+    assert len(json.loads(fingerprints)) < 60
+
+
+def test_serial_processing_without_pool(mocker, settings, scan_task):
+    """Test no worker process is started when a single worker is configured."""
+    settings.QPC_FINGERPRINT_WORKERS = 1
+    get_context = mocker.patch("fingerprinter.task.multiprocessing.get_context")
+    process_sources(mocker, scan_task, sources(5))
+    get_context.assert_not_called()
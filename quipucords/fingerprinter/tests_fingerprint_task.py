@@ -1463,7 +1463,8 @@ class EngineTest(TestCase):
             return_value=[fact_collection],
         ):
             with patch(
-                "fingerprinter.task.SystemFingerprintSerializer.save",
+                "api.deployments_report.serializer."
+                "SystemFingerprintListSerializer.create",
                 side_effect=DataError,
             ):
                 status_message, status = self.fp_task_runner._process_details_report(
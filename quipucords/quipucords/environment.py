@@ -16,6 +16,7 @@ import os
 import platform
 import subprocess
 import sys
+from functools import lru_cache
 
 from quipucords.release import infer_version
 
@@ -24,8 +25,13 @@ from quipucords.release import infer_version
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
 def commit():
-    """Collect the commit for the server."""
+    """Collect the commit for the server.
+
+    The commit doesn't change while the server is running, so it is only
+    collected once per process.
+    """
     commit_info = os.environ.get("QUIPUCORDS_COMMIT", "").strip()
     if not commit_info:
         try:
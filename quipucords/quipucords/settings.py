@@ -108,6 +108,45 @@ if not is_int(NETWORK_CONNECT_JOB_TIMEOUT):
     )
     NETWORK_CONNECT_JOB_TIMEOUT = "600"
 
+# Scan network hosts with a single Ansible run that starts a new host as soon
+# as a fork is free, instead of groups of max_concurrency hosts run in turn
+QPC_NETWORK_ROLLING_SCHEDULER = os.getenv("QPC_NETWORK_ROLLING_SCHEDULER", "False")
+if isinstance(QPC_NETWORK_ROLLING_SCHEDULER, str):
+    QPC_NETWORK_ROLLING_SCHEDULER = QPC_NETWORK_ROLLING_SCHEDULER.lower() == "true"
+
+# Check the SSH port of network hosts before attempting Ansible connections,
+# so unreachable hosts aren't tried once per credential
+QPC_NETWORK_PREPROBE = os.getenv("QPC_NETWORK_PREPROBE", "False")
+if isinstance(QPC_NETWORK_PREPROBE, str):
+    QPC_NETWORK_PREPROBE = QPC_NETWORK_PREPROBE.lower() == "true"
+
+QPC_NETWORK_PREPROBE_TIMEOUT = os.getenv("QPC_NETWORK_PREPROBE_TIMEOUT", "3")
+if not is_int(QPC_NETWORK_PREPROBE_TIMEOUT):
+    logger.error(
+        'QPC_NETWORK_PREPROBE_TIMEOUT "%s" not an int. Setting to default of 3.',
+        QPC_NETWORK_PREPROBE_TIMEOUT,
+    )
+    QPC_NETWORK_PREPROBE_TIMEOUT = "3"
+QPC_NETWORK_PREPROBE_TIMEOUT = int(QPC_NETWORK_PREPROBE_TIMEOUT)
+
+# Max number of TCP connections attempted at the same time by the probe,
+# kept below the open file descriptors limit of the process
+QPC_NETWORK_PREPROBE_CONCURRENCY = os.getenv("QPC_NETWORK_PREPROBE_CONCURRENCY", "500")
+if not is_int(QPC_NETWORK_PREPROBE_CONCURRENCY):
+    logger.error(
+        'QPC_NETWORK_PREPROBE_CONCURRENCY "%s" not an int.'
+        " Setting to default of 500.",
+        QPC_NETWORK_PREPROBE_CONCURRENCY,
+    )
+    QPC_NETWORK_PREPROBE_CONCURRENCY = "500"
+QPC_NETWORK_PREPROBE_CONCURRENCY = max(int(QPC_NETWORK_PREPROBE_CONCURRENCY), 1)
+
+# Try first the credential that connected to each network host in previous
+# scans of the same source
+QPC_NETWORK_CREDENTIAL_AFFINITY = os.getenv("QPC_NETWORK_CREDENTIAL_AFFINITY", "False")
+if isinstance(QPC_NETWORK_CREDENTIAL_AFFINITY, str):
+    QPC_NETWORK_CREDENTIAL_AFFINITY = QPC_NETWORK_CREDENTIAL_AFFINITY.lower() == "true"
+
 QPC_CONNECT_TASK_TIMEOUT = int(os.getenv("QPC_CONNECT_TASK_TIMEOUT", "30"))
 QPC_INSPECT_TASK_TIMEOUT = int(os.getenv("QPC_INSPECT_TASK_TIMEOUT", "600"))
 
@@ -423,5 +462,119 @@ QPC_INSIGHTS_DATA_COLLECTOR_LABEL = os.getenv(
     "QPC_INSIGHTS_DATA_COLLECTOR_LABEL", "qpc"
 )
 
+# Scan job scheduler: number of scan jobs allowed to run at the same time and
+# optional per source type limits (e.g. "network=1,vcenter=2")
+QPC_MAX_CONCURRENT_SCAN_JOBS = os.getenv("QPC_MAX_CONCURRENT_SCAN_JOBS", "1")
+if not is_int(QPC_MAX_CONCURRENT_SCAN_JOBS):
+    logger.error(
+        'QPC_MAX_CONCURRENT_SCAN_JOBS "%s" not an int. Setting to default of 1.',
+        QPC_MAX_CONCURRENT_SCAN_JOBS,
+    )
+    QPC_MAX_CONCURRENT_SCAN_JOBS = "1"
+QPC_MAX_CONCURRENT_SCAN_JOBS = max(int(QPC_MAX_CONCURRENT_SCAN_JOBS), 1)
+QPC_SCAN_JOB_SOURCE_TYPE_LIMITS = os.getenv("QPC_SCAN_JOB_SOURCE_TYPE_LIMITS", "")
+
+# Number of scan tasks of a single scan job (one per source) allowed to run
+# in parallel worker processes
+QPC_MAX_CONCURRENT_SCAN_TASKS = os.getenv("QPC_MAX_CONCURRENT_SCAN_TASKS", "1")
+if not is_int(QPC_MAX_CONCURRENT_SCAN_TASKS):
+    logger.error(
+        'QPC_MAX_CONCURRENT_SCAN_TASKS "%s" not an int. Setting to default of 1.',
+        QPC_MAX_CONCURRENT_SCAN_TASKS,
+    )
+    QPC_MAX_CONCURRENT_SCAN_TASKS = "1"
+QPC_MAX_CONCURRENT_SCAN_TASKS = max(int(QPC_MAX_CONCURRENT_SCAN_TASKS), 1)
+
+# Number of raw facts buffered by scanners before they are written to the
+# database in a single batch
+QPC_FACT_WRITER_BATCH_SIZE = os.getenv("QPC_FACT_WRITER_BATCH_SIZE", "5000")
+if not is_int(QPC_FACT_WRITER_BATCH_SIZE):
+    logger.error(
+        'QPC_FACT_WRITER_BATCH_SIZE "%s" not an int. Setting to default of 5000.',
+        QPC_FACT_WRITER_BATCH_SIZE,
+    )
+    QPC_FACT_WRITER_BATCH_SIZE = "5000"
+QPC_FACT_WRITER_BATCH_SIZE = max(int(QPC_FACT_WRITER_BATCH_SIZE), 1)
+
+# Scan task stats are counted in memory and saved every
+# QPC_STATS_FLUSH_INTERVAL seconds or QPC_STATS_FLUSH_COUNT systems
+QPC_STATS_FLUSH_INTERVAL = os.getenv("QPC_STATS_FLUSH_INTERVAL", "5")
+if not is_int(QPC_STATS_FLUSH_INTERVAL):
+    logger.error(
+        'QPC_STATS_FLUSH_INTERVAL "%s" not an int. Setting to default of 5.',
+        QPC_STATS_FLUSH_INTERVAL,
+    )
+    QPC_STATS_FLUSH_INTERVAL = "5"
+QPC_STATS_FLUSH_INTERVAL = int(QPC_STATS_FLUSH_INTERVAL)
+
+QPC_STATS_FLUSH_COUNT = os.getenv("QPC_STATS_FLUSH_COUNT", "100")
+if not is_int(QPC_STATS_FLUSH_COUNT):
+    logger.error(
+        'QPC_STATS_FLUSH_COUNT "%s" not an int. Setting to default of 100.',
+        QPC_STATS_FLUSH_COUNT,
+    )
+    QPC_STATS_FLUSH_COUNT = "100"
+QPC_STATS_FLUSH_COUNT = max(int(QPC_STATS_FLUSH_COUNT), 1)
+
+# Number of fingerprints validated and saved together by the fingerprinter
+QPC_FINGERPRINT_BATCH_SIZE = os.getenv("QPC_FINGERPRINT_BATCH_SIZE", "1000")
+if not is_int(QPC_FINGERPRINT_BATCH_SIZE):
+    logger.error(
+        'QPC_FINGERPRINT_BATCH_SIZE "%s" not an int. Setting to default of 1000.',
+        QPC_FINGERPRINT_BATCH_SIZE,
+    )
+    QPC_FINGERPRINT_BATCH_SIZE = "1000"
+QPC_FINGERPRINT_BATCH_SIZE = max(int(QPC_FINGERPRINT_BATCH_SIZE), 1)
+
+# Number of processes converting facts to fingerprints (1 to disable the pool)
+QPC_FINGERPRINT_WORKERS = os.getenv("QPC_FINGERPRINT_WORKERS", "1")
+if not is_int(QPC_FINGERPRINT_WORKERS):
+    logger.error(
+        'QPC_FINGERPRINT_WORKERS "%s" not an int. Setting to default of 1.',
+        QPC_FINGERPRINT_WORKERS,
+    )
+    QPC_FINGERPRINT_WORKERS = "1"
+QPC_FINGERPRINT_WORKERS = max(int(QPC_FINGERPRINT_WORKERS), 1)
+
+# Max number of Satellite 6 hosts whose details are requested but not recorded
+QPC_SATELLITE_QUEUE_SIZE = os.getenv("QPC_SATELLITE_QUEUE_SIZE", "100")
+if not is_int(QPC_SATELLITE_QUEUE_SIZE):
+    logger.error(
+        'QPC_SATELLITE_QUEUE_SIZE "%s" not an int. Setting to default of 100.',
+        QPC_SATELLITE_QUEUE_SIZE,
+    )
+    QPC_SATELLITE_QUEUE_SIZE = "100"
+QPC_SATELLITE_QUEUE_SIZE = max(int(QPC_SATELLITE_QUEUE_SIZE), 1)
+
+# Number of Satellite 6 hosts requested per page
+QPC_SATELLITE_PAGE_SIZE = os.getenv("QPC_SATELLITE_PAGE_SIZE", "100")
+if not is_int(QPC_SATELLITE_PAGE_SIZE):
+    logger.error(
+        'QPC_SATELLITE_PAGE_SIZE "%s" not an int. Setting to default of 100.',
+        QPC_SATELLITE_PAGE_SIZE,
+    )
+    QPC_SATELLITE_PAGE_SIZE = "100"
+QPC_SATELLITE_PAGE_SIZE = max(int(QPC_SATELLITE_PAGE_SIZE), 1)
+
+# Max number of Satellite 6 pages of hosts requested at the same time
+QPC_SATELLITE_PAGES_IN_FLIGHT = os.getenv("QPC_SATELLITE_PAGES_IN_FLIGHT", "4")
+if not is_int(QPC_SATELLITE_PAGES_IN_FLIGHT):
+    logger.error(
+        'QPC_SATELLITE_PAGES_IN_FLIGHT "%s" not an int. Setting to default of 4.',
+        QPC_SATELLITE_PAGES_IN_FLIGHT,
+    )
+    QPC_SATELLITE_PAGES_IN_FLIGHT = "4"
+QPC_SATELLITE_PAGES_IN_FLIGHT = max(int(QPC_SATELLITE_PAGES_IN_FLIGHT), 1)
+
+# Max number of vCenter objects retrieved per page of properties
+QPC_VCENTER_MAX_OBJECTS = os.getenv("QPC_VCENTER_MAX_OBJECTS", "1000")
+if not is_int(QPC_VCENTER_MAX_OBJECTS):
+    logger.error(
+        'QPC_VCENTER_MAX_OBJECTS "%s" not an int. Setting to default of 1000.',
+        QPC_VCENTER_MAX_OBJECTS,
+    )
+    QPC_VCENTER_MAX_OBJECTS = "1000"
+QPC_VCENTER_MAX_OBJECTS = max(int(QPC_VCENTER_MAX_OBJECTS), 1)
+
 # Load Feature Flags
 QPC_FEATURE_FLAGS = FeatureFlag()
@@ -23,6 +23,14 @@ from . import environment, release
 class EnvironmentTest(TestCase):
     """Tests against the environment functions."""
 
+    def setUp(self):
+        """Forget the commit collected by other tests."""
+        environment.commit.cache_clear()
+
+    def tearDown(self):
+        """Don't leak mocked commits to other tests."""
+        environment.commit.cache_clear()
+
     @patch("os.environ")
     def test_commit_with_env(self, mock_os):
         """Test the commit method via environment."""
@@ -39,6 +47,15 @@ class EnvironmentTest(TestCase):
         result = environment.commit()
         self.assertEqual(result, expected)
 
+    @patch("subprocess.check_output")
+    def test_commit_is_cached(self, mock_subprocess):
+        """Test git is only called once to collect the commit."""
+        mock_subprocess.return_value = b"buildnum"
+        with patch.dict("os.environ", {"QUIPUCORDS_COMMIT": ""}):
+            self.assertEqual(environment.commit(), "buildnum")
+            self.assertEqual(environment.server_version().split(".")[-1], "buildnum")
+        mock_subprocess.assert_called_once()
+
     @patch("platform.uname")
     def test_platform_info(self, mock_platform):
         """Test the platform_info method."""
@@ -0,0 +1,187 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Executor for the scan tasks of a scan job."""
+
+import logging
+import multiprocessing
+from queue import Empty
+
+from django.db import connections
+
+from api.models import ScanJob, ScanTask
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+RESULT_POLL_INTERVAL = 1
+INTERRUPT_STATUS = {
+    ScanJob.JOB_TERMINATE_CANCEL: ScanTask.CANCELED,
+    ScanJob.JOB_TERMINATE_PAUSE: ScanTask.PAUSED,
+}
+
+
+def _run_task_in_process(run_task, runner, task_interrupt, result_queue):
+    """Run a single scan task inside a worker process."""
+    try:
+        task_status = run_task(runner, task_interrupt)
+    except Exception:  # pylint: disable=broad-except
+        # run_task is expected to record the failure on the task and job
+        logger.exception("Unexpected failure running %s.", runner)
+        task_status = None
+    result_queue.put((runner.scan_task.id, task_status))
+
+
+class TaskGraphExecutor:
+    """Run scan task runners respecting ScanTask.prerequisites.
+
+    Task runners whose prerequisites are finished run concurrently in worker
+    processes, up to max_parallel_tasks at a time. With max_parallel_tasks=1
+    tasks run sequentially in the current process.
+    """
+
+    def __init__(
+        self, run_task, manager_interrupt, max_parallel_tasks=1, fail_task=None
+    ):
+        """Initialize TaskGraphExecutor.
+
+        :param run_task: callable receiving a task runner and the interrupt
+            Value it should honor; returns the final ScanTask status or raises
+            on unexpected failures.
+        :param manager_interrupt: Shared memory Value used by the scan manager
+            to pause or cancel the scan job.
+        :param max_parallel_tasks: max number of tasks running at the same time.
+        :param fail_task: callable receiving a task runner and an error message,
+            called when the worker process of the task dies without reporting
+            a result (and so without recording the failure itself).
+        """
+        self.run_task = run_task
+        self.manager_interrupt = manager_interrupt
+        self.max_parallel_tasks = max(max_parallel_tasks, 1)
+        self.fail_task = fail_task
+
+    def run(self, task_runners, prerequisites):
+        """Run task runners.
+
+        Execution stops scheduling new tasks as soon as one of them is
+        canceled, paused or fails unexpectedly; tasks already running are
+        waited for.
+
+        :param task_runners: list of task runners ordered by sequence number
+        :param prerequisites: dict mapping a scan task id to the ids of the
+            scan tasks that should finish before it starts
+        :returns: list of (task runner, task status) in completion order;
+            task status is None if the task failed unexpectedly
+        """
+        if self.max_parallel_tasks == 1:
+            return self._run_sequentially(task_runners)
+        return self._run_in_parallel(task_runners, prerequisites)
+
+    def _run_sequentially(self, task_runners):
+        """Run task runners one by one in the current process."""
+        results = []
+        for runner in task_runners:
+            task_status = self.run_task(runner, self.manager_interrupt)
+            results.append((runner, task_status))
+            if task_status not in [ScanTask.COMPLETED, ScanTask.FAILED]:
+                break
+        return results
+
+    def _run_in_parallel(self, task_runners, prerequisites):
+        """Run task runners in worker processes."""
+        context = multiprocessing.get_context("fork")
+        result_queue = context.Queue()
+        pending = list(task_runners)
+        running = {}
+        finished = set()
+        results = []
+        interrupt_status = None
+        stop_scheduling = False
+
+        while pending or running:
+            if self.manager_interrupt.value in INTERRUPT_STATUS:
+                interrupt_status = INTERRUPT_STATUS[self.manager_interrupt.value]
+                stop_scheduling = True
+                # relay the request to each running task through its own
+                # Value, so one task acknowledging it doesn't hide it from
+                # the others
+                for _, _, task_interrupt in running.values():
+                    if task_interrupt.value == ScanJob.JOB_RUN:
+                        task_interrupt.value = self.manager_interrupt.value
+                self.manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+
+            if not stop_scheduling:
+                for runner in list(pending):
+                    if len(running) >= self.max_parallel_tasks:
+                        break
+                    task_id = runner.scan_task.id
+                    if not prerequisites.get(task_id, set()) <= finished:
+                        continue
+                    pending.remove(runner)
+                    running[task_id] = self._start_worker(context, runner, result_queue)
+
+            if not running:
+                break
+
+            try:
+                task_id, task_status = result_queue.get(timeout=RESULT_POLL_INTERVAL)
+            except Empty:
+                crashed = self._collect_dead_workers(running, finished)
+                if crashed:
+                    results.extend(crashed)
+                    stop_scheduling = True
+                continue
+
+            if task_id not in running:
+                continue
+            runner, process, _ = running.pop(task_id)
+            process.join()
+            finished.add(task_id)
+            results.append((runner, task_status))
+            if task_status not in [ScanTask.COMPLETED, ScanTask.FAILED]:
+                stop_scheduling = True
+
+        if interrupt_status and pending:
+            # mirror the sequential execution, where the next task reports
+            # the interruption instead of starting
+            results.append((pending[0], interrupt_status))
+        return results
+
+    def _start_worker(self, context, runner, result_queue):
+        """Start a worker process for runner."""
+        task_interrupt = context.Value("i", ScanJob.JOB_RUN)
+        # forked processes must not share the parent database connections
+        connections.close_all()
+        process = context.Process(
+            target=_run_task_in_process,
+            args=(self.run_task, runner, task_interrupt, result_queue),
+        )
+        process.start()
+        logger.debug("Started worker process %s for %s.", process.pid, runner)
+        return runner, process, task_interrupt
+
+    def _collect_dead_workers(self, running, finished):
+        """Handle worker processes that crashed without reporting a result."""
+        results = []
+        for task_id, (runner, process, _) in list(running.items()):
+            # workers report their result before exiting normally
+            if process.exitcode in [None, 0]:
+                continue
+            del running[task_id]
+            finished.add(task_id)
+            error_message = (
+                f"Worker process {process.pid} for {runner} exited with code"
+                f" {process.exitcode}."
+            )
+            logger.error(error_message)
+            if self.fail_task:
+                self.fail_task(runner, error_message)
+            results.append((runner, None))
+        return results
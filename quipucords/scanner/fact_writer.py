@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Buffered writer for inspection results and their raw facts."""
+
+import csv
+import io
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from api.models import RawFact, SystemInspectionResult
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class FactWriter:
+    """Accumulate SystemInspectionResults and RawFacts and save them in bulk.
+
+    Results are written once the number of buffered facts reaches batch_size
+    or when flush is called. Scan task runners flush their writer whenever a
+    task finishes, fails or is interrupted, so that results found before a
+    pause are available when the scan is resumed.
+    """
+
+    def __init__(self, scan_task, batch_size=None):
+        """Initialize FactWriter.
+
+        :param scan_task: the inspection scan task owning the results
+        :param batch_size: number of facts buffered before an automatic
+            flush. Defaults to settings.QPC_FACT_WRITER_BATCH_SIZE.
+        """
+        self.scan_task = scan_task
+        if batch_size is None:
+            batch_size = settings.QPC_FACT_WRITER_BATCH_SIZE
+        self.batch_size = max(batch_size, 1)
+        self._pending = []
+        self._pending_facts = 0
+
+    def __len__(self):
+        """Return the number of buffered inspection results."""
+        return len(self._pending)
+
+    def add(self, name, status, facts=None):
+        """Buffer an inspection result.
+
+        :param name: the system name
+        :param status: the SystemInspectionResult status
+        :param facts: dict mapping fact names to their JSON encoded values
+        :returns: the (unsaved) SystemInspectionResult
+        """
+        sys_result = SystemInspectionResult(
+            name=name,
+            status=status,
+            source=self.scan_task.source,
+            task_inspection_result=self.scan_task.inspection_result,
+        )
+        facts = facts or {}
+        self._pending.append((sys_result, facts))
+        self._pending_facts += len(facts)
+        if self._pending_facts >= self.batch_size:
+            self.flush()
+        return sys_result
+
+    @transaction.atomic
+    def flush(self):
+        """Save all buffered inspection results and raw facts."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._pending_facts = 0
+
+        sys_results = [sys_result for sys_result, _ in pending]
+        if connection.features.can_return_rows_from_bulk_insert:
+            SystemInspectionResult.objects.bulk_create(sys_results)
+        else:
+            # primary keys are required to link facts to their results
+            for sys_result in sys_results:
+                sys_result.save()
+
+        raw_facts = [
+            (name, value, sys_result.id)
+            for sys_result, facts in pending
+            for name, value in facts.items()
+        ]
+        if connection.vendor == "postgresql":
+            self._copy_raw_facts(raw_facts)
+        else:
+            RawFact.objects.bulk_create(
+                [
+                    RawFact(name=name, value=value, system_inspection_result_id=pk)
+                    for name, value, pk in raw_facts
+                ],
+                batch_size=self.batch_size,
+            )
+        logger.debug(
+            "Saved %d inspection results with %d facts for scan task %s.",
+            len(sys_results),
+            len(raw_facts),
+            self.scan_task.id,
+        )
+
+    @staticmethod
+    def _copy_raw_facts(raw_facts):
+        """Load raw facts using PostgreSQL COPY."""
+        buffer = io.StringIO()
+        # quote every string so empty values aren't loaded as NULL
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerows(raw_facts)
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {RawFact._meta.db_table}"  # pylint: disable=protected-access
+                " (name, value, system_inspection_result_id)"
+                " FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
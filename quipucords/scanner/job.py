@@ -12,6 +12,7 @@
 import logging
 from multiprocessing import Process, Value
 
+from django.conf import settings
 from django.db.models import Q
 
 from api.common.common_report import create_report_version
@@ -23,6 +24,7 @@ from api.details_report.util import (
 from api.models import ScanJob, ScanTask, Source
 from fingerprinter.task import FingerprintTaskRunner
 from scanner import network, openshift, satellite, vcenter
+from scanner.executor import TaskGraphExecutor
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -100,17 +102,28 @@ class ScanJobRunner(Process):
             f"Job has {len(incomplete_scan_tasks):d} remaining tasks"
         )
 
-        failed_tasks = []
-        for runner in task_runners:
-            # Mark runner as running
-
-            task_status = self._run_task(runner)
+        executor = TaskGraphExecutor(
+            self._run_task,
+            self.manager_interrupt,
+            settings.QPC_MAX_CONCURRENT_SCAN_TASKS,
+            self._fail_crashed_task,
+        )
+        task_results = executor.run(task_runners, self._get_prerequisites(task_runners))
+        # tasks might have run in worker processes
+        self.scan_job.refresh_from_db()
 
+        failed_tasks = []
+        for runner, task_status in task_results:
             if task_status == ScanTask.FAILED:
                 # Task did not complete successfully
                 failed_tasks.append(runner.scan_task)
+            elif task_status is None:
+                # unexpected error, already recorded on the task and job by
+                # _run_task or _fail_crashed_task
+                return ScanTask.FAILED
             elif task_status != ScanTask.COMPLETED:
                 # something went wrong or cancel/pause
+                self._interrupt_job(task_status)
                 return task_status
 
         if self.scan_job.scan_type in [
@@ -148,6 +161,7 @@ class ScanJobRunner(Process):
                 )
                 raise error
             if task_status in [ScanTask.CANCELED, ScanTask.PAUSED]:
+                self._interrupt_job(task_status)
                 return task_status
             elif task_status != ScanTask.COMPLETED:
                 # Task did not complete successfully
@@ -193,20 +207,54 @@ class ScanJobRunner(Process):
             return FingerprintTaskRunner(self.scan_job, scan_task)
         return None
 
-    def _run_task(self, runner):
-        """Run a sigle scan task."""
+    @staticmethod
+    def _get_prerequisites(task_runners):
+        """Map each scan task id to the ids of its unfinished prerequisites."""
+        task_ids = {runner.scan_task.id for runner in task_runners}
+        return {
+            runner.scan_task.id: set(
+                runner.scan_task.prerequisites.values_list("id", flat=True)
+            )
+            & task_ids
+            for runner in task_runners
+        }
+
+    def _fail_crashed_task(self, runner, error_message):
+        """Fail a task whose worker process died, and the scan job with it."""
+        # the worker process might have updated both before dying
+        runner.scan_task.refresh_from_db()
+        runner.scan_task.fail(error_message)
+        self.scan_job.refresh_from_db()
+        self.scan_job.fail(f"FATAL ERROR. {error_message}")
+
+    def _interrupt_job(self, task_status):
+        """Propagate a canceled/paused task status to the scan job."""
+        if task_status == ScanTask.CANCELED:
+            self.scan_job.cancel()
+        elif task_status == ScanTask.PAUSED:
+            self.scan_job.pause()
+
+    def _run_task(self, runner, manager_interrupt=None):
+        """Run a sigle scan task.
+
+        :param runner: the task runner
+        :param manager_interrupt: Shared memory Value the task should honor.
+            Defaults to the job manager_interrupt.
+        """
         # pylint: disable=no-else-return
-        if self.manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
-            self.manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+        if manager_interrupt is None:
+            manager_interrupt = self.manager_interrupt
+        if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
+            manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
             return ScanTask.CANCELED
 
-        if self.manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
-            self.manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+        if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
+            manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
             return ScanTask.PAUSED
         runner.scan_task.start()
         # run runner
         try:
-            status_message, task_status = runner.run(self.manager_interrupt)
+            status_message, task_status = runner.run(manager_interrupt)
         except Exception as error:
             failed_task = runner.scan_task
             context_message = "Unexpected failure occurred."
@@ -226,10 +274,8 @@ class ScanJobRunner(Process):
         # Save Task status
         if task_status == ScanTask.CANCELED:
             runner.scan_task.cancel()
-            runner.scan_job.cancel()
         elif task_status == ScanTask.PAUSED:
             runner.scan_task.pause()
-            runner.scan_job.pause()
         elif task_status == ScanTask.COMPLETED:
             runner.scan_task.complete(status_message)
         elif task_status == ScanTask.FAILED:
@@ -11,11 +11,16 @@
 
 """Queue Manager module."""
 
+import heapq
+import itertools
 import logging
 import os
-from threading import Thread, Timer
-from time import sleep
+from collections import Counter
+from multiprocessing.connection import wait
+from threading import Condition, Thread, Timer
+from time import monotonic
 
+from django.conf import settings
 from django.db.models import Q
 
 from api.models import ScanJob, ScanTask
@@ -26,9 +31,18 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 DEFAULT_HEARTBEAT = 60 * 15
 DEFAULT_MAX_TIMEOUT_ORDERLY_SHUTDOWN = 30
+# interval used to check on jobs that were asked to terminate
 RUN_QUEUE_SLEEP_TIME = 5
 SCAN_MANAGER_LOG_PREFIX = "SCAN JOB MANAGER"
 
+# lower values are started first; jobs with the same priority run in FIFO order
+DEFAULT_JOB_PRIORITY = 10
+JOB_PRIORITY_PER_SCAN_TYPE = {
+    ScanTask.SCAN_TYPE_FINGERPRINT: 0,
+    ScanTask.SCAN_TYPE_CONNECT: 5,
+    ScanTask.SCAN_TYPE_INSPECT: DEFAULT_JOB_PRIORITY,
+}
+
 try:
     ORDERLY_SHUTDOWN_TIMEOUT_LENGTH = int(
         os.environ.get(
@@ -46,17 +60,93 @@ except ValueError:
     HEART_BEAT_INTERVAL = DEFAULT_HEARTBEAT
 
 
+def parse_source_type_limits(limits):
+    """Parse per source type concurrency limits.
+
+    :param limits: string formatted as "<source_type>=<limit>,..."
+    :returns: dict mapping source type to the max number of concurrent jobs
+    """
+    parsed_limits = {}
+    for item in limits.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        source_type, _, limit = item.partition("=")
+        try:
+            parsed_limits[source_type.strip()] = max(int(limit), 1)
+        except ValueError:
+            logger.error(
+                "%s: Ignoring invalid source type limit '%s'.",
+                SCAN_MANAGER_LOG_PREFIX,
+                item,
+            )
+    return parsed_limits
+
+
+def get_job_priority(job_runner):
+    """Return the scheduling priority for a scan job runner."""
+    return JOB_PRIORITY_PER_SCAN_TYPE.get(
+        job_runner.scan_job.scan_type, DEFAULT_JOB_PRIORITY
+    )
+
+
+def get_job_source_types(job_runner):
+    """Return the set of source types scanned by a scan job runner."""
+    return set(
+        job_runner.scan_job.sources.values_list("source_type", flat=True).distinct()
+    )
+
+
+class TerminatingJob:
+    """Scan job runner that was asked to shutdown."""
+
+    def __init__(self, job_runner):
+        """Initialize TerminatingJob."""
+        self.job_runner = job_runner
+        self.requested_at = monotonic()
+        self.forced = False
+
+    @property
+    def elapsed_time(self):
+        """Seconds since termination was requested."""
+        return int(monotonic() - self.requested_at)
+
+
 class Manager(Thread):
-    """Manager of scan job queue."""
+    """Manager of scan job queue.
+
+    Scan jobs are started in priority order (fingerprint/merge jobs first) as
+    long as there is a free job slot and the per source type limits allow it.
+    The run loop sleeps until it is notified that a job was queued, killed or
+    that a job process exited.
+    """
 
-    def __init__(self):
-        """Initialize the manager."""
+    def __init__(self, max_concurrent_jobs=None, source_type_limits=None):
+        """Initialize the manager.
+
+        :param max_concurrent_jobs: number of scan jobs allowed to run at the
+            same time. Defaults to settings.QPC_MAX_CONCURRENT_SCAN_JOBS.
+        :param source_type_limits: dict mapping source type to the number of
+            jobs scanning it allowed to run at the same time. Defaults to
+            settings.QPC_SCAN_JOB_SOURCE_TYPE_LIMITS.
+        """
         Thread.__init__(self)
+        if max_concurrent_jobs is None:
+            max_concurrent_jobs = settings.QPC_MAX_CONCURRENT_SCAN_JOBS
+        if source_type_limits is None:
+            source_type_limits = parse_source_type_limits(
+                settings.QPC_SCAN_JOB_SOURCE_TYPE_LIMITS
+            )
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.source_type_limits = source_type_limits
+        # heap of (priority, sequence, job runner)
         self.scan_queue = []
-        self.current_job_runner = None
-        self.terminated_job_runner = None
-        self.termination_elapsed_time = 0
+        self.running_job_runners = {}
+        self.terminated_job_runners = {}
         self.running = True
+        self._source_types = {}
+        self._sequence = itertools.count()
+        self._condition = Condition()
         logger.info("%s: Scan manager instance created.", SCAN_MANAGER_LOG_PREFIX)
 
     def start_log_timer(self):
@@ -68,56 +158,118 @@ class Manager(Thread):
 
     def log_info(self):
         """Log the status of the scan manager."""
-        current_scan_job = None
-        if self.current_job_runner:
-            current_scan_job = self.current_job_runner.identifier
-            scan_job_message = f"Currently running scan job {current_scan_job}"
+        with self._condition:
+            running_job_ids = sorted(self.running_job_runners)
+            scan_queue_ids = [entry[-1].identifier for entry in sorted(self.scan_queue)]
+
+        if running_job_ids:
+            scan_job_message = f"Currently running scan jobs {running_job_ids}"
         else:
             scan_job_message = "No scan job currently running"
 
-        scan_queue_ids = [scan_runner.scan_job.id for scan_runner in self.scan_queue]
-        scan_queue_ids.reverse()
-
         logger.info(
             "%s: %s.  Scan queue length is %s. Queued jobs: %s",
             SCAN_MANAGER_LOG_PREFIX,
             scan_job_message,
-            len(self.scan_queue),
+            len(scan_queue_ids),
             scan_queue_ids,
         )
 
+    def _active_job_runners(self):
+        """Return job runners occupying a slot (running or terminating)."""
+        return list(self.running_job_runners.values()) + [
+            terminating.job_runner
+            for terminating in self.terminated_job_runners.values()
+        ]
+
+    def _has_free_slot(self):
+        """Check if another scan job can be started."""
+        return len(self._active_job_runners()) < self.max_concurrent_jobs
+
+    def _source_types_available(self, job_runner):
+        """Check if per source type limits allow job_runner to start."""
+        if not self.source_type_limits:
+            return True
+        active_source_types = Counter()
+        for active_runner in self._active_job_runners():
+            active_source_types.update(
+                self._source_types.get(active_runner.identifier, set())
+            )
+        for source_type in self._source_types.get(job_runner.identifier, set()):
+            limit = self.source_type_limits.get(source_type)
+            if limit is not None and active_source_types[source_type] >= limit:
+                return False
+        return True
+
     def work(self):
-        """Start to excute scans in the queue."""
-        if len(self.scan_queue) > 0:  # pylint: disable=C1801
-            self.current_job_runner = self.scan_queue.pop()
-            if self.current_job_runner.scan_job.status in [
-                ScanTask.PENDING,
-                ScanTask.RUNNING,
-            ]:
-                logger.info(
-                    "%s: Loading scan job %s.",
-                    SCAN_MANAGER_LOG_PREFIX,
-                    self.current_job_runner.scan_job.id,
-                )
-                self.current_job_runner.start()
-                self.log_info()
-            else:
-                error = (
-                    f"{SCAN_MANAGER_LOG_PREFIX}: Could not start job."
-                    f" Job was not in {ScanTask.PENDING} state."
-                )
-                self.current_job_runner.scan_job.log_message(
-                    error, log_level=logging.ERROR
-                )
+        """Start queued scan jobs while there are free slots."""
+        with self._condition:
+            postponed = []
+            while self.scan_queue and self._has_free_slot():
+                entry = heapq.heappop(self.scan_queue)
+                job_runner = entry[-1]
+                if not self._source_types_available(job_runner):
+                    postponed.append(entry)
+                    continue
+                self._start_job(job_runner)
+            for entry in postponed:
+                heapq.heappush(self.scan_queue, entry)
+
+    def _start_job(self, job_runner):
+        """Start a scan job runner and watch for its termination."""
+        if job_runner.scan_job.status in [
+            ScanTask.PENDING,
+            ScanTask.RUNNING,
+        ]:
+            logger.info(
+                "%s: Loading scan job %s.",
+                SCAN_MANAGER_LOG_PREFIX,
+                job_runner.scan_job.id,
+            )
+            job_runner.start()
+            self.running_job_runners[job_runner.identifier] = job_runner
+            watcher = Thread(target=self._watch_job, args=(job_runner,), daemon=True)
+            watcher.start()
+            self.log_info()
+        else:
+            self._source_types.pop(job_runner.identifier, None)
+            error = (
+                f"{SCAN_MANAGER_LOG_PREFIX}: Could not start job."
+                f" Job was not in {ScanTask.PENDING} state."
+            )
+            job_runner.scan_job.log_message(error, log_level=logging.ERROR)
+
+    def _watch_job(self, job_runner):
+        """Wake up the run loop once the job process exits."""
+        # waiting on the sentinel doesn't reap the process, so is_alive()
+        # remains the single source of truth for the run loop
+        wait([job_runner.sentinel])
+        self.notify()
+
+    def notify(self):
+        """Wake up the run loop."""
+        with self._condition:
+            self._condition.notify_all()
 
     def put(self, job):
         """Add job to scan queue.
 
         :param job: Job to be performed.
         """
-        self.scan_queue.insert(0, job)
+        source_types = get_job_source_types(job)
+        priority = get_job_priority(job)
+        with self._condition:
+            self._source_types[job.identifier] = source_types
+            heapq.heappush(self.scan_queue, (priority, next(self._sequence), job))
+            self._condition.notify_all()
         self.log_info()
 
+    def stop(self):
+        """Stop the run loop."""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+
     # pylint: disable=inconsistent-return-statements
     def kill(self, job, command):
         """Kill a job or remove it from the running queue.
@@ -127,54 +279,50 @@ class Manager(Thread):
         """
         killed = False
         job_id = job.id
-        if (
-            self.current_job_runner is not None
-            and self.current_job_runner.identifier == job_id
-            and self.current_job_runner.is_alive()
-        ):
-
-            # record which job is terminated
-            self.terminated_job_runner = self.current_job_runner
-            self.current_job_runner = None
-
-            job.log_message(
-                f"{SCAN_MANAGER_LOG_PREFIX}: Send interrupt"
-                " to allow job orderly shutdown"
-            )
-            if command == "cancel":
-                self.terminated_job_runner.manager_interrupt.value = (
-                    ScanJob.JOB_TERMINATE_CANCEL
-                )
-            if command == "pause":
-                self.terminated_job_runner.manager_interrupt.value = (
-                    ScanJob.JOB_TERMINATE_PAUSE
-                )
-            self.termination_elapsed_time = 0
-        else:
-            logger.info(
-                "%s: Checking scan queue for job to remove.", SCAN_MANAGER_LOG_PREFIX
-            )
-            removed = False
-            for queued_job in self.scan_queue:
-                if queued_job.identifier == job_id:
-                    self.scan_queue.remove(queued_job)
-                    removed = True
-                    self.log_info()
-                    break
-            if removed:
-                killed = True
-                logger.info(
-                    "%s: Job %d has been removed from the scan queue.",
-                    SCAN_MANAGER_LOG_PREFIX,
-                    job_id,
+        with self._condition:
+            job_runner = self.running_job_runners.get(job_id)
+            if job_runner is not None and job_runner.is_alive():
+                # record which job is terminated
+                del self.running_job_runners[job_id]
+                self.terminated_job_runners[job_id] = TerminatingJob(job_runner)
+
+                job.log_message(
+                    f"{SCAN_MANAGER_LOG_PREFIX}: Send interrupt"
+                    " to allow job orderly shutdown"
                 )
+                if command == "cancel":
+                    job_runner.manager_interrupt.value = ScanJob.JOB_TERMINATE_CANCEL
+                if command == "pause":
+                    job_runner.manager_interrupt.value = ScanJob.JOB_TERMINATE_PAUSE
+                self._condition.notify_all()
             else:
                 logger.info(
-                    "%s: Job %d was not found in the scan queue.",
+                    "%s: Checking scan queue for job to remove.",
                     SCAN_MANAGER_LOG_PREFIX,
-                    job_id,
                 )
-            return killed
+                removed = False
+                for entry in self.scan_queue:
+                    if entry[-1].identifier == job_id:
+                        self.scan_queue.remove(entry)
+                        heapq.heapify(self.scan_queue)
+                        self._source_types.pop(job_id, None)
+                        removed = True
+                        break
+                if removed:
+                    killed = True
+                    logger.info(
+                        "%s: Job %d has been removed from the scan queue.",
+                        SCAN_MANAGER_LOG_PREFIX,
+                        job_id,
+                    )
+                else:
+                    logger.info(
+                        "%s: Job %d was not found in the scan queue.",
+                        SCAN_MANAGER_LOG_PREFIX,
+                        job_id,
+                    )
+                self.log_info()
+                return killed
 
     def restart_incomplete_scansjobs(self):
         """Look for incomplete scans and restart."""
@@ -205,79 +353,85 @@ class Manager(Thread):
                 "%s: No running or pending scan jobs to start", SCAN_MANAGER_LOG_PREFIX
             )
 
-    def run(self):
-        """Trigger thread execution."""
-        # pylint: disable=too-many-branches
-        self.restart_incomplete_scansjobs()
-        logger.info("%s: Started run loop.", SCAN_MANAGER_LOG_PREFIX)
-        self.start_log_timer()
-        while self.running:
-            queue_len = len(self.scan_queue)
-            if self.terminated_job_runner is not None:
-                # Occurs when current job was terminated
-                killed = not self.terminated_job_runner.is_alive()
-                interrupt = self.terminated_job_runner.manager_interrupt
-                if killed:
-                    # Set this to None so another job can run.
-                    self.terminated_job_runner.scan_job.log_message(
-                        f"{SCAN_MANAGER_LOG_PREFIX}: Process successfully terminated."
+    def _check_terminated_jobs(self):
+        """Follow up on jobs that were asked to terminate."""
+        for job_id, terminating in list(self.terminated_job_runners.items()):
+            job_runner = terminating.job_runner
+            if not job_runner.is_alive():
+                # Free the slot so another job can run.
+                job_runner.scan_job.log_message(
+                    f"{SCAN_MANAGER_LOG_PREFIX}: Process successfully terminated."
+                )
+                del self.terminated_job_runners[job_id]
+                self._source_types.pop(job_id, None)
+            elif job_runner.manager_interrupt.value == ScanJob.JOB_TERMINATE_ACK:
+                job_runner.scan_job.log_message(
+                    f"{SCAN_MANAGER_LOG_PREFIX}: Scan job acknowledged"
+                    " request to terminate but still processing."
+                )
+            else:
+                job_runner.scan_job.log_message(
+                    f"{SCAN_MANAGER_LOG_PREFIX}: Scan job has not acknowledged"
+                    " request to terminate after"
+                    f" {terminating.elapsed_time:d}s."
+                )
+
+                # After a time period terminate (will not work in gunicorn)
+                if (
+                    not terminating.forced
+                    and terminating.elapsed_time >= ORDERLY_SHUTDOWN_TIMEOUT_LENGTH
+                ):
+                    job_runner.scan_job.log_message(
+                        "FORCEFUL TERMINATION OF JOB PROCESS"
                     )
-                    self.terminated_job_runner = None
-                elif interrupt.value == ScanJob.JOB_TERMINATE_ACK:
-                    self.terminated_job_runner.log_message(
-                        f"{SCAN_MANAGER_LOG_PREFIX}: Scan job acknowledged"
-                        " request to terminate but still processing."
+                    job_runner.terminate()
+                    terminating.forced = True
+
+    def _check_finished_jobs(self):
+        """Release the slots of jobs whose process has exited."""
+        for job_id, job_runner in list(self.running_job_runners.items()):
+            if job_runner.is_alive():
+                continue
+            terminated_job = ScanJob.objects.filter(id=job_id).first()
+            if terminated_job:
+                if terminated_job.status in [
+                    ScanTask.PENDING,
+                    ScanTask.CREATED,
+                    ScanTask.RUNNING,
+                ]:
+                    terminated_job.log_message(
+                        f"{SCAN_MANAGER_LOG_PREFIX}:"
+                        " scan job has unexpectedly failed."
+                    )
+                    terminated_job.fail(
+                        "Scan manager failed job due to unexpected error."
                     )
                 else:
-                    self.terminated_job_runner.scan_job.log_message(
-                        f"{SCAN_MANAGER_LOG_PREFIX}: Scan job has not acknowledged"
-                        " request to terminate after"
-                        f" {self.termination_elapsed_time:d}s."
+                    terminated_job.log_message(
+                        f"{SCAN_MANAGER_LOG_PREFIX}: scan job has completed."
                     )
+            else:
+                job_runner.scan_job.log_message(
+                    "Scan manager detected deletion of scan job "
+                    "model before final updates applied."
+                )
+            del self.running_job_runners[job_id]
+            self._source_types.pop(job_id, None)
 
-                    # After a time period terminate (will not work in gunicorn)
-                    self.termination_elapsed_time += RUN_QUEUE_SLEEP_TIME
-                    if self.termination_elapsed_time == ORDERLY_SHUTDOWN_TIMEOUT_LENGTH:
-                        self.terminated_job_runner.scan_job.log_message(
-                            "FORCEFUL TERMINATION OF JOB PROCESS"
-                        )
-                        self.terminated_job_runner.terminate()
-            elif self.current_job_runner is not None:
-                # Occurs when current jobs ends and at least 1 in queue
-                killed = not self.current_job_runner.is_alive()
-                if killed:
-                    terminated_job = ScanJob.objects.filter(
-                        id=self.current_job_runner.scan_job.id
-                    ).first()
-                    if terminated_job:
-                        if terminated_job.status in [
-                            ScanTask.PENDING,
-                            ScanTask.CREATED,
-                            ScanTask.RUNNING,
-                        ]:
-                            terminated_job.log_message(
-                                f"{SCAN_MANAGER_LOG_PREFIX}:"
-                                " scan job has unexpectedly failed."
-                            )
-                            terminated_job.fail(
-                                "Scan manager failed job due to unexpected error."
-                            )
-                        else:
-                            terminated_job.log_message(
-                                f"{SCAN_MANAGER_LOG_PREFIX}: scan job has completed."
-                            )
-                    else:
-                        self.current_job_runner.scan_job.log_message(
-                            "Scan manager detected deletion of scan job "
-                            "model before final updates applied."
-                        )
-                    self.current_job_runner = None
-                    if queue_len > 0:
-                        self.work()
-            elif queue_len > 0 and self.current_job_runner is None:
-                # Occurs when no current job, but new one added
+    def run(self):
+        """Trigger thread execution."""
+        self.restart_incomplete_scansjobs()
+        logger.info("%s: Started run loop.", SCAN_MANAGER_LOG_PREFIX)
+        self.start_log_timer()
+        with self._condition:
+            while self.running:
+                self._check_terminated_jobs()
+                self._check_finished_jobs()
                 self.work()
-            sleep(RUN_QUEUE_SLEEP_TIME)
+                # jobs being terminated need to be checked periodically;
+                # otherwise sleep until put/kill or a job process exits
+                timeout = RUN_QUEUE_SLEEP_TIME if self.terminated_job_runners else None
+                self._condition.wait(timeout)
 
 
 SCAN_MANAGER = Manager()
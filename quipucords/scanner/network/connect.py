@@ -11,6 +11,7 @@
 """ScanTask used for network connection discovery."""
 import logging
 import os.path
+from collections import defaultdict
 
 import ansible_runner
 import pexpect
@@ -29,11 +30,14 @@ from api.serializers import CredentialSerializer, SourceSerializer
 from api.vault import decrypt_data_as_unicode, write_to_yaml
 from quipucords import settings
 from scanner.network.connect_callback import ConnectResultCallback
+from scanner.network.probe import probe_hosts
 from scanner.network.utils import (
     check_manager_interrupt,
     construct_inventory,
     expand_hostpattern,
+    host_scheduling,
 )
+from scanner.stats import StatsAccumulator
 from scanner.task import ScanTaskRunner
 
 # Get an instance of a logger
@@ -46,9 +50,10 @@ logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 class ConnectResultStore:
     """This object knows how to record and retrieve connection results."""
 
-    def __init__(self, scan_task):
+    def __init__(self, scan_task, stats=None):
         """Initialize ConnectResultStore object."""
         self.scan_task = scan_task
+        self.stats = stats or StatsAccumulator(scan_task)
 
         source = scan_task.source
 
@@ -93,12 +98,12 @@ class ConnectResultStore:
 
         if status == SystemConnectionResult.SUCCESS:
             message = f"{name} with {credential.name}"
-            self.scan_task.increment_stats(
+            self.stats.increment(
                 message, increment_sys_scanned=True, prefix="CONNECTED"
             )
         elif status == SystemConnectionResult.UNREACHABLE:
             message = f"{name} is UNREACHABLE"
-            self.scan_task.increment_stats(
+            self.stats.increment(
                 message, increment_sys_unreachable=True, prefix="FAILED"
             )
         else:
@@ -107,9 +112,7 @@ class ConnectResultStore:
             else:
                 message = f"{name} has no valid credentials"
 
-            self.scan_task.increment_stats(
-                message, increment_sys_failed=True, prefix="FAILED"
-            )
+            self.stats.increment(message, increment_sys_failed=True, prefix="FAILED")
 
         self._remaining_hosts.remove(name)
 
@@ -132,7 +135,7 @@ class ConnectTaskRunner(ScanTaskRunner):
 
     def execute_task(self, manager_interrupt):
         """Scan network range and attempt connections."""
-        result_store = ConnectResultStore(self.scan_task)
+        result_store = ConnectResultStore(self.scan_task, self.stats)
         scan_message, scan_result = self.run_with_result_store(
             manager_interrupt, result_store
         )
@@ -158,8 +161,18 @@ class ConnectTaskRunner(ScanTaskRunner):
         credentials = source["credentials"]
 
         remaining_hosts = result_store.remaining_hosts()
+        if settings.QPC_NETWORK_PREPROBE and remaining_hosts:
+            remaining_hosts = self._probe_hosts(
+                remaining_hosts, connection_port, result_store
+            )
+
+        attempts = [(cred_id, None) for cred_id in credentials]
+        if settings.QPC_NETWORK_CREDENTIAL_AFFINITY and remaining_hosts:
+            predicted = self._previous_credentials(remaining_hosts, credentials)
+            attempts = list(predicted.items()) + attempts
+        attempted_hosts = defaultdict(set)
 
-        for cred_id in credentials:
+        for cred_id, cred_hosts in attempts:
             check_manager_interrupt(manager_interrupt.value)
             credential = Credential.objects.get(pk=cred_id)
             if not remaining_hosts:
@@ -167,14 +180,30 @@ class ConnectTaskRunner(ScanTaskRunner):
                 self.scan_task.log_message(message)
                 break
 
-            message = f"Attempting credential {credential.name}."
+            if cred_hosts is None:
+                # don't retry hosts that already failed with this credential
+                hosts = [
+                    host
+                    for host in remaining_hosts
+                    if host not in attempted_hosts[cred_id]
+                ]
+                message = f"Attempting credential {credential.name}."
+            else:
+                hosts = list(set(cred_hosts).intersection(remaining_hosts))
+                message = (
+                    f"Attempting credential {credential.name} for {len(hosts)}"
+                    " hosts it connected to in previous scans."
+                )
+            if not hosts:
+                continue
+            attempted_hosts[cred_id].update(hosts)
             self.scan_task.log_message(message)
 
             try:
                 scan_message, scan_result = _connect(
                     manager_interrupt,
                     self.scan_task,
-                    remaining_hosts,
+                    hosts,
                     result_store,
                     credential,
                     connection_port,
@@ -204,6 +233,67 @@ class ConnectTaskRunner(ScanTaskRunner):
 
         return None, ScanTask.COMPLETED
 
+    def _previous_credentials(self, hosts, credentials):
+        """Find the credentials that connected to hosts in previous scans.
+
+        :param hosts: hosts to be scanned
+        :param credentials: ids of the source credentials
+        :returns: dict mapping credential ids to the hosts they connected
+            to, ordered as credentials
+        """
+        hosts = set(hosts)
+        previous_results = (
+            SystemConnectionResult.objects.filter(
+                source=self.scan_task.source,
+                status=SystemConnectionResult.SUCCESS,
+                credential_id__in=credentials,
+            )
+            .exclude(task_connection_result=self.scan_task.connection_result)
+            .order_by("id")
+            .values_list("name", "credential_id")
+        )
+        # the latest successful connection wins
+        host_credentials = {
+            name: cred_id for name, cred_id in previous_results if name in hosts
+        }
+        predicted = {cred_id: [] for cred_id in credentials}
+        for host, cred_id in host_credentials.items():
+            predicted[cred_id].append(host)
+        return {
+            cred_id: cred_hosts
+            for cred_id, cred_hosts in predicted.items()
+            if cred_hosts
+        }
+
+    def _probe_hosts(self, hosts, connection_port, result_store):
+        """Record hosts not accepting connections as unreachable.
+
+        :returns: the list of reachable hosts
+        """
+        reachable, unreachable, inconclusive = probe_hosts(
+            hosts,
+            connection_port,
+            settings.QPC_NETWORK_PREPROBE_TIMEOUT,
+            settings.QPC_NETWORK_PREPROBE_CONCURRENCY,
+        )
+        self.scan_task.log_message(
+            f"TCP PROBE - {len(reachable)} hosts reachable and"
+            f" {len(unreachable)} hosts unreachable on port {connection_port}."
+        )
+        if inconclusive:
+            # local resources ran out, let Ansible try these hosts
+            self.scan_task.log_message(
+                f"TCP PROBE - {len(inconclusive)} hosts could not be probed"
+                " for lack of local resources (open files, buffers or ports)."
+                " Attempting to connect to them anyway.",
+                log_level=logging.WARNING,
+            )
+        for host in unreachable:
+            result_store.record_result(
+                host, self.scan_task.source, None, SystemConnectionResult.UNREACHABLE
+            )
+        return reachable + inconclusive
+
 
 def _connect(  # pylint: disable=too-many-arguments
     manager_interrupt,
@@ -232,11 +322,14 @@ def _connect(  # pylint: disable=too-many-arguments
     """
     # pylint: disable=too-many-locals, disable=too-many-statements, too-many-branches
     cred_data = CredentialSerializer(credential).data
+    group_size, job_timeout, envvars = host_scheduling(
+        len(hosts), forks, int(settings.NETWORK_CONNECT_JOB_TIMEOUT)
+    )
     group_names, inventory = construct_inventory(
         hosts=hosts,
         credential=cred_data,
         connection_port=connection_port,
-        concurrency_count=forks,
+        concurrency_count=group_size,
         exclude_hosts=exclude_hosts,
     )
     inventory_file = write_to_yaml(inventory)
@@ -264,7 +357,7 @@ def _connect(  # pylint: disable=too-many-arguments
         )
 
         # Create parameters for ansible runner
-        runner_settings = {"job_timeout": int(settings.NETWORK_CONNECT_JOB_TIMEOUT)}
+        runner_settings = {"job_timeout": job_timeout}
         extra_vars_dict = {
             "variable_host": group_name,
             "ansible_ssh_timeout": settings.QPC_SSH_CONNECT_TIMEOUT,
@@ -290,6 +383,7 @@ def _connect(  # pylint: disable=too-many-arguments
             runner_obj = ansible_runner.run(
                 quiet=quiet_bool,
                 settings=runner_settings,
+                envvars=envvars,
                 inventory=inventory_file,
                 extravars=extra_vars_dict,
                 event_handler=call.event_callback,
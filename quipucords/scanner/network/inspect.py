@@ -29,7 +29,11 @@ from api.vault import write_to_yaml
 from scanner.exceptions import ScanFailureError
 from scanner.network.exceptions import ScannerException
 from scanner.network.inspect_callback import InspectResultCallback
-from scanner.network.utils import check_manager_interrupt, construct_inventory
+from scanner.network.utils import (
+    check_manager_interrupt,
+    construct_inventory,
+    host_scheduling,
+)
 from scanner.task import ScanTaskRunner
 
 # Get an instance of a logger
@@ -189,10 +193,13 @@ class InspectTaskRunner(ScanTaskRunner):
         extra_vars["QPC_FEATURE_FLAGS"] = settings.QPC_FEATURE_FLAGS.as_dict()
         extra_vars["ansible_ssh_timeout"] = settings.QPC_SSH_INSPECT_TIMEOUT
 
+        group_size, job_timeout, envvars = host_scheduling(
+            len(connected), forks, int(settings.NETWORK_INSPECT_JOB_TIMEOUT)
+        )
         group_names, inventory = construct_inventory(
             hosts=connected,
             connection_port=connection_port,
-            concurrency_count=forks,
+            concurrency_count=group_size,
         )
         inventory_file = write_to_yaml(inventory)
 
@@ -213,12 +220,14 @@ class InspectTaskRunner(ScanTaskRunner):
                 f" {(idx + 1):d} of {len(group_names):d}"
             )
             self.scan_task.log_message(log_message)
-            call = InspectResultCallback(self.scan_task, manager_interrupt)
+            call = InspectResultCallback(
+                self.scan_task, manager_interrupt, self.fact_writer, self.stats
+            )
 
             # Build Ansible Runner Parameters
             runner_settings = {
                 "idle_timeout": int(settings.NETWORK_INSPECT_JOB_TIMEOUT),
-                "job_timeout": int(settings.NETWORK_INSPECT_JOB_TIMEOUT),
+                "job_timeout": job_timeout,
                 "pexpect_timeout": 5,
             }
             playbook_path = os.path.join(
@@ -245,6 +254,7 @@ class InspectTaskRunner(ScanTaskRunner):
                 runner_obj = ansible_runner.run(
                     quiet=quiet_bool,
                     settings=runner_settings,
+                    envvars=envvars,
                     inventory=inventory_file,
                     extravars=extra_vars,
                     event_handler=call.event_callback,
@@ -282,6 +292,8 @@ class InspectTaskRunner(ScanTaskRunner):
 
             # Always run this as our scans are more tolerant of errors
             call.finalize_failed_hosts()
+            self.fact_writer.flush()
+            self.stats.flush()
         return error_msg, scan_result
 
     def _obtain_discovery_data(self):
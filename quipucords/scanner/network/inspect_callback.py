@@ -18,9 +18,11 @@ from django.conf import settings
 from django.db import transaction
 
 import log_messages
-from api.models import RawFact, SystemInspectionResult
+from api.models import SystemInspectionResult
+from scanner.fact_writer import FactWriter
 from scanner.network.processing import process
 from scanner.network.utils import STOP_STATES, raw_facts_template
+from scanner.stats import StatsAccumulator
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -41,9 +43,11 @@ class InspectResultCallback:
     """
 
     # pylint: disable=protected-access
-    def __init__(self, scan_task, manager_interrupt):
+    def __init__(self, scan_task, manager_interrupt, fact_writer=None, stats=None):
         """Create result callback."""
         self.scan_task = scan_task
+        self.fact_writer = fact_writer or FactWriter(scan_task)
+        self.stats = stats or StatsAccumulator(scan_task)
         self.source = scan_task.source
         self._ansible_facts = {}
         self.last_role = None
@@ -142,31 +146,21 @@ class InspectResultCallback:
         # Update scan counts
         if self.scan_task is not None:
             if host_status == SystemInspectionResult.SUCCESS:
-                self.scan_task.increment_stats(host, increment_sys_scanned=True)
+                self.stats.increment(host, increment_sys_scanned=True)
             elif host_status == SystemInspectionResult.UNREACHABLE:
-                self.scan_task.increment_stats(host, increment_sys_unreachable=True)
+                self.stats.increment(host, increment_sys_unreachable=True)
             else:
-                self.scan_task.increment_stats(host, increment_sys_failed=True)
-
-        sys_result = SystemInspectionResult(
-            name=host,
-            status=host_status,
-            source=self.scan_task.source,
-            task_inspection_result=self.scan_task.inspection_result,
-        )
-        sys_result.save()
+                self.stats.increment(host, increment_sys_failed=True)
 
         # Generate facts for host
-        for result_key, result_value in results.items():
-            if result_value == process.NO_DATA:
-                result_value = None
-
-            # Convert all values to JSON.  Noop for str, int
-            final_value = json.dumps(result_value)
-            stored_fact = RawFact(
-                name=result_key, value=final_value, system_inspection_result=sys_result
+        # Convert all values to JSON.  Noop for str, int
+        facts = {
+            result_key: json.dumps(
+                None if result_value == process.NO_DATA else result_value
             )
-            stored_fact.save()
+            for result_key, result_value in results.items()
+        }
+        self.fact_writer.add(host, host_status, facts)
 
     @transaction.atomic
     def task_on_unreachable(self, event_dict):
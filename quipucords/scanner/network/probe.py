@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""TCP reachability probe run before attempting Ansible connections."""
+
+import asyncio
+import errno
+import logging
+import resource
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# file descriptors left for the database, log files and Ansible
+RESERVED_FILE_DESCRIPTORS = 128
+# errors caused by the resources of this process or system, not by the host
+LOCAL_RESOURCE_ERRNOS = {
+    errno.EMFILE,
+    errno.ENFILE,
+    errno.ENOBUFS,
+    errno.ENOMEM,
+    errno.EADDRNOTAVAIL,
+}
+
+
+def _max_concurrency(concurrency):
+    """Clamp concurrency below the open file descriptors soft limit."""
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == resource.RLIM_INFINITY:
+        return concurrency
+    return max(min(concurrency, soft_limit - RESERVED_FILE_DESCRIPTORS), 1)
+
+
+async def _is_reachable(host, port, timeout, semaphore):
+    """Check if a TCP connection to host:port can be opened.
+
+    :returns: True or False, or None if the probe failed for local reasons
+    """
+    async with semaphore:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.debug("%s:%s is unreachable: timed out", host, port)
+            return False
+        except OSError as error:
+            if error.errno in LOCAL_RESOURCE_ERRNOS:
+                logger.debug("%s:%s could not be probed: %r", host, port, error)
+                return None
+            logger.debug("%s:%s is unreachable: %r", host, port, error)
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+
+async def _probe(hosts, port, timeout, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(_is_reachable(host, port, timeout, semaphore) for host in hosts)
+    )
+    return dict(zip(hosts, results))
+
+
+def probe_hosts(hosts, port, timeout, concurrency):
+    """Split hosts in reachable, unreachable and inconclusive ones.
+
+    Connections to every host are attempted concurrently, up to concurrency
+    sockets at the same time (less if the open file descriptors limit of the
+    process is lower). Hosts that couldn't be probed because this process or
+    system ran out of resources (file descriptors, buffers, ports) are
+    inconclusive.
+
+    :param hosts: list of host names or ip addresses
+    :param port: TCP port that should accept connections (SSH port)
+    :param timeout: seconds to wait for each connection
+    :param concurrency: max number of connections attempted at the same time
+    :returns: tuple with the lists of reachable, unreachable and inconclusive
+        hosts
+    """
+    hosts = list(hosts)
+    results = asyncio.run(_probe(hosts, port, timeout, _max_concurrency(concurrency)))
+    reachable = [host for host in hosts if results[host]]
+    unreachable = [host for host in hosts if results[host] is False]
+    inconclusive = [host for host in hosts if results[host] is None]
+    if inconclusive:
+        logger.warning(
+            "%d hosts could not be probed for lack of local resources.",
+            len(inconclusive),
+        )
+    return reachable, unreachable, inconclusive
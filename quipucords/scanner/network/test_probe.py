@@ -0,0 +1,97 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the TCP reachability probe."""
+
+import errno
+import resource
+import socket
+
+import pytest
+
+from scanner.network import probe
+from scanner.network.probe import probe_hosts
+
+
+@pytest.fixture
+def listening_port():
+    """Return a local port accepting connections."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        server.listen(100)
+        yield server.getsockname()[1]
+
+
+def test_probe_hosts(listening_port):
+    """Test hosts accepting connections are told apart from the others."""
+    # the server only listens on the IPv4 loopback address
+    reachable, unreachable, inconclusive = probe_hosts(
+        ["::1", "127.0.0.1"], listening_port, 2, 10
+    )
+    assert reachable == ["127.0.0.1"]
+    assert unreachable == ["::1"]
+    assert not inconclusive
+
+
+def test_probe_closed_port():
+    """Test hosts refusing connections are unreachable."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        closed_port = server.getsockname()[1]
+    reachable, unreachable, inconclusive = probe_hosts(
+        ["127.0.0.1"], closed_port, 2, 10
+    )
+    assert not reachable
+    assert unreachable == ["127.0.0.1"]
+    assert not inconclusive
+
+
+def test_probe_concurrency(listening_port):
+    """Test more hosts than the concurrency limit are probed."""
+    hosts = ["127.0.0.1"] * 20
+    reachable, unreachable, inconclusive = probe_hosts(
+        hosts, listening_port, timeout=2, concurrency=3
+    )
+    assert len(reachable) == 20
+    assert not unreachable
+    assert not inconclusive
+
+
+@pytest.mark.parametrize(
+    "soft_limit,concurrency,expected",
+    [
+        (1024, 500, 500),
+        (1024, 1000, 1024 - probe.RESERVED_FILE_DESCRIPTORS),
+        (100, 500, 1),
+        (resource.RLIM_INFINITY, 5000, 5000),
+    ],
+)
+def test_probe_concurrency_file_limit(mocker, soft_limit, concurrency, expected):
+    """Test concurrency is kept below the open file descriptors limit."""
+    mocker.patch.object(
+        probe.resource, "getrlimit", return_value=(soft_limit, resource.RLIM_INFINITY)
+    )
+    # pylint: disable=protected-access
+    assert probe._max_concurrency(concurrency) == expected
+
+
+def test_probe_local_errors(mocker, caplog):
+    """Test hosts failing for lack of local resources are inconclusive."""
+
+    async def open_connection(host, port):
+        if host == "10.0.0.1":
+            raise OSError(errno.EMFILE, "Too many open files")
+        raise OSError(errno.ECONNREFUSED, "Connection refused")
+
+    mocker.patch.object(probe.asyncio, "open_connection", open_connection)
+    reachable, unreachable, inconclusive = probe_hosts(
+        ["10.0.0.1", "10.0.0.2"], 22, 2, 10
+    )
+    assert not reachable
+    assert unreachable == ["10.0.0.2"]
+    assert inconclusive == ["10.0.0.1"]
+    assert "1 hosts could not be probed" in caplog.text
@@ -12,7 +12,7 @@
 
 # pylint: disable=ungrouped-imports
 from multiprocessing import Value
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 from ansible_runner.exceptions import AnsibleRunnerException
 from django.test import TestCase
@@ -39,6 +39,7 @@ class MockResultStore:
         self._remaining_hosts = set(hosts)
         self.succeeded = []
         self.failed = []
+        self.unreachable_hosts = []
 
     def record_result(self, name, source, credential, status):
         """Keep a list of succeeses and failures."""
@@ -46,6 +47,8 @@ class MockResultStore:
             self.succeeded.append((name, source, credential, status))
         elif status == SystemConnectionResult.FAILED:
             self.failed.append((name, source, credential, status))
+        elif status == SystemConnectionResult.UNREACHABLE:
+            self.unreachable_hosts.append(name)
         else:
             raise ValueError()
 
@@ -311,6 +314,66 @@ class NetworkConnectTaskRunnerTest(TestCase):
         )
         self.assertEqual(result, ScanTask.COMPLETED)
 
+    @patch("scanner.network.connect.settings.QPC_NETWORK_PREPROBE", True)
+    @patch("scanner.network.connect._connect")
+    @patch("scanner.network.connect.probe_hosts")
+    def test_connect_runner_preprobe(self, mock_probe, mock_connect):
+        """Test unreachable hosts are recorded before trying credentials."""
+        mock_probe.return_value = (["1.2.3.4"], ["1.2.3.5"], ["1.2.3.6"])
+        mock_connect.return_value = None, ScanTask.COMPLETED
+        scanner = ConnectTaskRunner(self.scan_job, self.scan_task)
+        result_store = MockResultStore(["1.2.3.4", "1.2.3.5", "1.2.3.6"])
+        _, result = scanner.run_with_result_store(
+            Value("i", ScanJob.JOB_RUN), result_store
+        )
+        self.assertEqual(result, ScanTask.COMPLETED)
+        mock_probe.assert_called_once_with(ANY, 22, ANY, ANY)
+        self.assertEqual(
+            sorted(mock_probe.call_args.args[0]), ["1.2.3.4", "1.2.3.5", "1.2.3.6"]
+        )
+        # hosts that couldn't be probed are still tried
+        self.assertEqual(mock_connect.call_args.args[2], ["1.2.3.4", "1.2.3.6"])
+        self.assertEqual(result_store.unreachable_hosts, ["1.2.3.5"])
+
+    @patch("scanner.network.connect.settings.QPC_NETWORK_CREDENTIAL_AFFINITY", True)
+    @patch("scanner.network.connect._connect")
+    def test_connect_runner_credential_affinity(self, mock_connect):
+        """Test hosts are tried first with the credential that worked before."""
+        cred2 = Credential(name="cred2", username="username2", password="password")
+        cred2.save()
+        self.source.credentials.add(cred2)
+        _, previous_task = create_scan_job(
+            self.source, ScanTask.SCAN_TYPE_CONNECT, "previous"
+        )
+        SystemConnectionResult(
+            name="1.2.3.4",
+            source=self.source,
+            credential=cred2,
+            status=SystemConnectionResult.SUCCESS,
+            task_connection_result=previous_task.connection_result,
+        ).save()
+
+        mock_connect.return_value = None, ScanTask.COMPLETED
+        scanner = ConnectTaskRunner(self.scan_job, self.scan_task)
+        result_store = MockResultStore(["1.2.3.4", "1.2.3.6"])
+        _, result = scanner.run_with_result_store(
+            Value("i", ScanJob.JOB_RUN), result_store
+        )
+        self.assertEqual(result, ScanTask.COMPLETED)
+        attempts = [
+            (call.args[4].name, sorted(call.args[2]))
+            for call in mock_connect.call_args_list
+        ]
+        self.assertEqual(
+            attempts,
+            [
+                ("cred2", ["1.2.3.4"]),
+                ("cred1", ["1.2.3.4", "1.2.3.6"]),
+                # 1.2.3.4 already failed with cred2
+                ("cred2", ["1.2.3.6"]),
+            ],
+        )
+
     # Similar tests as above modified for source2 (Does not have exclude hosts)
     def test_result_store_src2(self):
         """Test ConnectResultStore."""
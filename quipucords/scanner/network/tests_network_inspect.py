@@ -112,14 +112,15 @@ class NetworkInspectScannerTest(TestCase):
             "all": {
                 "children": {
                     "group_0": {
-                        "hosts": {
-                            "1.2.3.4": {
-                                "ansible_user": "username",
-                                "ansible_ssh_pass": "password",
-                                "ansible_host": "1.2.3.4",
-                            }
-                        }
-                    }
+                        "hosts": {"1.2.3.4": {"ansible_host": "1.2.3.4"}},
+                    },
+                    "credential_0": {
+                        "hosts": {"1.2.3.4": {}},
+                        "vars": {
+                            "ansible_user": "username",
+                            "ansible_ssh_pass": "password",
+                        },
+                    },
                 },
                 "vars": {"ansible_port": 22},
             }
@@ -127,7 +128,8 @@ class NetworkInspectScannerTest(TestCase):
 
         self.assertEqual(inventory_dict[1], expected)
 
-    def test_scan_inventory_grouping(self):
+    @patch("scanner.network.utils.decrypt_data_as_unicode", return_value="password")
+    def test_scan_inventory_grouping(self, mock_decrypt):
         """Test construct ansible inventory dictionary."""
         serializer = SourceSerializer(self.source)
         source = serializer.data
@@ -147,41 +149,21 @@ class NetworkInspectScannerTest(TestCase):
         expected = {
             "all": {
                 "children": {
-                    "group_0": {
-                        "hosts": {
-                            "1.2.3.1": {
-                                "ansible_user": "username",
-                                "ansible_ssh_pass": "password",
-                                "ansible_host": "1.2.3.1",
-                            }
-                        }
-                    },
-                    "group_1": {
-                        "hosts": {
-                            "1.2.3.2": {
-                                "ansible_user": "username",
-                                "ansible_ssh_pass": "password",
-                                "ansible_host": "1.2.3.2",
-                            }
-                        }
-                    },
-                    "group_2": {
-                        "hosts": {
-                            "1.2.3.3": {
-                                "ansible_user": "username",
-                                "ansible_ssh_pass": "password",
-                                "ansible_host": "1.2.3.3",
-                            }
-                        }
-                    },
-                    "group_3": {
+                    "group_0": {"hosts": {"1.2.3.1": {"ansible_host": "1.2.3.1"}}},
+                    "group_1": {"hosts": {"1.2.3.2": {"ansible_host": "1.2.3.2"}}},
+                    "group_2": {"hosts": {"1.2.3.3": {"ansible_host": "1.2.3.3"}}},
+                    "group_3": {"hosts": {"1.2.3.4": {"ansible_host": "1.2.3.4"}}},
+                    "credential_0": {
                         "hosts": {
-                            "1.2.3.4": {
-                                "ansible_user": "username",
-                                "ansible_ssh_pass": "password",
-                                "ansible_host": "1.2.3.4",
-                            }
-                        }
+                            "1.2.3.1": {},
+                            "1.2.3.2": {},
+                            "1.2.3.3": {},
+                            "1.2.3.4": {},
+                        },
+                        "vars": {
+                            "ansible_user": "username",
+                            "ansible_ssh_pass": "password",
+                        },
                     },
                 },
                 "vars": {"ansible_port": 22},
@@ -189,6 +171,8 @@ class NetworkInspectScannerTest(TestCase):
         }
 
         self.assertEqual(inventory_dict[1], expected)
+        # the shared credential is decrypted once
+        mock_decrypt.assert_called_once()
 
     @patch("ansible_runner.run")
     def test_inspect_scan_failure(self, mock_run):
@@ -341,6 +325,20 @@ class NetworkInspectScannerTest(TestCase):
                 Value("i", ScanJob.JOB_TERMINATE_PAUSE), self.host_list
             )
 
+    @patch("ansible_runner.run")
+    @patch("scanner.network.inspect.settings.QPC_NETWORK_ROLLING_SCHEDULER", True)
+    def test_rolling_scheduler(self, mock_run):
+        """Test all hosts are inspected in a single ansible run."""
+        mock_run.return_value.status = "successful"
+        hosts = [(f"1.2.3.{index}", self.cred_data) for index in range(120)]
+        scanner = InspectTaskRunner(self.scan_job, self.scan_task)
+        scanner._inspect_scan(Value("i", ScanJob.JOB_RUN), hosts)
+        mock_run.assert_called_once()
+        kwargs = mock_run.call_args.kwargs
+        self.assertEqual(kwargs["envvars"], {"ANSIBLE_STRATEGY": "free"})
+        self.assertIn("--forks=25", kwargs["cmdline"])
+        self.assertEqual(kwargs["extravars"]["variable_host"], "group_0")
+
     @patch("ansible_runner.run")
     @patch("scanner.network.inspect.settings.ANSIBLE_LOG_LEVEL", "1")
     def test_modifying_log_level(self, mock_run):
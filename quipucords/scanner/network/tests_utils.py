@@ -13,6 +13,8 @@
 import unittest
 from unittest import mock
 
+import pytest
+
 from scanner.network import utils
 
 
@@ -85,3 +87,17 @@ def test_raw_facts_template():
     assert template[fact] is None
     template[fact] = 1
     assert utils.raw_facts_template()[fact] is None
+
+
+@pytest.mark.parametrize(
+    "rolling,host_count,expected",
+    [
+        (False, 120, (50, 600, None)),
+        (True, 120, (120, 1800, {"ANSIBLE_STRATEGY": "free"})),
+        (True, 0, (1, 600, {"ANSIBLE_STRATEGY": "free"})),
+    ],
+)
+def test_host_scheduling(settings, rolling, host_count, expected):
+    """Test batch and rolling host scheduling."""
+    settings.QPC_NETWORK_ROLLING_SCHEDULER = rolling
+    assert utils.host_scheduling(host_count, 50, 600) == expected
@@ -10,6 +10,7 @@
 #
 """Scanner used for host connection discovery."""
 
+import math
 from functools import cache
 
 import yaml
@@ -77,6 +78,28 @@ def _construct_vars(connection_port, credential=None):
     return ansible_vars
 
 
+def host_scheduling(host_count, forks, job_timeout):
+    """Define how hosts are scheduled in Ansible runs.
+
+    By default hosts are split in groups of forks hosts and each group runs
+    after the previous one is done, waiting for its slowest host. With
+    QPC_NETWORK_ROLLING_SCHEDULER all hosts are placed in a single group run
+    with Ansible's free strategy, which keeps forks hosts in flight and
+    starts the next host as soon as one is done.
+
+    :param host_count: number of hosts to scan
+    :param forks: max number of hosts scanned at the same time
+    :param job_timeout: timeout of an Ansible run for a group of forks hosts
+    :returns: tuple with the inventory group size, the Ansible run timeout
+        and the environment variables for ansible_runner
+    """
+    if not settings.QPC_NETWORK_ROLLING_SCHEDULER:
+        return forks, job_timeout, None
+    # keep the timeout the groups would have had in total
+    group_count = max(math.ceil(host_count / forks), 1)
+    return max(host_count, 1), job_timeout * group_count, {"ANSIBLE_STRATEGY": "free"}
+
+
 def construct_inventory(
     hosts,
     connection_port,
@@ -87,6 +110,10 @@ def construct_inventory(
 ):
     """Create a dictionary inventory for Ansible to execute with.
 
+    Hosts given as host/credential tuples are also added to a group per
+    credential holding the credential variables, so each credential is
+    decrypted and written to the inventory only once.
+
     :param hosts: The collection of hosts (or hosts/credential tuples)
     :param credential: The credential used for connections
     :param connection_port: The connection port
@@ -104,30 +131,44 @@ def construct_inventory(
     children = {}
     group_names = []
     inventory = {"all": {"children": children, "vars": vars_dict}}
+    credential_groups = {}
     for index, group in enumerate(concurreny_groups):
         group_name = f"group_{index}"
         group_names.append(group_name)
-        children[group_name] = {"hosts": _format_hosts_dict(group)}
+        children[group_name] = {"hosts": _format_hosts_dict(group, credential_groups)}
+    # credential groups only hold variables; playbooks target group_names
+    for credential_group_name, credential_group in credential_groups.values():
+        children[credential_group_name] = credential_group
     return group_names, inventory
 
 
-def _format_hosts_dict(group) -> dict:
+def _format_hosts_dict(group, credential_groups) -> dict:
     hosts_dict = {}
     for host in group:
-        host_name, host_vars = _get_host_vars(host)
-        hosts_dict[host_name] = host_vars
+        if not isinstance(host, str):
+            # if its not str, we assume it's a tuple host/credentials
+            host, credential = host
+            _, credential_group = _get_credential_group(credential, credential_groups)
+            credential_group["hosts"][host] = {}
+        hosts_dict[host] = {"ansible_host": host}
     return hosts_dict
 
 
-def _get_host_vars(host):
-    if not isinstance(host, str):
-        # if its not str, we assume it's a tuple host/credentials
-        host, credentials = host
-        host_vars = _credential_vars(credentials)
-    else:
-        host_vars = {}
-    host_vars["ansible_host"] = host
-    return host, host_vars
+def _get_credential_group(credential, credential_groups):
+    """Return the inventory group holding the variables of credential.
+
+    :param credential: The credential (as serialized data)
+    :param credential_groups: dict mapping credential ids to their
+        (group name, group) tuples, filled as credentials are found.
+    """
+    credential_key = credential.get("id", credential.get("name"))
+    if credential_key not in credential_groups:
+        group_name = f"credential_{len(credential_groups)}"
+        credential_groups[credential_key] = (
+            group_name,
+            {"hosts": {}, "vars": _credential_vars(credential)},
+        )
+    return credential_groups[credential_key]
 
 
 def expand_hostpattern(hostpattern):
@@ -88,7 +88,7 @@ class ConnectTaskRunner(OpenShiftTaskRunner):
             task_connection_result=self.scan_task.connection_result,
         )
         sys_result.save()
-        self.scan_task.increment_stats("UPDATED OCP CONNECT STATS.", **increment_kwargs)
+        self.stats.increment("UPDATED OCP CONNECT STATS.", **increment_kwargs)
 
     def _get_increment_kwargs(self, conn_result):
         return {
@@ -15,9 +15,9 @@ import json
 from django.conf import settings
 from django.db import transaction
 
-from api.models import RawFact, ScanTask, SystemInspectionResult
+from api.models import ScanTask, SystemInspectionResult
 from scanner.exceptions import ScanFailureError
-from scanner.openshift.entities import OCPBaseEntity, OCPCluster, OCPError, OCPNode
+from scanner.openshift.entities import OCPCluster, OCPError, OCPNode
 from scanner.openshift.task import OpenShiftTaskRunner
 
 
@@ -103,67 +103,34 @@ class InspectTaskRunner(OpenShiftTaskRunner):
     def _save_cluster(self, cluster: OCPCluster, cluster_facts):
         system_result = self._persist_cluster_facts(cluster, cluster_facts)
         increment_kwargs = self._get_increment_kwargs(system_result.status)
-        self.scan_task.increment_stats(cluster.name, **increment_kwargs)
+        self.stats.increment(cluster.name, **increment_kwargs)
 
     @transaction.atomic
     def _save_node(self, node: OCPNode):
         system_result = self._persist_facts(node)
         increment_kwargs = self._get_increment_kwargs(system_result.status)
-        self.scan_task.increment_stats(node.name, **increment_kwargs)
+        self.stats.increment(node.name, **increment_kwargs)
 
     def _persist_cluster_facts(self, cluster, other_facts):
         inspection_status = self._infer_inspection_status(cluster)
-        system_result = SystemInspectionResult(
-            name=cluster.name,
-            status=inspection_status,
-            source=self.scan_task.source,
-            task_inspection_result=self.scan_task.inspection_result,
-        )
-        system_result.save()
-        raw_fact = self._entity_as_raw_fact(cluster, system_result)
-        raw_fact.save()
-        other_raw_facts = self._entities_as_raw_facts(system_result, other_facts)
-        RawFact.objects.bulk_create(other_raw_facts)
-        return system_result
+        raw_facts = {cluster.kind: cluster.json()}
+        raw_facts.update(self._entities_as_raw_facts(other_facts))
+        return self.fact_writer.add(cluster.name, inspection_status, raw_facts)
 
     def _persist_facts(self, node: OCPNode) -> SystemInspectionResult:
         inspection_status = self._infer_inspection_status(node)
-        sys_result = SystemInspectionResult(
-            name=node.name,
-            status=inspection_status,
-            source=self.scan_task.source,
-            task_inspection_result=self.scan_task.inspection_result,
-        )
-        sys_result.save()
-        raw_fact = self._entity_as_raw_fact(node, sys_result)
-        raw_fact.save()
-        return sys_result
-
-    def _entity_as_raw_fact(
-        self, entity: OCPBaseEntity, inspection_result: SystemInspectionResult
-    ) -> RawFact:
-        return RawFact(
-            name=entity.kind,
-            value=entity.json(),
-            system_inspection_result=inspection_result,
+        return self.fact_writer.add(
+            node.name, inspection_status, {node.kind: node.json()}
         )
 
-    def _entities_as_raw_facts(
-        self, inspection_result: SystemInspectionResult, entities: dict
-    ) -> list[RawFact]:
+    def _entities_as_raw_facts(self, entities: dict) -> dict[str, str]:
         def _pydantic_encoder(value):
             return value.dict()
 
-        raw_fact_list = []
-        for collection_name, entity in entities.items():
-            raw_fact = RawFact(
-                name=collection_name,
-                value=json.dumps(entity, default=_pydantic_encoder),
-                system_inspection_result=inspection_result,
-            )
-            raw_fact_list.append(raw_fact)
-
-        return raw_fact_list
+        return {
+            collection_name: json.dumps(entity, default=_pydantic_encoder)
+            for collection_name, entity in entities.items()
+        }
 
     def _infer_inspection_status(self, entity):
         if entity.errors:
@@ -15,13 +15,14 @@ import logging
 from django.db import transaction
 
 from api.models import (
-    RawFact,
     ScanOptions,
     ScanTask,
     SystemConnectionResult,
     SystemInspectionResult,
 )
 from scanner.exceptions import ScanCancelException, ScanPauseException
+from scanner.fact_writer import FactWriter
+from scanner.stats import StatsAccumulator
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -64,6 +65,9 @@ class SatelliteInterface:
             self.connect_scan_task = scan_task.prerequisites.first()
             self.inspect_scan_task = scan_task
         self.source = scan_task.source
+        self.fact_writer = FactWriter(self.inspect_scan_task)
+        self.connect_stats = StatsAccumulator(self.connect_scan_task)
+        self.inspect_stats = StatsAccumulator(self.inspect_scan_task)
 
     @transaction.atomic
     def record_conn_result(self, name, credential):
@@ -81,7 +85,7 @@ class SatelliteInterface:
         )
         sys_result.save()
 
-        self.connect_scan_task.increment_stats(name, increment_sys_scanned=True)
+        self.connect_stats.increment(name, increment_sys_scanned=True)
 
     @transaction.atomic
     def record_inspect_result(self, name, facts, status=SystemInspectionResult.SUCCESS):
@@ -91,29 +95,25 @@ class SatelliteInterface:
         :param facts: The dictionary of facts
         :param status: The status of the inspection
         """
-        sys_result = SystemInspectionResult(
-            name=name,
-            source=self.source,
-            status=status,
-            task_inspection_result=self.inspect_scan_task.inspection_result,
-        )
-        sys_result.save()
-
+        raw_facts = {}
         if status == SystemInspectionResult.SUCCESS:
-            for key, val in facts.items():
-                if val is not None:
-                    final_value = json.dumps(val)
-                    stored_fact = RawFact(
-                        name=key, value=final_value, system_inspection_result=sys_result
-                    )
-                    stored_fact.save()
+            raw_facts = {
+                key: json.dumps(val) for key, val in facts.items() if val is not None
+            }
+        self.fact_writer.add(name, status, raw_facts)
 
         if status == SystemInspectionResult.SUCCESS:
-            self.inspect_scan_task.increment_stats(name, increment_sys_scanned=True)
+            self.inspect_stats.increment(name, increment_sys_scanned=True)
         elif status == SystemInspectionResult.UNREACHABLE:
-            self.inspect_scan_task.increment_stats(name, increment_sys_unreachable=True)
+            self.inspect_stats.increment(name, increment_sys_unreachable=True)
         else:
-            self.inspect_scan_task.increment_stats(name, increment_sys_failed=True)
+            self.inspect_stats.increment(name, increment_sys_failed=True)
+
+    def flush(self):
+        """Save buffered inspection results and scan stats."""
+        self.fact_writer.flush()
+        self.connect_stats.flush()
+        self.inspect_stats.flush()
 
     def host_count(self):
         """Obtain the count of managed hosts."""
@@ -0,0 +1,424 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Fixtures for Satellite tests against local fake Satellite 5 and 6 APIs."""
+
+import datetime
+import json
+import re
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+from xmlrpc.client import Fault
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from api.models import (
+    Credential,
+    ScanOptions,
+    ScanTask,
+    Source,
+    SourceOptions,
+    SystemConnectionResult,
+)
+from scanner.satellite.five import SatelliteFive
+from scanner.satellite.six import SatelliteSixV2
+from scanner.test_util import create_scan_job
+
+HOSTS_PATH = "/api/v2/hosts"
+
+
+def write_certificate(tmp_path):
+    """Write a self-signed certificate for localhost and return its files."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = tmp_path / "cert.pem"
+    cert_file.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_file = tmp_path / "key.pem"
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_file, key_file
+
+
+class SatelliteHandler(BaseHTTPRequestHandler):
+    """Answer Satellite 6 API v2 host requests."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request."""
+        self.server.requests.append(self.path)
+        path = self.path.split("?")[0]
+        if path == HOSTS_PATH:
+            with self.server.pages_changed:
+                self.server.pages_in_flight += 1
+                self.server.max_pages_in_flight = max(
+                    self.server.max_pages_in_flight, self.server.pages_in_flight
+                )
+                self.server.pages_changed.notify_all()
+                if self.server.page_number(self.path) > 1:
+                    self.server.pages_changed.wait_for(
+                        lambda: self.server.max_pages_in_flight
+                        >= self.server.hold_pages,
+                        timeout=5,
+                    )
+                self.server.pages_in_flight -= 1
+            body = {
+                "total": self.server.hosts,
+                "per_page": self.server.per_page,
+                "results": [
+                    {"id": host_id, "name": f"sys{host_id}"}
+                    for host_id in self.server.page_hosts(self.path)
+                ],
+            }
+        elif re.fullmatch(rf"{HOSTS_PATH}/\d+/subscriptions", path):
+            body = {"results": []}
+        else:
+            host_id = int(path.rsplit("/")[-1])
+            time.sleep(self.server.host_delays.get(host_id, 0))
+            body = {"name": f"sys{host_id}"}
+        encoded = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Don't log requests."""
+
+
+class SatelliteServer(ThreadingHTTPServer):
+    """Local TLS server counting the connections and requests it gets.
+
+    It lists hosts ids 0 to hosts - 1 in pages of per_page hosts, and waits
+    host_delays[host_id] seconds before answering the fields of a host. It
+    tracks the max number of pages requested at the same time, holding the
+    pages after the first until hold_pages of them were requested at the same
+    time.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, ssl_context):
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), SatelliteHandler)
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.requests = []
+        self.hosts = 12
+        self.per_page = 100
+        self.hold_pages = 0
+        self.pages_changed = threading.Condition()
+        self.pages_in_flight = 0
+        self.max_pages_in_flight = 0
+        self.host_delays = {}
+
+    @property
+    def port(self):
+        """Return the port the server listens on."""
+        return self.server_address[1]
+
+    @staticmethod
+    def page_number(path):
+        """Return the number of the page requested by path."""
+        return int(re.search(r"[?&]page=(\d+)", path).group(1))
+
+    def page_hosts(self, path):
+        """Return the host ids of the page requested by path."""
+        page = self.page_number(path)
+        start = (page - 1) * self.per_page
+        return range(start, min(start + self.per_page, self.hosts))
+
+    def get_request(self):
+        """Accept a TLS connection."""
+        sock, address = super().get_request()
+        self.connections += 1
+        return self.ssl_context.wrap_socket(sock, server_side=True), address
+
+
+@pytest.fixture
+def satellite_server(tmp_path):
+    """Run a local Satellite 6 stand-in server."""
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(*write_certificate(tmp_path))
+    server = SatelliteServer(ssl_context)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def create_satellite_api(api_class, port, hosts, max_concurrency):
+    """Create an api_class inspecting the server on port with hosts connected.
+
+    Callers need database access.
+    """
+    credential = Credential.objects.create(
+        name="cred",
+        cred_type=Credential.SATELLITE_CRED_TYPE,
+        username="username",
+        password="password",
+    )
+    source = Source.objects.create(
+        name="source",
+        source_type=Source.SATELLITE_SOURCE_TYPE,
+        port=port,
+        hosts='["127.0.0.1"]',
+        options=SourceOptions.objects.create(ssl_cert_verify=False),
+    )
+    source.credentials.add(credential)
+    scan_options = ScanOptions.objects.create(max_concurrency=max_concurrency)
+    scan_job, scan_task = create_scan_job(
+        source, ScanTask.SCAN_TYPE_INSPECT, scan_options=scan_options
+    )
+    api = api_class(scan_job, scan_task)
+    for host_id in range(hosts):
+        SystemConnectionResult.objects.create(
+            name=f"sys{host_id}_{host_id}",
+            status=SystemConnectionResult.SUCCESS,
+            task_connection_result=api.connect_scan_task.connection_result,
+        )
+    return api
+
+
+@pytest.fixture
+def satellite_api(satellite_server):
+    """Return a function creating a SatelliteSixV2 inspecting satellite_server.
+
+    Tests using it need database access.
+    """
+
+    def create_api(max_concurrency=2):
+        return create_satellite_api(
+            SatelliteSixV2,
+            satellite_server.port,
+            satellite_server.hosts,
+            max_concurrency,
+        )
+
+    return create_api
+
+
+class Satellite5Handler(SimpleXMLRPCRequestHandler):
+    """Answer Satellite 5 XML-RPC requests."""
+
+    rpc_paths = ("/rpc/api",)
+
+
+class Satellite5Server(ThreadingMixIn, SimpleXMLRPCServer):
+    """Local TLS XML-RPC server answering like Satellite 5.
+
+    It lists hosts ids 0 to hosts - 1, groups calls in system.multicall
+    unless multicall is False, and counts the requests and calls it gets.
+    Session keys given before expire_sessions and unknown hosts are refused.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, ssl_context):
+        """Listen on a free local port."""
+        super().__init__(
+            ("127.0.0.1", 0),
+            requestHandler=Satellite5Handler,
+            logRequests=False,
+            allow_none=True,
+        )
+        self.ssl_context = ssl_context
+        self.hosts = 12
+        self.multicall = True
+        self.requests = 0
+        self.calls = []
+        self.sessions = set()
+        self.register_multicall_functions()
+        self.register_instance(Satellite5Methods(self), allow_dotted_names=True)
+
+    @property
+    def port(self):
+        """Return the port the server listens on."""
+        return self.server_address[1]
+
+    def expire_sessions(self):
+        """Refuse the session keys given so far."""
+        self.sessions.clear()
+
+    def get_request(self):
+        """Accept a TLS connection."""
+        sock, address = super().get_request()
+        return self.ssl_context.wrap_socket(sock, server_side=True), address
+
+    def _marshaled_dispatch(self, data, dispatch_method=None, path=None):
+        """Count a request."""
+        self.requests += 1
+        return super()._marshaled_dispatch(data, dispatch_method, path)
+
+    def _dispatch(self, method, params):
+        """Count a call, refusing multicalls unless supported."""
+        self.calls.append(method)
+        if method == "system.multicall" and not self.multicall:
+            raise Fault(-32601, f'method "{method}" is not supported')
+        return super()._dispatch(method, params)
+
+
+class Satellite5Methods:
+    """Satellite 5 XML-RPC methods answered by Satellite5Server."""
+
+    def __init__(self, server):
+        """Initialize Satellite5Methods."""
+        self.auth = Satellite5Auth(server)
+        self.system = Satellite5System(server)
+
+
+class Satellite5Auth:
+    """Satellite 5 auth methods."""
+
+    def __init__(self, server):
+        """Initialize Satellite5Auth."""
+        self.server = server
+
+    def login(self, user, password):  # pylint: disable=unused-argument
+        """Return a new session key."""
+        key = f"key{len(self.server.calls)}"
+        self.server.sessions.add(key)
+        return key
+
+    def logout(self, key):
+        """Forget a session key."""
+        self.server.sessions.discard(key)
+        return 1
+
+
+class Satellite5System:
+    """Satellite 5 system methods, checking their session key."""
+
+    def __init__(self, server):
+        """Initialize Satellite5System."""
+        self.server = server
+
+    def _check(self, key, host_id=None):
+        """Refuse unknown session keys and hosts."""
+        if key not in self.server.sessions:
+            raise Fault(2950, "Either the password or username is incorrect.")
+        if host_id is not None and host_id not in range(self.server.hosts):
+            raise Fault(-210, f"No such system - sid = {host_id}")
+
+    def list_user_systems(self, key):
+        """List the hosts."""
+        self._check(key)
+        return [
+            {"id": host_id, "name": f"sys{host_id}", "last_checkin": "20230101"}
+            for host_id in range(self.server.hosts)
+        ]
+
+    def list_virtual_hosts(self, key):
+        """List no virtual hosts."""
+        self._check(key)
+        return []
+
+    def list_physical_systems(self, key):
+        """List every host as physical."""
+        return self.list_user_systems(key)
+
+    def get_uuid(self, key, host_id):
+        """Return the uuid of a host."""
+        self._check(key, host_id)
+        return f"uuid{host_id}"
+
+    def get_cpu(self, key, host_id):
+        """Return the cpu of a host."""
+        self._check(key, host_id)
+        return {"arch": "x86_64", "count": 2, "socket_count": 1}
+
+    def get_details(self, key, host_id):
+        """Return the details of a host."""
+        self._check(key, host_id)
+        return {"hostname": f"sys{host_id}.example.com", "release": "7Server"}
+
+    def get_running_kernel(self, key, host_id):
+        """Return the kernel of a host."""
+        self._check(key, host_id)
+        return "3.10.0"
+
+    def get_entitlements(self, key, host_id):
+        """Return the entitlements of a host."""
+        self._check(key, host_id)
+        return ["enterprise_entitled"]
+
+    def get_network_devices(self, key, host_id):
+        """Return the network devices of a host."""
+        self._check(key, host_id)
+        return [
+            {
+                "interface": "eth0",
+                "ip": f"10.0.0.{host_id}",
+                "hardware_address": f"00:00:00:00:00:{host_id:02x}",
+            }
+        ]
+
+    def get_registration_date(self, key, host_id):
+        """Return the registration date of a host."""
+        self._check(key, host_id)
+        return "20220101"
+
+
+@pytest.fixture
+def satellite5_server(tmp_path):
+    """Run a local Satellite 5 stand-in server."""
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(*write_certificate(tmp_path))
+    server = Satellite5Server(ssl_context)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def satellite5_api(satellite5_server):
+    """Return a function creating a SatelliteFive inspecting satellite5_server.
+
+    Tests using it need database access.
+    """
+
+    def create_api(max_concurrency=2):
+        return create_satellite_api(
+            SatelliteFive,
+            satellite5_server.port,
+            satellite5_server.hosts,
+            max_concurrency,
+        )
+
+    return create_api
@@ -12,6 +12,7 @@
 import logging
 import xmlrpc.client
 from multiprocessing import Pool
+from multiprocessing.util import Finalize
 
 from api.models import ScanJob, SystemInspectionResult
 from scanner.satellite import utils
@@ -61,13 +62,127 @@ VIRTUAL_HOST_NAME = "virtual_host_name"
 HYPERVISOR = "hypervisor"
 
 
-# pylint: disable=too-many-locals,too-many-branches,too-many-statements
+# Fault code of calls made with an unknown or expired session key
+INVALID_SESSION_FAULT_CODE = 2950
+
+# Calls made to gather the details of a host, with the key their result is
+# kept under
+HOST_DETAILS_CALLS = [
+    ("uuid", "system.get_uuid"),
+    ("cpu", "system.get_cpu"),
+    ("system_details", "system.get_details"),
+    ("kernel", "system.get_running_kernel"),
+    ("subs", "system.get_entitlements"),
+    ("network_devices", "system.get_network_devices"),
+    ("registration_date", "system.get_registration_date"),
+]
+
+
+class Satellite5Session:
+    """Authenticated Satellite 5 XML-RPC session reused across calls.
+
+    The calls made together are grouped in a single system.multicall request
+    when the server supports it, and made one by one otherwise.
+    """
+
+    def __init__(self, scan_task, request_options):
+        """Initialize Satellite5Session.
+
+        :param scan_task: The current scan task
+        :param request_options: A dictionary containing the host, port,
+            user, and password for the source
+        """
+        self.client, self.user, self.password = utils.get_sat5_client(
+            scan_task, request_options
+        )
+        self.key = None
+        self.multicall_supported = True
+
+    def login(self):
+        """Log in unless already logged in.
+
+        :returns: The session key
+        """
+        if self.key is None:
+            self.key = self.client.auth.login(self.user, self.password)
+        return self.key
+
+    def logout(self):
+        """Log out if logged in."""
+        if self.key is not None:
+            key, self.key = self.key, None
+            try:
+                self.client.auth.logout(key)
+            except (xmlrpc.client.Error, OSError) as error:
+                logger.debug("Satellite 5 logout failed: %s", error)
+
+    def call(self, calls):
+        """Make calls with the session key, logging in again if it expired.
+
+        A fault of any of the calls is raised, unless the session expired.
+
+        :param calls: A list of (method name, params) tuples
+        :returns: The list of the results of calls
+        """
+        logged_in = self.key is not None
+        key = self.login()
+        try:
+            return self._call(key, calls)
+        except xmlrpc.client.Fault as xml_error:
+            if not logged_in or xml_error.faultCode != INVALID_SESSION_FAULT_CODE:
+                raise
+        # the session expired since it was last used
+        self.logout()
+        return self._call(self.login(), calls)
+
+    def _call(self, key, calls):
+        """Make calls with key, grouped in a multicall if supported."""
+        if self.multicall_supported:
+            multicall = xmlrpc.client.MultiCall(self.client)
+            for method, params in calls:
+                get_method(multicall, method)(key, *params)
+            try:
+                results = multicall()
+            except xmlrpc.client.Fault as xml_error:
+                logger.debug("Satellite 5 multicall not supported: %s", xml_error)
+                self.multicall_supported = False
+            else:
+                return list(results)
+        return [
+            get_method(self.client, method)(key, *params) for method, params in calls
+        ]
+
+
+def get_method(client, method):
+    """Return the XML-RPC method of client named method, like system.get_cpu."""
+    for name in method.split("."):
+        client = getattr(client, name)
+    return client
+
+
+# XML-RPC session used by this Pool worker process to request host details
+_worker_session = None
+
+
+def _init_host_details_worker(scan_task, request_options):
+    """Create the session of a host details worker process.
+
+    The session is logged out when the worker process exits.
+    """
+    global _worker_session  # pylint: disable=global-statement
+    _worker_session = Satellite5Session(scan_task, request_options)
+    Finalize(_worker_session, _worker_session.logout, exitpriority=10)
+
+
 # pylint: disable=too-many-arguments
 def request_host_details(
     host_id, host_name, last_checkin, scan_task, request_options, logging_options
 ):
     """Execute http responses to gather satellite data.
 
+    The worker process session is used if any, otherwise a session is
+    created and logged out for this host.
+
     :param host_id: The identifier of the host
     :param host_name: The name of the host
     :param last_checkin: The date of last checkin
@@ -79,35 +194,27 @@ def request_host_details(
     """
     unique_name = f"{host_name}_{host_id}"
     results = raw_facts_template()
-    client, user, password = utils.get_sat5_client(scan_task, request_options)
+    session = _worker_session
+    if session is None:
+        session = Satellite5Session(scan_task, request_options)
     try:
         message = f"REQUESTING HOST DETAILS: {unique_name}%s"
         scan_task.log_message(message, logging.INFO, logging_options)
 
-        key = client.auth.login(user, password)
-        uuid = client.system.get_uuid(key, host_id)
-        cpu = client.system.get_cpu(key, host_id)
-        system_details = client.system.get_details(key, host_id)
-        kernel = client.system.get_running_kernel(key, host_id)
-        subs = client.system.get_entitlements(key, host_id)
-
-        network_devices = client.system.get_network_devices(key, host_id)
-        registration_date = client.system.get_registration_date(key, host_id)
-
-        client.auth.logout(key)
+        details = session.call(
+            [(method, (host_id,)) for _, method in HOST_DETAILS_CALLS]
+        )
         system_inspection_result = SystemInspectionResult.SUCCESS
-        results["uuid"] = uuid
-        results["cpu"] = cpu
-        results["system_details"] = system_details
-        results["kernel"] = kernel
-        results["subs"] = subs
-        results["network_devices"] = network_devices
-        results["registration_date"] = registration_date
+        for (result_key, _), detail in zip(HOST_DETAILS_CALLS, details):
+            results[result_key] = detail
 
     except xmlrpc.client.Fault as xml_error:
         error_message = f"Satellite 5 fault error encountered: {xml_error}\n"
         logger.error(error_message)
         system_inspection_result = SystemInspectionResult.FAILED
+    finally:
+        if session is not _worker_session:
+            session.logout()
 
     results["host_name"] = host_name
     results["host_id"] = host_id
@@ -304,6 +411,7 @@ class SatelliteFive(SatelliteInterface):
                 self.record_inspect_result(
                     result.get("name"), result.get("details"), result.get("status")
                 )
+        self.flush()
 
     def virtual_guests(self, virtual_host_id):
         """Obtain the virtual guest information for a virtual host.
@@ -404,7 +512,12 @@ class SatelliteFive(SatelliteInterface):
         hosts_before_dedup = []
         deduplicated_hosts = []
         client, user, password = utils.get_sat5_client(self.inspect_scan_task)
-        with Pool(processes=self.max_concurrency) as pool:
+        request_options = utils.get_request_options(self.inspect_scan_task)
+        with Pool(
+            processes=self.max_concurrency,
+            initializer=_init_host_details_worker,
+            initargs=(self.inspect_scan_task, request_options),
+        ) as pool:
             try:
                 key = client.auth.login(user, password)
                 hosts_before_dedup = client.system.list_user_systems(key)
@@ -434,5 +547,8 @@ class SatelliteFive(SatelliteInterface):
                 self.process_results(
                     results, virtual_hosts, virtual_guests, physical_hosts
                 )
+            # let the workers log out of their session
+            pool.close()
+            pool.join()
 
         utils.validate_task_stats(self.inspect_scan_task)
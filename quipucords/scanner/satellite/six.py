@@ -11,12 +11,20 @@
 """Satellite 6 API handlers."""
 
 import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from multiprocessing import Pool
 
 import requests
 from requests.exceptions import Timeout
 
 from api.models import ScanJob, SystemInspectionResult
+from quipucords import settings
 from scanner.satellite import utils
 from scanner.satellite.api import (
     SatelliteCancelException,
@@ -265,6 +273,16 @@ def host_subscriptions(response):
     return subs_dict
 
 
+# HTTP session used by this Pool worker process to request host details
+_worker_session = None
+
+
+def _init_host_details_worker():
+    """Create the session of a host details worker process."""
+    global _worker_session  # pylint: disable=global-statement
+    _worker_session = utils.create_session()
+
+
 # pylint: disable=too-many-arguments
 def request_host_details(
     scan_task,
@@ -303,6 +321,7 @@ def request_host_details(
             host_id=host_id,
             query_params=QUERY_PARAMS_FIELDS,
             options=request_options,
+            session=_worker_session,
         )
         # pylint: disable=no-member
         if host_fields_response.status_code != requests.codes.ok:
@@ -316,6 +335,7 @@ def request_host_details(
             org_id=None,
             host_id=host_id,
             options=request_options,
+            session=_worker_session,
         )
         # pylint: disable=no-member
         if host_subscriptions_response.status_code in (400, 404):
@@ -380,11 +400,340 @@ def process_results(self, results, api_version):
             self.record_inspect_result(
                 result.get("name"), result.get("details"), result.get("status")
             )
+    self.flush()
+
+
+def deduplicate_hosts(host_pages):
+    """Skip the hosts already listed in a previous page.
+
+    Hosts are identified by their id and name.
+
+    :param host_pages: An iterator of lists of hosts
+    :returns: An iterator of lists of hosts not seen before
+    """
+    seen_hosts = set()
+    for hosts_before_dedup in host_pages:
+        hosts_after_dedup = []
+        for host in hosts_before_dedup:
+            host_key = (host.get(ID), host.get(NAME))
+            if host_key not in seen_hosts:
+                hosts_after_dedup.append(host)
+                seen_hosts.add(host_key)
+        yield hosts_after_dedup
+
+
+class _PagesDone:
+    """Marks the end of the host pages dispatched by a HostDetailsPipeline."""
+
+    def __init__(self, dispatched):
+        """Set the number of hosts dispatched."""
+        self.dispatched = dispatched
+
+
+class HostDetailsPipeline:
+    """Request and record the details of Satellite 6 hosts in stages.
+
+    A dispatcher thread fetches the pages of hosts and hands each host to
+    the worker pool, the workers request the host details, and the calling
+    thread records the results as they arrive. At most queue_size hosts are
+    dispatched but not yet recorded, so a slow host only holds its own slot
+    instead of a whole chunk of hosts and the next page fetch.
+    """
+
+    # seconds between checks for a scan interrupt while waiting
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, api, pool, api_version, queue_size):
+        """Initialize HostDetailsPipeline.
+
+        :param api: The SatelliteSix interface recording the results
+        :param pool: The multiprocessing Pool requesting host details
+        :param api_version: The Satellite API version of the results
+        :param queue_size: Max number of hosts dispatched but not recorded
+        """
+        self.api = api
+        self.pool = pool
+        self.api_version = api_version
+        self.queue_size = queue_size
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.results = queue.Queue()
+        self.stopped = threading.Event()
+        # max seconds a recorded result waits to be flushed
+        self.flush_interval = settings.QPC_STATS_FLUSH_INTERVAL
+        # throughput metrics
+        self.pages = 0
+        self.hosts = 0
+        self.dispatch_wait = 0.0
+        self.record_wait = 0.0
+        self.elapsed = 0.0
+
+    def run(self, host_pages, manager_interrupt):
+        """Request and record the details of the hosts of host_pages.
+
+        :param host_pages: iterable of lists of hosts, fetched lazily
+        :param manager_interrupt: Signal used to cancel or pause the scan
+        """
+        start = time.monotonic()
+        dispatcher = threading.Thread(
+            target=self._dispatch, args=(host_pages,), daemon=True
+        )
+        dispatcher.start()
+        try:
+            self._record(manager_interrupt)
+        finally:
+            self.stopped.set()
+            dispatcher.join()
+            self.elapsed = time.monotonic() - start
+
+    def _dispatch(self, host_pages):
+        """Hand the hosts of each page to the pool as slots free up."""
+        dispatched = 0
+        try:
+            for hosts in host_pages:
+                self.pages += 1
+                for params in self.api.prepare_host(hosts):
+                    wait_start = time.monotonic()
+                    while not self.slots.acquire(timeout=self.POLL_INTERVAL):
+                        if self.stopped.is_set():
+                            return
+                    self.dispatch_wait += time.monotonic() - wait_start
+                    if self.stopped.is_set():
+                        return
+                    self.pool.apply_async(
+                        request_host_details,
+                        params,
+                        callback=self.results.put,
+                        error_callback=self.results.put,
+                    )
+                    dispatched += 1
+        except Exception as error:  # pylint: disable=broad-except
+            self.results.put(error)
+        else:
+            self.results.put(_PagesDone(dispatched))
+
+    def _record(self, manager_interrupt):
+        """Record host details results until every dispatched host is.
+
+        Results are recorded and flushed in batches of max_concurrency hosts,
+        or sooner once flush_interval seconds passed since the last batch.
+        """
+        batch = []
+        last_batch = time.monotonic()
+        dispatched = None
+        while dispatched is None or self.hosts < dispatched:
+            if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
+                raise SatelliteCancelException()
+            if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
+                raise SatellitePauseException()
+            wait_start = time.monotonic()
+            try:
+                result = self.results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                result = None
+            finally:
+                self.record_wait += time.monotonic() - wait_start
+            if isinstance(result, BaseException):
+                raise result
+            if isinstance(result, _PagesDone):
+                dispatched = result.dispatched
+            elif result is not None:
+                self.slots.release()
+                self.hosts += 1
+                batch.append(result)
+            if batch and (
+                len(batch) >= self.api.max_concurrency
+                or time.monotonic() - last_batch >= self.flush_interval
+            ):
+                process_results(self.api, batch, self.api_version)
+                batch = []
+                last_batch = time.monotonic()
+        if batch:
+            process_results(self.api, batch, self.api_version)
+
+    def log_stats(self, scan_task):
+        """Log the throughput of the pipeline."""
+        rate = self.hosts / self.elapsed if self.elapsed else 0
+        scan_task.log_message(
+            f"HOST DETAILS: {self.hosts} hosts from {self.pages} pages"
+            f" in {self.elapsed:.1f}s ({rate:.1f} hosts/s)."
+            f" Waited {self.dispatch_wait:.1f}s for a free slot"
+            f" and {self.record_wait:.1f}s for results."
+        )
+
+
+class SatelliteSix(SatelliteInterface):
+    """Interact with Satellite 6."""
+
+    API_VERSION = None
+    HOSTS_FIELDS_URL = None
+    HOSTS_SUBS_URL = None
+
+    def __init__(self, scan_job, scan_task):
+        """Set context for Satellite Interface.
+
+        :param scan_task: the scan task model for this task
+        :param conn_result: The connection result
+        :param inspect_result: The inspection result
+        """
+        super().__init__(scan_job, scan_task)
+        self.session = utils.create_session(settings.QPC_SATELLITE_PAGES_IN_FLIGHT)
+        self._host_options = None
+
+    def host_options(self):
+        """Get the options to request host details with.
+
+        :returns: tuple of the request options and the logging options
+        """
+        if self._host_options is not None:
+            return self._host_options
+        request_options = utils.get_request_options(self.inspect_scan_task)
+        logging_options = {
+            "job_id": self.scan_job.id,
+            "task_sequence_number": self.inspect_scan_task.sequence_number,
+            "scan_type": self.inspect_scan_task.scan_type,
+            "source_type": self.inspect_scan_task.source.source_type,
+            "source_name": self.inspect_scan_task.source.name,
+        }
+        self._host_options = request_options, logging_options
+        return self._host_options
+
+    def prepare_host(self, chunk):
+        """Prepare each host with necessary information.
+
+        :param chunk: A list of hosts
+        :returns A list of tuples that contain information about
+            each host.
+        """
+        if self.inspect_scan_task is None:
+            raise SatelliteException(
+                "host_details cannot be called for a connection scan"
+            )
+        request_options, logging_options = self.host_options()
+        host_params = [
+            (
+                self.inspect_scan_task,
+                logging_options,
+                host.get(ID),
+                host.get(NAME),
+                self.HOSTS_FIELDS_URL,
+                self.HOSTS_SUBS_URL,
+                request_options,
+            )
+            for host in chunk
+        ]
+
+        return host_params
+
+    def fetch_pages(self, scan_task, url, org_id=None, request_options=None):
+        """Fetch the pages of results listed by url.
+
+        The first page tells the total count of results. The remaining pages
+        are then requested concurrently, QPC_SATELLITE_PAGES_IN_FLIGHT at most
+        at a time, and yielded in order. Pages keep being requested one at a
+        time after the last counted one while they are full.
+
+        :param scan_task: The scan task
+        :param url: A url string with placeholders for parameters
+        :param org_id: The organization id being queried
+        :param request_options: The options to request the pages with
+        :returns: An iterator of lists of results
+        """
+        if request_options is None:
+            request_options = utils.get_request_options(scan_task)
+        per_page = settings.QPC_SATELLITE_PAGE_SIZE
+
+        def fetch(page):
+            params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
+            response, page_url = utils.execute_request(
+                scan_task,
+                url=url,
+                org_id=org_id,
+                query_params=params,
+                options=request_options,
+                session=self.session,
+            )
+            # pylint: disable=no-member
+            if response.status_code != requests.codes.ok:
+                raise SatelliteException(
+                    f"Invalid response code {response.status_code}"
+                    f" for url: {page_url}"
+                )
+            return response.json()
+
+        def is_full(jsonresult):
+            return int(jsonresult.get(PER_PAGE, 0)) == len(jsonresult.get(RESULTS, []))
+
+        jsonresult = fetch(1)
+        yield jsonresult.get(RESULTS, [])
+        page = 1
+        total = jsonresult.get("subtotal", jsonresult.get("total"))
+        page_size = int(jsonresult.get(PER_PAGE, 0))
+        if is_full(jsonresult) and total and page_size:
+            page_count = math.ceil(int(total) / page_size)
+            with ThreadPoolExecutor(
+                max_workers=settings.QPC_SATELLITE_PAGES_IN_FLIGHT
+            ) as executor:
+                pages = iter(range(2, page_count + 1))
+                pending = deque(
+                    executor.submit(fetch, next_page)
+                    for next_page in islice(
+                        pages, settings.QPC_SATELLITE_PAGES_IN_FLIGHT
+                    )
+                )
+                try:
+                    while pending:
+                        jsonresult = pending.popleft().result()
+                        page += 1
+                        next_page = next(pages, None)
+                        if next_page is not None:
+                            pending.append(executor.submit(fetch, next_page))
+                        yield jsonresult.get(RESULTS, [])
+                finally:
+                    for future in pending:
+                        future.cancel()
+        while is_full(jsonresult):
+            page += 1
+            jsonresult = fetch(page)
+            yield jsonresult.get(RESULTS, [])
 
+    def host_pages(self, request_options):
+        """Fetch the pages of managed hosts to inspect.
 
-class SatelliteSixV1(SatelliteInterface):
+        :param request_options: The options to request the pages with
+        :returns: An iterator of lists of hosts
+        """
+        raise NotImplementedError
+
+    def hosts_facts(self, manager_interrupt):
+        """Obtain the managed hosts detail raw facts."""
+        systems_count = len(self.connect_scan_task.connection_result.systems.all())
+        if self.inspect_scan_task is None:
+            raise SatelliteException(
+                "hosts_facts cannot be called for a connection scan"
+            )
+        self.inspect_scan_task.update_stats(
+            "INITIAL STATELLITE STATS", sys_count=systems_count
+        )
+        request_options, _ = self.host_options()
+        host_pages = self.host_pages(request_options)
+
+        with Pool(
+            processes=self.max_concurrency, initializer=_init_host_details_worker
+        ) as pool:
+            queue_size = max(settings.QPC_SATELLITE_QUEUE_SIZE, self.max_concurrency)
+            pipeline = HostDetailsPipeline(self, pool, self.API_VERSION, queue_size)
+            pipeline.run(host_pages, manager_interrupt)
+        pipeline.log_stats(self.inspect_scan_task)
+        utils.validate_task_stats(self.inspect_scan_task)
+
+
+class SatelliteSixV1(SatelliteSix):
     """Interact with Satellite 6, API version 1."""
 
+    API_VERSION = 1
+    HOSTS_FIELDS_URL = HOSTS_FIELDS_V1_URL
+    HOSTS_SUBS_URL = HOSTS_SUBS_V1_URL
+
     def __init__(self, scan_job, scan_task):
         """Set context for Satellite Interface.
 
@@ -413,7 +762,7 @@ class SatelliteSixV1(SatelliteInterface):
             page += 1
             params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
             response, url = utils.execute_request(
-                self.connect_scan_task, ORGS_V1_URL, params
+                self.connect_scan_task, ORGS_V1_URL, params, session=self.session
             )
             # pylint: disable=no-member
             if response.status_code != requests.codes.ok:
@@ -439,6 +788,7 @@ class SatelliteSixV1(SatelliteInterface):
                 url=HOSTS_V1_URL,
                 org_id=org_id,
                 query_params=params,
+                session=self.session,
             )
             # pylint: disable=no-member
             if response.status_code != requests.codes.ok:
@@ -455,30 +805,12 @@ class SatelliteSixV1(SatelliteInterface):
         """Obtain the managed hosts."""
         orgs = self.get_orgs()
         hosts = []
+        credential = utils.get_credential(self.connect_scan_task)
         for org_id in orgs:
-            jsonresult = {}
-            page = 0
-            per_page = 100
-            credential = utils.get_credential(self.connect_scan_task)
-            while page == 0 or int(jsonresult.get(PER_PAGE, 0)) == len(
-                jsonresult.get(RESULTS, [])
+            for results in self.fetch_pages(
+                self.connect_scan_task, HOSTS_V1_URL, org_id=org_id
             ):
-                page += 1
-                params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
-                response, url = utils.execute_request(
-                    self.connect_scan_task,
-                    url=HOSTS_V1_URL,
-                    org_id=org_id,
-                    query_params=params,
-                )
-                # pylint: disable=no-member
-                if response.status_code != requests.codes.ok:
-                    raise SatelliteException(
-                        f"Invalid response code {response.status_code}"
-                        f" for url: {url}"
-                    )
-                jsonresult = response.json()
-                for result in jsonresult.get(RESULTS, []):
+                for result in results:
                     host_name = result.get(NAME)
                     host_id = result.get(ID)
 
@@ -489,123 +821,41 @@ class SatelliteSixV1(SatelliteInterface):
 
         return hosts
 
-    def prepare_host(self, chunk):
-        """Prepare each host with necessary information.
+    def host_pages(self, request_options):
+        """Fetch the pages of managed hosts to inspect.
 
-        :param chunk: A list of hosts
-        :returns A list of tuples that contain information about
-            each host.
+        :param request_options: The options to request the pages with
+        :returns: An iterator of lists of hosts
         """
-        if self.inspect_scan_task is None:
-            raise SatelliteException(
-                "host_details cannot be called for a connection scan"
-            )
-        defined_host, port, user, password = utils.get_connect_data(
-            self.inspect_scan_task
-        )
-        ssl_cert_verify = True
-        source_options = self.inspect_scan_task.source.options
-        if source_options:
-            ssl_cert_verify = source_options.ssl_cert_verify
-        request_options = {
-            "host": defined_host,
-            "port": port,
-            "user": user,
-            "password": password,
-            "ssl_cert_verify": ssl_cert_verify,
-        }
-        logging_options = {
-            "job_id": self.scan_job.id,
-            "task_sequence_number": self.inspect_scan_task.sequence_number,
-            "scan_type": self.inspect_scan_task.scan_type,
-            "source_type": self.inspect_scan_task.source.source_type,
-            "source_name": self.inspect_scan_task.source.name,
-        }
-        host_params = [
-            (
-                self.inspect_scan_task,
-                logging_options,
-                host.get(ID),
-                host.get(NAME),
-                HOSTS_FIELDS_V1_URL,
-                HOSTS_SUBS_V1_URL,
-                request_options,
-            )
-            for host in chunk
-        ]
-
-        return host_params
+        orgs = self.get_orgs()
+        return deduplicate_hosts(self._host_pages(orgs, request_options))
 
-    def hosts_facts(self, manager_interrupt):
-        """Obtain the managed hosts detail raw facts."""
-        systems_count = len(self.connect_scan_task.connection_result.systems.all())
-        if self.inspect_scan_task is None:
-            raise SatelliteException(
-                "hosts_facts cannot be called for a connection scan"
+    def _host_pages(self, orgs, request_options):
+        """Fetch the pages of hosts of each organization."""
+        for org_id in orgs:
+            yield from self.fetch_pages(
+                self.inspect_scan_task,
+                HOSTS_V1_URL,
+                org_id=org_id,
+                request_options=request_options,
             )
-        self.inspect_scan_task.update_stats(
-            "INITIAL STATELLITE STATS", sys_count=systems_count
-        )
-        deduplicated_hosts = []
-
-        # pylint: disable=too-many-nested-blocks
-        with Pool(processes=self.max_concurrency) as pool:
-            orgs = self.get_orgs()
-            for org_id in orgs:
-                jsonresult = {}
-                page = 0
-                per_page = 100
-                while page == 0 or int(jsonresult.get(PER_PAGE, 0)) == len(
-                    jsonresult.get(RESULTS, [])
-                ):
-                    page += 1
-                    params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
-                    response, url = utils.execute_request(
-                        self.inspect_scan_task,
-                        url=HOSTS_V1_URL,
-                        org_id=org_id,
-                        query_params=params,
-                    )
-                    # pylint: disable=no-member
-                    if response.status_code != requests.codes.ok:
-                        raise SatelliteException(
-                            f"Invalid response code {response.status_code}"
-                            f" for url: {url}"
-                        )
-                    jsonresult = response.json()
-
-                    hosts_before_dedup = jsonresult.get(RESULTS, [])
-                    hosts_after_dedup = []
-                    for host in hosts_before_dedup:
-                        if host not in deduplicated_hosts:
-                            hosts_after_dedup.append(host)
-                            deduplicated_hosts.append(host)
-                    hosts = hosts_after_dedup
-                    chunks = [
-                        hosts[i : i + self.max_concurrency]
-                        for i in range(0, len(hosts), self.max_concurrency)
-                    ]
-                    for chunk in chunks:
-                        if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
-                            raise SatelliteCancelException()
-
-                        if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
-                            raise SatellitePauseException()
-
-                        host_params = self.prepare_host(chunk)
-                        results = pool.starmap(request_host_details, host_params)
-                        process_results(self, results, 1)
-        utils.validate_task_stats(self.inspect_scan_task)
 
 
-class SatelliteSixV2(SatelliteInterface):
+class SatelliteSixV2(SatelliteSix):
     """Interact with Satellite 6, API version 2."""
 
+    API_VERSION = 2
+    HOSTS_FIELDS_URL = HOSTS_FIELDS_V2_URL
+    HOSTS_SUBS_URL = HOSTS_SUBS_V2_URL
+
     def host_count(self):
         """Obtain the count of managed hosts."""
         params = {PAGE: 1, PER_PAGE: 10, THIN: 1}
         response, url = utils.execute_request(
-            self.connect_scan_task, url=HOSTS_V2_URL, query_params=params
+            self.connect_scan_task,
+            url=HOSTS_V2_URL,
+            query_params=params,
+            session=self.session,
         )
         # pylint: disable=no-member
         if response.status_code != requests.codes.ok:
@@ -621,25 +871,9 @@ class SatelliteSixV2(SatelliteInterface):
     def hosts(self):
         """Obtain the managed hosts."""
         hosts = []
-        jsonresult = {}
-        page = 0
-        per_page = 100
         credential = utils.get_credential(self.connect_scan_task)
-        while page == 0 or int(jsonresult.get(PER_PAGE, 0)) == len(
-            jsonresult.get(RESULTS, [])
-        ):
-            page += 1
-            params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
-            response, url = utils.execute_request(
-                self.connect_scan_task, url=HOSTS_V2_URL, query_params=params
-            )
-            # pylint: disable=no-member
-            if response.status_code != requests.codes.ok:
-                raise SatelliteException(
-                    f"Invalid response code {response.status_code} for url: {url}"
-                )
-            jsonresult = response.json()
-            for result in jsonresult.get(RESULTS, []):
+        for results in self.fetch_pages(self.connect_scan_task, HOSTS_V2_URL):
+            for result in results:
                 host_name = result.get(NAME)
                 host_id = result.get(ID)
 
@@ -650,103 +884,14 @@ class SatelliteSixV2(SatelliteInterface):
 
         return hosts
 
-    def prepare_host(self, chunk):
-        """Prepare each host with necessary information.
+    def host_pages(self, request_options):
+        """Fetch the pages of managed hosts to inspect.
 
-        :param chunk: A list of hosts
-        :returns A list of tuples that contain information about
-            each host.
+        :param request_options: The options to request the pages with
+        :returns: An iterator of lists of hosts
         """
-        if self.inspect_scan_task is None:
-            raise SatelliteException(
-                "host_details cannot be called for a connection scan"
-            )
-        defined_host, port, user, password = utils.get_connect_data(
-            self.inspect_scan_task
-        )
-        ssl_cert_verify = True
-        source_options = self.inspect_scan_task.source.options
-        if source_options:
-            ssl_cert_verify = source_options.ssl_cert_verify
-        request_options = {
-            "host": defined_host,
-            "port": port,
-            "user": user,
-            "password": password,
-            "ssl_cert_verify": ssl_cert_verify,
-        }
-        logging_options = {
-            "job_id": self.scan_job.id,
-            "task_sequence_number": self.inspect_scan_task.sequence_number,
-            "scan_type": self.inspect_scan_task.scan_type,
-            "source_type": self.inspect_scan_task.source.source_type,
-            "source_name": self.inspect_scan_task.source.name,
-        }
-        host_params = [
-            (
-                self.inspect_scan_task,
-                logging_options,
-                host.get(ID),
-                host.get(NAME),
-                HOSTS_FIELDS_V2_URL,
-                HOSTS_SUBS_V2_URL,
-                request_options,
+        return deduplicate_hosts(
+            self.fetch_pages(
+                self.inspect_scan_task, HOSTS_V2_URL, request_options=request_options
             )
-            for host in chunk
-        ]
-
-        return host_params
-
-    def hosts_facts(self, manager_interrupt):
-        """Obtain the managed hosts detail raw facts."""
-        systems_count = len(self.connect_scan_task.connection_result.systems.all())
-        if self.inspect_scan_task is None:
-            raise SatelliteException(
-                "hosts_facts cannot be called for a connection scan"
-            )
-        self.inspect_scan_task.update_stats(
-            "INITIAL STATELLITE STATS", sys_count=systems_count
         )
-        deduplicated_hosts = []
-
-        with Pool(processes=self.max_concurrency) as pool:
-            jsonresult = {}
-            page = 0
-            per_page = 100
-            while page == 0 or int(jsonresult.get(PER_PAGE, 0)) == len(
-                jsonresult.get(RESULTS, [])
-            ):
-                page += 1
-                params = {PAGE: page, PER_PAGE: per_page, THIN: 1}
-                response, url = utils.execute_request(
-                    self.inspect_scan_task, url=HOSTS_V2_URL, query_params=params
-                )
-                # pylint: disable=no-member
-                if response.status_code != requests.codes.ok:
-                    raise SatelliteException(
-                        f"Invalid response code {response.status_code}"
-                        f" for url: {url}"
-                    )
-                jsonresult = response.json()
-
-                hosts_before_dedup = jsonresult.get(RESULTS, [])
-                hosts_after_dedup = []
-                for host in hosts_before_dedup:
-                    if host not in deduplicated_hosts:
-                        hosts_after_dedup.append(host)
-                        deduplicated_hosts.append(host)
-                hosts = hosts_after_dedup
-                chunks = [
-                    hosts[i : i + self.max_concurrency]
-                    for i in range(0, len(hosts), self.max_concurrency)
-                ]
-                for chunk in chunks:
-                    if manager_interrupt.value == ScanJob.JOB_TERMINATE_CANCEL:
-                        raise SatelliteCancelException()
-
-                    if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
-                        raise SatellitePauseException()
-                    host_params = self.prepare_host(chunk)
-                    results = pool.starmap(request_host_details, host_params)
-                    process_results(self, results, 2)
-        utils.validate_task_stats(self.inspect_scan_task)
@@ -57,7 +57,10 @@ class SatelliteTaskRunner(ScanTaskRunner, metaclass=ABCMeta):
         """Scan Satellite for system connection data."""
         try:
             api = self._initialize_api_object()
-            self.handle_api_calls(api, manager_interrupt)
+            try:
+                self.handle_api_calls(api, manager_interrupt)
+            finally:
+                api.flush()
         except self.EXPECTED_EXCEPTIONS as error:
             return self._handle_error(error)
 
@@ -36,6 +36,11 @@ def mock_xml_fault(param1, param2):  # pylint: disable=unused-argument
     raise xmlrpc.client.Fault(faultCode=500, faultString="fault")
 
 
+def mock_multicall_fault(calls):  # pylint: disable=unused-argument
+    """Mock a server without system.multicall."""
+    raise xmlrpc.client.Fault(faultCode=-32601, faultString="no multicall")
+
+
 # pylint: disable=too-many-instance-attributes
 class SatelliteFiveTest(TestCase):
     """Tests Satellite 5 functions."""
@@ -163,6 +168,7 @@ class SatelliteFiveTest(TestCase):
         ]
         client.system.get_network_devices.return_value = net_devices
         client.system.get_registration_date.return_value = "datetime"
+        client.system.multicall.side_effect = mock_multicall_fault
         virt = {1: {"id": 1, "num_virtual_guests": 3}}
 
         logging_options = {
@@ -226,6 +232,7 @@ class SatelliteFiveTest(TestCase):
         ]
         client.system.get_network_devices.return_value = net_devices
         client.system.get_registration_date.return_value = "datetime"
+        client.system.multicall.side_effect = mock_multicall_fault
         virt = {2: {"uuid": 2, "name": "sys2", "num_virtual_guests": 3}}
         raw_result = request_host_details(
             host_id=1,
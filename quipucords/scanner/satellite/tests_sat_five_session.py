@@ -0,0 +1,136 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Test Satellite 5 host details reuse their session and multicall."""
+
+from multiprocessing import Value
+from unittest.mock import Mock
+
+import pytest
+
+from api.models import ScanJob, SystemInspectionResult
+from scanner.satellite import five
+from scanner.satellite.five import Satellite5Session, request_host_details
+
+DETAILS_METHODS = [method for _, method in five.HOST_DETAILS_CALLS]
+
+
+@pytest.fixture
+def request_options(satellite5_server):
+    """Return the options to request the local server with."""
+    return {
+        "host": "127.0.0.1",
+        "port": satellite5_server.port,
+        "user": "username",
+        "password": "password",
+        "ssl_cert_verify": False,
+    }
+
+
+@pytest.fixture
+def worker_session(mocker, request_options):
+    """Use a session like the one of a host details worker process."""
+    session = Satellite5Session(None, request_options)
+    mocker.patch.object(five, "_worker_session", session)
+    yield session
+    session.logout()
+
+
+def request_hosts(host_ids, request_options=None):
+    """Request the details of host_ids and return their results."""
+    return [
+        request_host_details(
+            host_id, f"sys{host_id}", "", Mock(), request_options, None
+        )
+        for host_id in host_ids
+    ]
+
+
+def assert_details(results):
+    """Assert results hold the details of hosts 0 to len(results) - 1."""
+    for host_id, result in enumerate(results):
+        assert result["system_inspection_result"] == SystemInspectionResult.SUCCESS
+        assert result["uuid"] == f"uuid{host_id}"
+        assert result["system_details"]["hostname"] == f"sys{host_id}.example.com"
+        assert result["network_devices"][0]["ip"] == f"10.0.0.{host_id}"
+        assert result["registration_date"] == "20220101"
+
+
+def test_multicall(satellite5_server, worker_session):
+    """Test one login and a multicall per host."""
+    results = request_hosts(range(3))
+
+    assert_details(results)
+    assert satellite5_server.calls == ["auth.login"] + 3 * (
+        ["system.multicall"] + DETAILS_METHODS
+    )
+    assert satellite5_server.requests == 1 + 3
+
+
+def test_multicall_not_supported(satellite5_server, worker_session):
+    """Test the calls are made one by one when multicall is not supported."""
+    satellite5_server.multicall = False
+    results = request_hosts(range(3))
+
+    assert_details(results)
+    assert not worker_session.multicall_supported
+    assert satellite5_server.calls == (
+        ["auth.login", "system.multicall"] + 3 * DETAILS_METHODS
+    )
+
+
+def test_expired_session(satellite5_server, worker_session):
+    """Test the session logs in again once its key expired."""
+    request_hosts(range(1))
+    satellite5_server.expire_sessions()
+    assert_details(request_hosts(range(2)))
+    assert satellite5_server.calls.count("auth.login") == 2
+    # the expired key is logged out before logging in again
+    calls = satellite5_server.calls
+    assert calls[calls.index("auth.login", 1) - 1] == "auth.logout"
+
+
+def test_without_worker_session(satellite5_server, request_options):
+    """Test each host logs in and out of its own session without a worker."""
+    results = request_hosts(range(2), request_options)
+
+    assert_details(results)
+    assert satellite5_server.calls.count("auth.login") == 2
+    assert satellite5_server.calls.count("auth.logout") == 2
+    assert not satellite5_server.sessions
+
+
+def test_host_fault(satellite5_server, worker_session):
+    """Test a host whose details fail is reported as failed."""
+    assert_details(request_hosts(range(1)))
+    [result] = request_hosts([99])
+    assert result["system_inspection_result"] == SystemInspectionResult.FAILED
+    # the session is still used for the next hosts
+    assert_details(request_hosts(range(2)))
+    assert satellite5_server.calls.count("auth.login") == 1
+    assert satellite5_server.calls.count("system.multicall") == 4
+
+
+@pytest.mark.django_db
+def test_hosts_facts(satellite5_server, satellite5_api):
+    """Test host details workers keep one session each and log out."""
+    api = satellite5_api(max_concurrency=2)
+
+    api.hosts_facts(Value("i", ScanJob.JOB_RUN))
+
+    hosts = satellite5_server.hosts
+    calls = satellite5_server.calls
+    assert calls.count("system.multicall") == hosts
+    # the hosts, virtual hosts and physical hosts listings, and a session
+    # per worker process
+    assert calls.count("auth.login") <= 3 + 2
+    assert calls.count("auth.logout") == calls.count("auth.login")
+    systems = api.inspect_scan_task.inspection_result.systems
+    assert systems.filter(status=SystemInspectionResult.SUCCESS).count() == hosts
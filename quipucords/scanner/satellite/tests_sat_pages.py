@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Test the Satellite 6 host pages fetching and deduplication."""
+
+import re
+
+import pytest
+
+from scanner.satellite import six
+from scanner.satellite.api import SatelliteException
+from scanner.satellite.six import HOSTS_V2_URL, deduplicate_hosts
+
+
+def requested_pages(satellite_server):
+    """Return the page numbers satellite_server was requested."""
+    return [
+        int(re.search(r"[?&]page=(\d+)", path).group(1))
+        for path in satellite_server.requests
+    ]
+
+
+def test_deduplicate_hosts():
+    """Test hosts listed in previous pages are skipped by id and name."""
+    pages = [
+        [{"id": 1, "name": "sys1"}, {"id": 2, "name": "sys2"}],
+        [{"id": 2, "name": "sys2", "extra": True}, {"id": 3, "name": "sys1"}],
+        [{"id": 1, "name": "sys1"}],
+    ]
+    assert list(deduplicate_hosts(pages)) == [
+        [{"id": 1, "name": "sys1"}, {"id": 2, "name": "sys2"}],
+        [{"id": 3, "name": "sys1"}],
+        [],
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("pages_in_flight", [1, 3])
+def test_fetch_pages(satellite_server, satellite_api, monkeypatch, pages_in_flight):
+    """Test every page is fetched and yielded in order."""
+    monkeypatch.setattr(six.settings, "QPC_SATELLITE_PAGES_IN_FLIGHT", pages_in_flight)
+    satellite_server.hosts = 23
+    satellite_server.per_page = 5
+    api = satellite_api()
+
+    pages = list(api.fetch_pages(api.inspect_scan_task, HOSTS_V2_URL))
+
+    assert [[host["id"] for host in page] for page in pages] == [
+        list(range(start, min(start + 5, 23))) for start in range(0, 23, 5)
+    ]
+    assert sorted(requested_pages(satellite_server)) == [1, 2, 3, 4, 5]
+    assert all("per_page=100" in path for path in satellite_server.requests)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("pages_in_flight", [1, 3])
+def test_fetch_pages_in_flight(
+    satellite_server, satellite_api, monkeypatch, pages_in_flight
+):
+    """Test the pages after the first are requested pages_in_flight at a time."""
+    monkeypatch.setattr(six.settings, "QPC_SATELLITE_PAGES_IN_FLIGHT", pages_in_flight)
+    satellite_server.hosts = 18
+    satellite_server.per_page = 5
+    satellite_server.hold_pages = pages_in_flight
+    api = satellite_api()
+
+    pages = list(api.fetch_pages(api.inspect_scan_task, HOSTS_V2_URL))
+
+    assert [host["id"] for page in pages for host in page] == list(range(18))
+    # the first page is requested alone, then pages 2 to 4 concurrently
+    assert requested_pages(satellite_server)[0] == 1
+    assert sorted(requested_pages(satellite_server)) == [1, 2, 3, 4]
+    assert satellite_server.max_pages_in_flight == pages_in_flight
+
+
+@pytest.mark.django_db
+def test_fetch_pages_beyond_total(satellite_server, satellite_api, monkeypatch):
+    """Test full pages keep being fetched past an outdated total."""
+    monkeypatch.setattr(six.settings, "QPC_SATELLITE_PAGES_IN_FLIGHT", 2)
+    satellite_server.hosts = 10
+    satellite_server.per_page = 5
+    api = satellite_api()
+    pages = api.fetch_pages(api.inspect_scan_task, HOSTS_V2_URL)
+
+    assert len(next(pages)) == 5
+    # hosts added after the first page was listed
+    satellite_server.hosts = 12
+    assert [len(page) for page in pages] == [5, 2]
+    assert sorted(requested_pages(satellite_server)) == [1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_fetch_pages_error(satellite_server, satellite_api, mocker):
+    """Test an invalid page response raises SatelliteException."""
+    api = satellite_api()
+    response = mocker.Mock(status_code=500)
+    mocker.patch(
+        "scanner.satellite.six.utils.execute_request",
+        return_value=(response, "https://127.0.0.1/api/v2/hosts"),
+    )
+    with pytest.raises(SatelliteException):
+        list(api.fetch_pages(api.inspect_scan_task, HOSTS_V2_URL))
+
+
+@pytest.mark.slow
+def test_benchmark_deduplicate_hosts():
+    """Deduplicate a 50k hosts listing whose pages overlap."""
+    # each page repeats the last host of the previous page
+    pages = [
+        [
+            {"id": host_id, "name": f"sys{host_id}"}
+            for host_id in range(max(start - 1, 0), start + 100)
+        ]
+        for start in range(0, 50000, 100)
+    ]
+
+    deduplicated = list(deduplicate_hosts(pages))
+
+    assert len(deduplicated) == 500
+    assert [host["id"] for page in deduplicated for host in page] == list(range(50000))
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_benchmark_fetch_pages(satellite_server, satellite_api, monkeypatch):
+    """List 50k hosts with 4 pages in flight."""
+    monkeypatch.setattr(six.settings, "QPC_SATELLITE_PAGES_IN_FLIGHT", 4)
+    satellite_server.hosts = 50000
+    satellite_server.per_page = 100
+    api = satellite_api()
+
+    pages = deduplicate_hosts(api.fetch_pages(api.inspect_scan_task, HOSTS_V2_URL))
+
+    assert [host["id"] for page in pages for host in page] == list(range(50000))
+    # a single request per page, plus an empty one past the last full page,
+    # never more than 4 at the same time
+    assert sorted(requested_pages(satellite_server)) == list(range(1, 502))
+    assert satellite_server.max_pages_in_flight <= 4
@@ -0,0 +1,207 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Test the Satellite 6 host details pipeline."""
+
+import logging
+import threading
+from multiprocessing import Value
+
+import pytest
+
+from api.models import ScanJob, SystemInspectionResult
+from scanner.satellite.api import (
+    SatelliteCancelException,
+    SatelliteException,
+    SatellitePauseException,
+)
+from scanner.satellite.six import HostDetailsPipeline
+
+
+class FakePool:
+    """Pool answering host details requests from other threads."""
+
+    def __init__(self):
+        """Initialize FakePool."""
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+
+    def apply_async(self, func, args, callback=None, error_callback=None):
+        """Answer a failed host details result shortly."""
+        # pylint: disable=unused-argument
+        with self.lock:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+        def answer():
+            with self.lock:
+                self.pending -= 1
+            callback(
+                {
+                    "unique_name": f"{args[3]}_{args[2]}",
+                    "system_inspection_result": SystemInspectionResult.FAILED,
+                    "host_fields_response": {},
+                    "host_subscriptions_response": {},
+                }
+            )
+
+        threading.Timer(0.001, answer).start()
+
+
+@pytest.fixture
+def api(mocker):
+    """Return a mocked SatelliteSix interface."""
+    api = mocker.Mock(max_concurrency=2)
+    api.prepare_host.side_effect = lambda hosts: [
+        (None, {}, host["id"], host["name"], None, None, {}) for host in hosts
+    ]
+    return api
+
+
+def host_pages(pages, per_page):
+    """Return pages of hosts."""
+    return [
+        [
+            {"id": host_id, "name": f"sys{host_id}"}
+            for host_id in range(page * per_page, (page + 1) * per_page)
+        ]
+        for page in range(pages)
+    ]
+
+
+def recorded_names(api):
+    """Return the names of the hosts api recorded."""
+    return [call.args[0] for call in api.record_inspect_result.call_args_list]
+
+
+def test_hosts_in_flight_bounded(api):
+    """Test no more than queue_size hosts are dispatched and not recorded."""
+    pool = FakePool()
+    pipeline = HostDetailsPipeline(api, pool, 2, queue_size=3)
+    pipeline.run(host_pages(4, 10), Value("i", ScanJob.JOB_RUN))
+
+    assert sorted(recorded_names(api)) == sorted(
+        f"sys{host_id}_{host_id}" for host_id in range(40)
+    )
+    assert pool.max_pending <= 3
+    assert (pipeline.pages, pipeline.hosts) == (4, 40)
+    api.flush.assert_called()
+
+
+def test_results_flushed_in_batches(api):
+    """Test results are flushed every max_concurrency hosts."""
+    api.max_concurrency = 4
+    pipeline = HostDetailsPipeline(api, FakePool(), 2, queue_size=8)
+    pipeline.flush_interval = 60
+    pipeline.run(host_pages(5, 8), Value("i", ScanJob.JOB_RUN))
+
+    assert len(recorded_names(api)) == 40
+    assert api.flush.call_count == 10
+
+
+def test_results_flushed_after_interval(api):
+    """Test a partial batch is flushed once flush_interval passed."""
+    api.max_concurrency = 4
+    flushed = threading.Event()
+    api.flush.side_effect = flushed.set
+    waited = []
+
+    def slow_pages():
+        yield host_pages(1, 1)[0]
+        # the next page waits for the first host to be flushed
+        waited.append(flushed.wait(timeout=5))
+        yield []
+
+    pipeline = HostDetailsPipeline(api, FakePool(), 2, queue_size=8)
+    pipeline.flush_interval = 0.1
+    pipeline.run(slow_pages(), Value("i", ScanJob.JOB_RUN))
+
+    assert waited == [True]
+    assert recorded_names(api) == ["sys0_0"]
+
+
+def test_empty_pages(api):
+    """Test there is nothing to record without hosts."""
+    pipeline = HostDetailsPipeline(api, FakePool(), 2, queue_size=3)
+    pipeline.run([[], []], Value("i", ScanJob.JOB_RUN))
+    api.record_inspect_result.assert_not_called()
+    assert (pipeline.pages, pipeline.hosts) == (2, 0)
+
+
+def test_page_error_raised(api):
+    """Test errors fetching pages are raised by run."""
+
+    def failing_pages():
+        yield host_pages(1, 5)[0]
+        raise SatelliteException("Invalid response code 500")
+
+    pipeline = HostDetailsPipeline(api, FakePool(), 2, queue_size=3)
+    with pytest.raises(SatelliteException):
+        pipeline.run(failing_pages(), Value("i", ScanJob.JOB_RUN))
+
+
+def test_worker_error_raised(api):
+    """Test errors raised by the workers are raised by run."""
+
+    class FailingPool:
+        """Pool failing every host details request."""
+
+        # pylint: disable=unused-argument
+        def apply_async(self, func, args, callback=None, error_callback=None):
+            """Fail the request."""
+            error_callback(ConnectionError("refused"))
+
+    pipeline = HostDetailsPipeline(api, FailingPool(), 2, queue_size=3)
+    with pytest.raises(ConnectionError):
+        pipeline.run(host_pages(2, 5), Value("i", ScanJob.JOB_RUN))
+
+
+@pytest.mark.parametrize(
+    "interrupt,exception",
+    [
+        (ScanJob.JOB_TERMINATE_CANCEL, SatelliteCancelException),
+        (ScanJob.JOB_TERMINATE_PAUSE, SatellitePauseException),
+    ],
+)
+def test_interrupted(api, interrupt, exception):
+    """Test the pipeline stops when the scan is canceled or paused."""
+    pipeline = HostDetailsPipeline(api, FakePool(), 2, queue_size=3)
+    with pytest.raises(exception):
+        pipeline.run(host_pages(100, 100), Value("i", interrupt))
+    assert pipeline.hosts == 0
+
+
+@pytest.mark.django_db
+def test_slow_host_does_not_stall(satellite_server, satellite_api, mocker, caplog):
+    """Test the other hosts are recorded while a slow host is requested."""
+    satellite_server.per_page = 5
+    satellite_server.host_delays = {0: 1}
+    api = satellite_api(max_concurrency=2)
+    record_inspect_result = mocker.spy(api, "record_inspect_result")
+    caplog.set_level(logging.INFO)
+
+    api.hosts_facts(Value("i", ScanJob.JOB_RUN))
+
+    names = [call.args[0] for call in record_inspect_result.call_args_list]
+    hosts = satellite_server.hosts
+    assert sorted(names) == sorted(
+        f"sys{host_id}_{host_id}" for host_id in range(hosts)
+    )
+    # requested first, but recorded after the hosts requested meanwhile
+    assert names.index("sys0_0") > hosts // 2
+    assert all(
+        call.args[2] == SystemInspectionResult.SUCCESS
+        for call in record_inspect_result.call_args_list
+    )
+    assert api.inspect_scan_task.inspection_result.systems.count() == hosts
+    stats = [message for message in caplog.messages if "HOST DETAILS:" in message]
+    assert len(stats) == 1
+    assert f"{hosts} hosts from 3 pages" in stats[0]
@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""Test Satellite 6 requests reuse their connections."""
+
+from multiprocessing import Value
+
+import pytest
+
+from api.models import ScanJob
+from scanner.satellite import utils
+
+
+@pytest.fixture
+def request_options(satellite_server):
+    """Return the options to request the local server with."""
+    return {
+        "host": "127.0.0.1",
+        "port": satellite_server.port,
+        "user": "username",
+        "password": "password",
+        "ssl_cert_verify": False,
+    }
+
+
+def test_session_reuses_connection(satellite_server, request_options):
+    """Test requests made with a session share one connection."""
+    url = "https://{sat_host}:{port}/api/v2/hosts/{host_id}"
+    for host_id in range(5):
+        utils.execute_request(None, url, host_id=host_id, options=request_options)
+    assert satellite_server.connections == 5
+
+    session = utils.create_session()
+    for host_id in range(5):
+        response, _ = utils.execute_request(
+            None, url, host_id=host_id, options=request_options, session=session
+        )
+        assert response.json() == {"name": f"sys{host_id}"}
+    assert satellite_server.connections == 6
+    assert len(satellite_server.requests) == 10
+
+
+@pytest.mark.django_db
+def test_hosts_facts_reuse_connections(satellite_server, satellite_api):
+    """Test host details workers keep one connection each."""
+    api = satellite_api(max_concurrency=2)
+
+    api.hosts_facts(Value("i", ScanJob.JOB_RUN))
+    api.flush()
+
+    hosts = satellite_server.hosts
+    # one hosts page and two requests per host
+    assert len(satellite_server.requests) == 1 + 2 * hosts
+    # one connection for the hosts pages and one per worker process
+    assert satellite_server.connections <= 3
+    assert api.inspect_scan_task.inspection_result.systems.count() == hosts
@@ -59,6 +59,22 @@ def mock_sat_exception(
     raise SatelliteException()
 
 
+def mock_apply_async(system_inspection_result):
+    """Mock Pool.apply_async to return host details results right away."""
+    # pylint: disable=unused-argument
+    def apply_async(pool, func, args, callback=None, error_callback=None):
+        callback(
+            {
+                "unique_name": f"{args[3]}_{args[2]}",
+                "system_inspection_result": system_inspection_result,
+                "host_fields_response": {},
+                "host_subscriptions_response": {},
+            }
+        )
+
+    return apply_async
+
+
 # pylint: disable=too-many-instance-attributes
 class SatelliteSixV1Test(TestCase):
     """Tests Satellite 6 v1 functions."""
@@ -481,19 +497,15 @@ class SatelliteSixV1Test(TestCase):
             with self.assertRaises(SatelliteException):
                 self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
 
-    @patch(
-        "multiprocessing.pool.Pool.starmap",
-        return_value=[
-            {
-                "unique_name": "sys_1",
-                "system_inspection_result": "failed",
-                "host_fields_response": {},
-                "host_subscriptions_response": {},
-            }
-        ],
-    )
-    def test_hosts_facts(self, mock_pool):
+    @patch("multiprocessing.pool.Pool.apply_async", new=mock_apply_async("failed"))
+    def test_hosts_facts(self):
         """Test the method hosts."""
+        for name in ("sys2_2", "sys3_3"):
+            SystemConnectionResult.objects.create(
+                name=name,
+                status=SystemInspectionResult.SUCCESS,
+                task_connection_result=self.api.connect_scan_task.connection_result,
+            )
         hosts_url = (
             "https://{sat_host}:{port}/katello/api/v2/organizations/{org_id}/systems"
         )
@@ -513,7 +525,7 @@ class SatelliteSixV1Test(TestCase):
                     mocker.get(url, status_code=200, json=jsonresult)
                     self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
                     inspect_result = self.scan_task.inspection_result
-                    self.assertEqual(len(inspect_result.systems.all()), 1)
+                    self.assertEqual(len(inspect_result.systems.all()), 3)
 
 
 # pylint: disable=too-many-instance-attributes
@@ -1007,18 +1019,8 @@ class SatelliteSixV2Test(TestCase):
             with self.assertRaises(SatelliteException):
                 self.api.hosts_facts(Value("i", ScanJob.JOB_RUN))
 
-    @patch(
-        "multiprocessing.pool.Pool.starmap",
-        return_value=[
-            {
-                "unique_name": "sys_1",
-                "system_inspection_result": "success",
-                "host_fields_response": {},
-                "host_subscriptions_response": {},
-            }
-        ],
-    )
-    def test_hosts_facts(self, mock_pool):
+    @patch("multiprocessing.pool.Pool.apply_async", new=mock_apply_async("success"))
+    def test_hosts_facts(self):
         """Test the hosts_facts method."""
         scan_options = ScanOptions(max_concurrency=10)
         scan_options.save()
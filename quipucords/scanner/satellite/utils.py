@@ -15,6 +15,7 @@ import ssl
 import xmlrpc.client
 
 import requests
+from requests.adapters import HTTPAdapter
 from rest_framework import status as codes
 
 from api.vault import decrypt_data_as_unicode
@@ -106,9 +107,49 @@ def construct_url(url, sat_host, port="443", org_id=None, host_id=None):
     return url.format(sat_host=sat_host, port=port, org_id=org_id, host_id=host_id)
 
 
+def get_request_options(scan_task):
+    """Extract the options to request the Satellite server with.
+
+    :param scan_task: The scan task
+    :returns: A dictionary containing the values for ssl_cert_verify,
+        host, port, user, and password.
+    """
+    ssl_cert_verify = True
+    source_options = scan_task.source.options
+    if source_options:
+        ssl_cert_verify = source_options.ssl_cert_verify
+    host, port, user, password = get_connect_data(scan_task)
+    return {
+        "host": host,
+        "port": port,
+        "user": user,
+        "password": password,
+        "ssl_cert_verify": ssl_cert_verify,
+    }
+
+
+def create_session(pool_size=1):
+    """Create a session keeping its connections to the Satellite server alive.
+
+    :param pool_size: The max number of connections kept open to the server
+    :returns: A requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 # pylint: disable=too-many-arguments
 def execute_request(
-    scan_task, url, org_id=None, host_id=None, query_params=None, options=None
+    scan_task,
+    url,
+    org_id=None,
+    host_id=None,
+    query_params=None,
+    options=None,
+    session=None,
 ):
     """Execute a request to the Satellite server.
 
@@ -119,27 +160,24 @@ def execute_request(
     :param query_params: A dictionary to use for query_params in the url
     :param options: A dictionary containing the values for ssl_cert_verify,
         host, port, user, and password.
+    :param session: The requests.Session to reuse connections from, if any
     :returns: The response object
     :throws: Timeout
     """
-    if options:
-        ssl_verify = options.get("ssl_cert_verify")
-        host = options.get("host")
-        port = options.get("port")
-        user = options.get("user")
-        password = options.get("password")
-    else:
-        ssl_verify = True
-        source_options = scan_task.source.options
-        if source_options:
-            ssl_verify = source_options.ssl_cert_verify
-        host, port, user, password = get_connect_data(scan_task)
+    if not options:
+        options = get_request_options(scan_task)
+    ssl_verify = options.get("ssl_cert_verify")
+    host = options.get("host")
+    port = options.get("port")
+    user = options.get("user")
+    password = options.get("password")
     url = construct_url(url, host, port, org_id, host_id)
 
     connect_timeout = settings.QPC_SSH_CONNECT_TIMEOUT
     inspect_timeout = settings.QPC_SSH_INSPECT_TIMEOUT
 
-    response = requests.get(
+    get = requests.get if session is None else session.get
+    response = get(
         url,
         auth=(user, password),
         timeout=(connect_timeout, inspect_timeout),
@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+#
+"""In-memory accumulator for scan task statistics."""
+
+import time
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from api.models import ScanTask
+
+STATS_FIELDS = (
+    "systems_count",
+    "systems_scanned",
+    "systems_failed",
+    "systems_unreachable",
+)
+
+
+class StatsAccumulator:
+    """Count systems in memory and save them to the ScanTask periodically.
+
+    Increments are applied to the scan task instance right away, so counts
+    can be read and logged without querying the database. The database row
+    is updated with atomic F() increments once flush_count increments are
+    pending, flush_interval seconds have passed since the last flush or when
+    flush is called.
+    """
+
+    def __init__(self, scan_task, flush_interval=None, flush_count=None):
+        """Initialize StatsAccumulator.
+
+        :param scan_task: the scan task whose stats are updated
+        :param flush_interval: max number of seconds between flushes.
+            Defaults to settings.QPC_STATS_FLUSH_INTERVAL.
+        :param flush_count: max number of pending increments.
+            Defaults to settings.QPC_STATS_FLUSH_COUNT.
+        """
+        self.scan_task = scan_task
+        if flush_interval is None:
+            flush_interval = settings.QPC_STATS_FLUSH_INTERVAL
+        if flush_count is None:
+            flush_count = settings.QPC_STATS_FLUSH_COUNT
+        self.flush_interval = flush_interval
+        self.flush_count = max(flush_count, 1)
+        self._pending = dict.fromkeys(STATS_FIELDS, 0)
+        self._pending_increments = 0
+        self._last_flush = time.monotonic()
+
+    # pylint: disable=too-many-arguments
+    def increment(
+        self,
+        name,
+        increment_sys_count=False,
+        increment_sys_scanned=False,
+        increment_sys_failed=False,
+        increment_sys_unreachable=False,
+        prefix="PROCESSING",
+    ):
+        """Increment scan task stats.
+
+        Takes the same arguments as ScanTask.increment_stats.
+        """
+        increments = zip(
+            STATS_FIELDS,
+            (
+                increment_sys_count,
+                increment_sys_scanned,
+                increment_sys_failed,
+                increment_sys_unreachable,
+            ),
+        )
+        for field, increment in increments:
+            if increment:
+                self._pending[field] += 1
+                setattr(
+                    self.scan_task, field, (getattr(self.scan_task, field) or 0) + 1
+                )
+        self._pending_increments += 1
+        # pylint: disable=protected-access
+        self.scan_task._log_stats(f"{prefix} {name}.")
+
+        if (
+            self._pending_increments >= self.flush_count
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Save pending increments to the database."""
+        self._last_flush = time.monotonic()
+        updates = {
+            field: Coalesce(F(field), 0) + count
+            for field, count in self._pending.items()
+            if count
+        }
+        self._pending = dict.fromkeys(STATS_FIELDS, 0)
+        self._pending_increments = 0
+        if not updates:
+            return
+        ScanTask.objects.filter(pk=self.scan_task.pk).update(**updates)
+        # pick up increments made by other writers
+        self.scan_task.refresh_from_db(fields=list(updates))
@@ -21,6 +21,8 @@ from scanner.exceptions import (
     ScanInterruptException,
     ScanPauseException,
 )
+from scanner.fact_writer import FactWriter
+from scanner.stats import StatsAccumulator
 
 
 class ScanTaskRunner(metaclass=ABCMeta):
@@ -39,6 +41,8 @@ class ScanTaskRunner(metaclass=ABCMeta):
         self.scan_job = scan_job
         self.scan_task = scan_task
         self.supports_partial_results = supports_partial_results
+        self.fact_writer = FactWriter(scan_task)
+        self.stats = StatsAccumulator(scan_task)
 
         if not supports_partial_results:
             self.scan_task.reset_stats()
@@ -86,6 +90,10 @@ class ScanTaskRunner(metaclass=ABCMeta):
             return self.handle_interrupt_exception(interrupt_exc, manager_interrupt)
         except ScanFailureError as failure_error:
             return failure_error.message, ScanTask.FAILED
+        finally:
+            # persist buffered results, so they are kept when the scan resumes
+            self.fact_writer.flush()
+            self.stats.flush()
 
     def check_for_interrupt(self, manager_interrupt: Value):
         """Check if task runner should stop.
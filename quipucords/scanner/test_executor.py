@@ -0,0 +1,197 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the scan task graph executor."""
+
+import os
+import time
+from multiprocessing import Value
+from threading import Timer
+from types import SimpleNamespace
+
+import pytest
+
+from api.models import ScanJob, ScanTask
+from scanner.executor import TaskGraphExecutor
+from scanner.job import ScanJobRunner
+from tests.factories import ScanJobFactory, ScanTaskFactory
+
+
+class FakeTaskRunner:
+    """Task runner stand-in recording when it ran."""
+
+    def __init__(self, task_id, log_dir, duration=0.3, status=ScanTask.COMPLETED):
+        """Initialize FakeTaskRunner."""
+        self.scan_task = SimpleNamespace(id=task_id)
+        self.log_path = log_dir / str(task_id)
+        self.duration = duration
+        self.status = status
+
+    @property
+    def times(self):
+        """Return (start, end) times recorded by run_task."""
+        start, end = self.log_path.read_text().split()
+        return float(start), float(end)
+
+
+def run_task(runner, manager_interrupt):
+    """Run a fake task, honoring pause/cancel requests."""
+    start = time.monotonic()
+    status = runner.status
+    deadline = start + runner.duration
+    while time.monotonic() < deadline:
+        if manager_interrupt.value == ScanJob.JOB_TERMINATE_PAUSE:
+            manager_interrupt.value = ScanJob.JOB_TERMINATE_ACK
+            status = ScanTask.PAUSED
+            break
+        time.sleep(0.01)
+    runner.log_path.write_text(f"{start} {time.monotonic()}")
+    if status == "crash":
+        os._exit(1)  # pylint: disable=protected-access
+    if status == "error":
+        raise ValueError("unexpected")
+    return status
+
+
+def overlap(runner1, runner2):
+    """Check if two fake runners ran at the same time."""
+    start1, end1 = runner1.times
+    start2, end2 = runner2.times
+    return start1 < end2 and start2 < end1
+
+
+@pytest.fixture
+def manager_interrupt():
+    """Return a manager interrupt Value."""
+    return Value("i", ScanJob.JOB_RUN)
+
+
+def statuses(results):
+    """Map task ids to statuses."""
+    return {runner.scan_task.id: status for runner, status in results}
+
+
+def test_sequential(tmp_path, manager_interrupt):
+    """Test max_parallel_tasks=1 runs tasks in order in the current process."""
+    runners = [FakeTaskRunner(i, tmp_path, duration=0) for i in (1, 2, 3)]
+    runners[1].status = ScanTask.FAILED
+    executor = TaskGraphExecutor(run_task, manager_interrupt, 1)
+    results = executor.run(runners, {3: {1}})
+    assert [(runner.scan_task.id, status) for runner, status in results] == [
+        (1, ScanTask.COMPLETED),
+        (2, ScanTask.FAILED),
+        (3, ScanTask.COMPLETED),
+    ]
+    assert runners[0].times[1] <= runners[1].times[0] <= runners[2].times[0]
+
+
+def test_parallel_respects_prerequisites(tmp_path, manager_interrupt):
+    """Test independent sources run concurrently, inspections wait connects."""
+    connect1, connect2, inspect1, inspect2 = [
+        FakeTaskRunner(i, tmp_path) for i in (1, 2, 3, 4)
+    ]
+    connect2.duration = 0.6
+    executor = TaskGraphExecutor(run_task, manager_interrupt, 4)
+    results = executor.run([connect1, connect2, inspect1, inspect2], {3: {1}, 4: {2}})
+    assert statuses(results) == {i: ScanTask.COMPLETED for i in (1, 2, 3, 4)}
+    assert overlap(connect1, connect2)
+    assert inspect1.times[0] >= connect1.times[1]
+    assert inspect2.times[0] >= connect2.times[1]
+    # inspect1 doesn't wait for the slower connect2
+    assert overlap(inspect1, connect2)
+
+
+def test_parallel_cap(tmp_path, manager_interrupt):
+    """Test no more than max_parallel_tasks run at the same time."""
+    runners = [FakeTaskRunner(i, tmp_path) for i in (1, 2, 3)]
+    executor = TaskGraphExecutor(run_task, manager_interrupt, 2)
+    results = executor.run(runners, {})
+    assert statuses(results) == {i: ScanTask.COMPLETED for i in (1, 2, 3)}
+    assert overlap(runners[0], runners[1])
+    assert not overlap(runners[0], runners[2]) or not overlap(runners[1], runners[2])
+
+
+def test_parallel_pause(tmp_path, manager_interrupt):
+    """Test pause requests reach every running task."""
+    connect1, connect2, inspect1 = [
+        FakeTaskRunner(i, tmp_path, duration=5) for i in (1, 2, 3)
+    ]
+    executor = TaskGraphExecutor(run_task, manager_interrupt, 2)
+    pause = Timer(
+        0.5, lambda: setattr(manager_interrupt, "value", ScanJob.JOB_TERMINATE_PAUSE)
+    )
+    pause.start()
+    results = executor.run([connect1, connect2, inspect1], {3: {1}})
+    assert statuses(results) == {i: ScanTask.PAUSED for i in (1, 2, 3)}
+    assert manager_interrupt.value == ScanJob.JOB_TERMINATE_ACK
+    assert not inspect1.log_path.exists()
+
+
+@pytest.mark.parametrize("failure", ["crash", "error"])
+def test_parallel_unexpected_failure(tmp_path, manager_interrupt, failure):
+    """Test unexpected failures are reported and stop scheduling."""
+    connect1, connect2, inspect1 = [FakeTaskRunner(i, tmp_path) for i in (1, 2, 3)]
+    connect1.status = failure
+    failed_tasks = []
+    executor = TaskGraphExecutor(
+        run_task,
+        manager_interrupt,
+        2,
+        lambda runner, message: failed_tasks.append((runner, message)),
+    )
+    results = executor.run([connect1, connect2, inspect1], {3: {1}})
+    assert statuses(results) == {1: None, 2: ScanTask.COMPLETED}
+    assert not inspect1.log_path.exists()
+    if failure == "crash":
+        # the worker couldn't record its own failure
+        [(runner, message)] = failed_tasks
+        assert runner is connect1
+        assert message.endswith("exited with code 1.")
+    else:
+        assert not failed_tasks
+
+
+class CrashingTaskRunner:
+    """Task runner whose worker process dies without reporting a result."""
+
+    def __init__(self, scan_task):
+        """Initialize CrashingTaskRunner."""
+        self.scan_task = scan_task
+
+    def run(self, manager_interrupt):
+        """Exit the worker process abruptly."""
+        os._exit(1)  # pylint: disable=protected-access
+
+
+@pytest.mark.django_db(transaction=True)
+def test_job_runner_worker_crash(mocker, settings):
+    """Test a crashed worker process fails its task and the scan job."""
+    settings.QPC_MAX_CONCURRENT_SCAN_TASKS = 2
+    scan_job = ScanJobFactory(
+        status=ScanTask.PENDING, scan_type=ScanTask.SCAN_TYPE_CONNECT
+    )
+    scan_task = ScanTaskFactory(
+        job=scan_job,
+        scan_type=ScanTask.SCAN_TYPE_CONNECT,
+        status=ScanTask.PENDING,
+        sequence_number=1,
+    )
+    mocker.patch.object(
+        ScanJobRunner, "_create_task_runner", side_effect=CrashingTaskRunner
+    )
+    job_runner = ScanJobRunner(scan_job)
+    assert job_runner.run() == ScanTask.FAILED
+
+    scan_task.refresh_from_db()
+    assert scan_task.status == ScanTask.FAILED
+    assert scan_task.status_message.startswith("Worker process ")
+    assert scan_task.status_message.endswith("exited with code 1.")
+    scan_job.refresh_from_db()
+    assert scan_job.status == ScanTask.FAILED
+    assert scan_job.status_message == f"FATAL ERROR. {scan_task.status_message}"
@@ -0,0 +1,89 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the buffered fact writer."""
+
+from multiprocessing import Value
+
+import pytest
+
+from api.models import RawFact, ScanJob, ScanTask, SystemInspectionResult
+from scanner.exceptions import ScanPauseException
+from scanner.fact_writer import FactWriter
+from scanner.task import ScanTaskRunner
+from tests.factories import ScanTaskFactory
+
+
+@pytest.fixture
+def scan_task():
+    """Return an inspection ScanTask."""
+    return ScanTaskFactory(scan_type=ScanTask.SCAN_TYPE_INSPECT)
+
+
+def stored_facts(scan_task):
+    """Return the persisted facts of scan_task, grouped by system name."""
+    return {
+        sys_result.name: (
+            sys_result.status,
+            {fact.name: fact.value for fact in sys_result.facts.all()},
+        )
+        for sys_result in scan_task.inspection_result.systems.all()
+    }
+
+
+@pytest.mark.django_db
+def test_flush(scan_task):
+    """Test buffered results are only saved when flushed."""
+    writer = FactWriter(scan_task, batch_size=100)
+    writer.add("host1", SystemInspectionResult.SUCCESS, {"a": '"x"', "b": ""})
+    writer.add("host2", SystemInspectionResult.FAILED)
+    assert len(writer) == 2
+    assert not scan_task.inspection_result.systems.exists()
+
+    writer.flush()
+    assert not writer
+    assert stored_facts(scan_task) == {
+        "host1": (SystemInspectionResult.SUCCESS, {"a": '"x"', "b": ""}),
+        "host2": (SystemInspectionResult.FAILED, {}),
+    }
+    # flushing an empty writer is a noop
+    writer.flush()
+    assert RawFact.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_flush_on_batch_size(scan_task):
+    """Test results are saved once batch_size facts are buffered."""
+    writer = FactWriter(scan_task, batch_size=3)
+    writer.add("host1", SystemInspectionResult.SUCCESS, {"a": "1", "b": "2"})
+    assert not scan_task.inspection_result.systems.exists()
+    writer.add("host2", SystemInspectionResult.SUCCESS, {"a": "3", "b": "4"})
+    assert not writer
+    assert set(stored_facts(scan_task)) == {"host1", "host2"}
+    assert RawFact.objects.count() == 4
+
+
+class PausedTaskRunner(ScanTaskRunner):
+    """Task runner paused after finding a system."""
+
+    def execute_task(self, manager_interrupt):
+        """Buffer a result and get paused."""
+        self.fact_writer.add("host1", SystemInspectionResult.SUCCESS, {"a": "1"})
+        raise ScanPauseException()
+
+
+@pytest.mark.django_db
+def test_task_runner_flushes_on_pause(scan_task):
+    """Test results found before a pause are persisted."""
+    runner = PausedTaskRunner(scan_task.job, scan_task)
+    _, status = runner.run(Value("i", ScanJob.JOB_RUN))
+    assert status == ScanTask.PAUSED
+    assert stored_facts(scan_task) == {
+        "host1": (SystemInspectionResult.SUCCESS, {"a": "1"})
+    }
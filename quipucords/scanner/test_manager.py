@@ -0,0 +1,212 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the scan job manager scheduler."""
+
+from multiprocessing import Event, Process, Value
+from threading import Thread
+
+import pytest
+
+from api.models import ScanJob, ScanTask, Source
+from scanner.manager import Manager, parse_source_type_limits
+from tests.factories import ScanJobFactory, SourceFactory
+
+
+class FakeJobRunner(Process):
+    """Stand-in for ScanJobRunner that runs until released."""
+
+    def __init__(self, scan_job):
+        """Initialize FakeJobRunner."""
+        super().__init__()
+        self.scan_job = scan_job
+        self.identifier = scan_job.id
+        self.manager_interrupt = Value("i", ScanJob.JOB_RUN)
+        self.started = Event()
+        self.released = Event()
+
+    def run(self):
+        """Wait until released by the test."""
+        self.started.set()
+        self.released.wait(10)
+
+    def finish(self):
+        """Release the fake job and wait for its process to exit."""
+        self.released.set()
+        self.join(10)
+
+
+@pytest.fixture
+def job_runners():
+    """Keep track of fake job runners and make sure they exit."""
+    runners = []
+    yield runners
+    for runner in runners:
+        if runner.pid is not None:
+            runner.finish()
+
+
+@pytest.fixture
+def create_runner(job_runners):
+    """Return a factory of running FakeJobRunners."""
+
+    def _create(scan_type=ScanTask.SCAN_TYPE_INSPECT, source_type=None):
+        scan_job = ScanJobFactory(status=ScanTask.RUNNING, scan_type=scan_type)
+        if source_type:
+            scan_job.sources.add(SourceFactory(source_type=source_type))
+        runner = FakeJobRunner(scan_job)
+        job_runners.append(runner)
+        return runner
+
+    return _create
+
+
+def started_ids(manager):
+    """Return the ids of jobs started by the manager."""
+    return set(manager.running_job_runners)
+
+
+@pytest.mark.parametrize(
+    "limits,expected",
+    [
+        ("", {}),
+        ("network=1", {"network": 1}),
+        (" network=1 , vcenter=3,", {"network": 1, "vcenter": 3}),
+        ("network=0", {"network": 1}),
+        ("network=a,satellite=2", {"satellite": 2}),
+    ],
+)
+def test_parse_source_type_limits(limits, expected):
+    """Test parsing per source type limits."""
+    assert parse_source_type_limits(limits) == expected
+
+
+@pytest.mark.django_db
+def test_max_concurrent_jobs(create_runner):
+    """Test the manager doesn't start more jobs than available slots."""
+    manager = Manager(max_concurrent_jobs=2, source_type_limits={})
+    runner1, runner2, runner3 = [create_runner() for _ in range(3)]
+    for runner in (runner1, runner2, runner3):
+        manager.put(runner)
+
+    manager.work()
+    assert started_ids(manager) == {runner1.identifier, runner2.identifier}
+    assert [entry[-1] for entry in manager.scan_queue] == [runner3]
+
+    runner1.finish()
+    manager._check_finished_jobs()
+    manager.work()
+    assert started_ids(manager) == {runner2.identifier, runner3.identifier}
+    assert not manager.scan_queue
+    runner1.scan_job.refresh_from_db()
+    # fake runner didn't update its job, hence the manager flagged it as failed
+    assert runner1.scan_job.status == ScanTask.FAILED
+
+
+@pytest.mark.django_db
+def test_fingerprint_jobs_have_priority(create_runner):
+    """Test fingerprint (merge) jobs jump ahead of inspection jobs."""
+    manager = Manager(max_concurrent_jobs=1, source_type_limits={})
+    inspect_runner = create_runner()
+    connect_runner = create_runner(scan_type=ScanTask.SCAN_TYPE_CONNECT)
+    merge_runner = create_runner(scan_type=ScanTask.SCAN_TYPE_FINGERPRINT)
+    for runner in (inspect_runner, connect_runner, merge_runner):
+        manager.put(runner)
+
+    manager.work()
+    assert started_ids(manager) == {merge_runner.identifier}
+    assert [entry[-1] for entry in sorted(manager.scan_queue)] == [
+        connect_runner,
+        inspect_runner,
+    ]
+
+
+@pytest.mark.django_db
+def test_source_type_limits(create_runner):
+    """Test per source type limits postpone jobs without blocking others."""
+    manager = Manager(
+        max_concurrent_jobs=3, source_type_limits={Source.NETWORK_SOURCE_TYPE: 1}
+    )
+    network1 = create_runner(source_type=Source.NETWORK_SOURCE_TYPE)
+    network2 = create_runner(source_type=Source.NETWORK_SOURCE_TYPE)
+    vcenter = create_runner(source_type=Source.VCENTER_SOURCE_TYPE)
+    for runner in (network1, network2, vcenter):
+        manager.put(runner)
+
+    manager.work()
+    assert started_ids(manager) == {network1.identifier, vcenter.identifier}
+    assert [entry[-1] for entry in manager.scan_queue] == [network2]
+
+    network1.finish()
+    manager._check_finished_jobs()
+    manager.work()
+    assert started_ids(manager) == {network2.identifier, vcenter.identifier}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "command,interrupt",
+    [("pause", ScanJob.JOB_TERMINATE_PAUSE), ("cancel", ScanJob.JOB_TERMINATE_CANCEL)],
+)
+def test_kill_running_job(create_runner, command, interrupt):
+    """Test killing a running job only interrupts that job."""
+    manager = Manager(max_concurrent_jobs=2, source_type_limits={})
+    runner1, runner2 = create_runner(), create_runner()
+    manager.put(runner1)
+    manager.put(runner2)
+    manager.work()
+
+    manager.kill(runner1.scan_job, command)
+    assert runner1.manager_interrupt.value == interrupt
+    assert runner2.manager_interrupt.value == ScanJob.JOB_RUN
+    assert started_ids(manager) == {runner2.identifier}
+    assert set(manager.terminated_job_runners) == {runner1.identifier}
+
+    # a terminating job keeps its slot until its process exits
+    runner3 = create_runner()
+    manager.put(runner3)
+    manager.work()
+    assert started_ids(manager) == {runner2.identifier}
+
+    runner1.finish()
+    manager._check_terminated_jobs()
+    manager.work()
+    assert not manager.terminated_job_runners
+    assert started_ids(manager) == {runner2.identifier, runner3.identifier}
+
+
+@pytest.mark.django_db
+def test_kill_queued_job(create_runner):
+    """Test killing a queued job removes it from the queue."""
+    manager = Manager(max_concurrent_jobs=1, source_type_limits={})
+    runner1, runner2 = create_runner(), create_runner()
+    manager.put(runner1)
+    manager.put(runner2)
+
+    assert manager.kill(runner1.scan_job, "cancel")
+    assert [entry[-1] for entry in manager.scan_queue] == [runner2]
+    assert not manager.kill(runner1.scan_job, "cancel")
+
+
+@pytest.mark.django_db
+def test_put_wakes_up_run_loop(mocker, create_runner):
+    """Test queued jobs start without waiting for a polling interval."""
+    mocker.patch.object(Manager, "restart_incomplete_scansjobs")
+    mocker.patch.object(Manager, "start_log_timer")
+    manager = Manager(max_concurrent_jobs=1, source_type_limits={})
+    thread = Thread(target=manager.run, daemon=True)
+    thread.start()
+    try:
+        runner = create_runner()
+        manager.put(runner)
+        assert runner.started.wait(2)
+    finally:
+        manager.stop()
+        thread.join(2)
+    assert not thread.is_alive()
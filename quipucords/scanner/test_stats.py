@@ -0,0 +1,73 @@
+# Copyright (c) 2023 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public License,
+# version 3 (GPLv3). There is NO WARRANTY for this software, express or
+# implied, including the implied warranties of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. You should have received a copy of GPLv3
+# along with this software; if not, see
+# https://www.gnu.org/licenses/gpl-3.0.txt.
+
+"""Test the scan task stats accumulator."""
+
+import pytest
+
+from api.models import ScanTask
+from scanner.stats import StatsAccumulator
+from tests.factories import ScanTaskFactory
+
+
+@pytest.fixture
+def scan_task():
+    """Return an inspection ScanTask."""
+    return ScanTaskFactory(scan_type=ScanTask.SCAN_TYPE_INSPECT)
+
+
+def db_counts(scan_task):
+    """Return the stats saved for scan_task."""
+    return ScanTask.objects.values_list(
+        "systems_count",
+        "systems_scanned",
+        "systems_failed",
+        "systems_unreachable",
+    ).get(pk=scan_task.pk)
+
+
+@pytest.mark.django_db
+def test_flush_count(scan_task):
+    """Test stats are kept in memory until flush_count increments."""
+    stats = StatsAccumulator(scan_task, flush_interval=3600, flush_count=3)
+    stats.increment("host1", increment_sys_count=True, increment_sys_scanned=True)
+    stats.increment("host2", increment_sys_failed=True)
+    assert scan_task.systems_scanned == 1
+    assert scan_task.systems_failed == 1
+    assert db_counts(scan_task) == (None, None, None, None)
+
+    stats.increment("host3", increment_sys_unreachable=True)
+    assert db_counts(scan_task) == (1, 1, 1, 1)
+
+
+@pytest.mark.django_db
+def test_flush_interval(scan_task):
+    """Test stats are saved once flush_interval has passed."""
+    stats = StatsAccumulator(scan_task, flush_interval=0, flush_count=100)
+    stats.increment("host1", increment_sys_scanned=True)
+    assert db_counts(scan_task) == (None, 1, None, None)
+
+
+@pytest.mark.django_db
+def test_concurrent_writers(scan_task):
+    """Test flushes from several accumulators add up."""
+    other_scan_task = ScanTask.objects.get(pk=scan_task.pk)
+    stats = StatsAccumulator(scan_task, flush_interval=3600)
+    other_stats = StatsAccumulator(other_scan_task, flush_interval=3600)
+    stats.increment("host1", increment_sys_scanned=True)
+    other_stats.increment("host2", increment_sys_scanned=True)
+    other_stats.increment("host3", increment_sys_scanned=True)
+
+    other_stats.flush()
+    stats.flush()
+    assert db_counts(scan_task) == (None, 3, None, None)
+    assert scan_task.systems_scanned == 3
+    # nothing left to flush
+    stats.flush()
+    assert db_counts(scan_task) == (None, 3, None, None)
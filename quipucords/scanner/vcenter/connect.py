@@ -16,7 +16,7 @@ from pyVmomi import vim, vmodl  # pylint: disable=no-name-in-module
 
 from api.models import ScanTask, SystemConnectionResult
 from scanner.task import ScanTaskRunner
-from scanner.vcenter.utils import retrieve_properties, vcenter_connect
+from scanner.vcenter.utils import retrieve_property_pages, vcenter_connect
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -65,9 +65,9 @@ def get_vm_names(content):
         ],
     )
 
-    objects = retrieve_properties(content, [filter_spec])
-    for object_content in objects:
-        vm_names.append(object_content.propSet[0].val)
+    for objects in retrieve_property_pages(content, [filter_spec]):
+        for object_content in objects:
+            vm_names.append(object_content.propSet[0].val)
 
     return vm_names
 
@@ -94,7 +94,7 @@ class ConnectTaskRunner(ScanTaskRunner):
                 task_connection_result=self.scan_task.connection_result,
             )
             sys_result.save()
-            self.scan_task.increment_stats(sys_result.name, increment_sys_scanned=True)
+            self.stats.increment(sys_result.name, increment_sys_scanned=True)
 
         self.scan_task.connection_result.save()
 
@@ -16,13 +16,14 @@ from datetime import datetime
 from django.db import transaction
 from pyVmomi import vim, vmodl  # pylint: disable=no-name-in-module
 
-from api.models import RawFact, ScanTask, SystemInspectionResult
+from api.models import ScanTask, SystemInspectionResult
 from scanner.task import ScanTaskRunner
 from scanner.vcenter.utils import (
     ClusterRawFacts,
     HostRawFacts,
     VcenterRawFacts,
     raw_facts_template,
+    retrieve_property_pages,
     vcenter_connect,
 )
 
@@ -202,74 +203,62 @@ class InspectTaskRunner(ScanTaskRunner):
 
         logger.debug("system %s facts=%s", vm_name, facts)
 
-        sys_result = SystemInspectionResult(
-            name=vm_name,
-            status=SystemInspectionResult.SUCCESS,
-            source=self.scan_task.source,
-            task_inspection_result=self.scan_task.inspection_result,
-        )
-        sys_result.save()
-
-        for key, val in facts.items():
-            if val is not None:
-                final_value = json.dumps(val)
-                stored_fact = RawFact(
-                    name=key, value=final_value, system_inspection_result=sys_result
-                )
-                stored_fact.save()
+        raw_facts = {
+            key: json.dumps(val) for key, val in facts.items() if val is not None
+        }
+        self.fact_writer.add(vm_name, SystemInspectionResult.SUCCESS, raw_facts)
 
-        self.scan_task.increment_stats(vm_name, increment_sys_scanned=True)
+        self.stats.increment(vm_name, increment_sys_scanned=True)
 
     def retrieve_properties(self, content):
         """Retrieve properties from all VirtualMachines.
 
+        The folders, datacenters, clusters and hosts are retrieved first to
+        map each host to its cluster and datacenter. The virtual machines are
+        then retrieved and their facts written one page at a time, so that
+        the whole inventory is never held in memory.
+
         :param content: ServiceInstanceContent from the vCenter connection
         """
-        spec_set = self._filter_set(content.rootFolder)
-        options = vmodl.query.PropertyCollector.RetrieveOptions()
-
-        result = content.propertyCollector.RetrievePropertiesEx(
-            specSet=spec_set, options=options
-        )
-
-        objects = []
+        host_dict = self._retrieve_hosts(content)
 
-        while result is not None:
-            token = result.token
-            objects.extend(result.objects)
+        spec_set = self._filter_set(content.rootFolder, self._vm_property_set())
+        for objects in retrieve_property_pages(content, spec_set):
+            for object_content in objects:
+                if isinstance(object_content.obj, vim.VirtualMachine):
+                    self.parse_vm_props(object_content.propSet, host_dict)
+        self.fact_writer.flush()
+        self.stats.flush()
 
-            if token is None:
-                break
-
-            result = content.propertyCollector.ContinueRetrievePropertiesEx(token)
+    def _retrieve_hosts(self, content):
+        """Retrieve the properties of the hosts and of their parents.
 
+        :param content: ServiceInstanceContent from the vCenter connection
+        :returns: Dictionary of host properties
+        """
         parents_dict = {}
-        for object_content in objects:
-            obj = object_content.obj
-            if isinstance(obj, (vim.Datacenter, vim.Folder)):
-                props = object_content.propSet
-                parents_dict[str(obj)] = self.parse_parent_props(obj, props)
-
-        cluster_dict = {}
-        for object_content in objects:
-            obj = object_content.obj
-
-            if isinstance(obj, vim.ComputeResource):
-                props = object_content.propSet
-                cluster_dict[str(obj)] = self.parse_cluster_props(props, parents_dict)
-
-        host_dict = {}
-        for object_content in objects:
-            obj = object_content.obj
-            if isinstance(obj, vim.HostSystem):
-                props = object_content.propSet
-                host_dict[str(obj)] = self.parse_host_props(props, cluster_dict)
-
-        for object_content in objects:
-            obj = object_content.obj
-            if isinstance(obj, vim.VirtualMachine):
-                props = object_content.propSet
-                self.parse_vm_props(props, host_dict)
+        cluster_props = {}
+        host_props = {}
+        spec_set = self._filter_set(content.rootFolder, self._host_property_set())
+        for objects in retrieve_property_pages(content, spec_set):
+            for object_content in objects:
+                obj = object_content.obj
+                if isinstance(obj, (vim.Datacenter, vim.Folder)):
+                    props = object_content.propSet
+                    parents_dict[str(obj)] = self.parse_parent_props(obj, props)
+                elif isinstance(obj, vim.ComputeResource):
+                    cluster_props[str(obj)] = object_content.propSet
+                elif isinstance(obj, vim.HostSystem):
+                    host_props[str(obj)] = object_content.propSet
+
+        cluster_dict = {
+            obj: self.parse_cluster_props(props, parents_dict)
+            for obj, props in cluster_props.items()
+        }
+        return {
+            obj: self.parse_host_props(props, cluster_dict)
+            for obj, props in host_props.items()
+        }
 
     def _init_stats(self):
         """Initialize the scan_task stats."""
@@ -280,8 +269,8 @@ class InspectTaskRunner(ScanTaskRunner):
             sys_count=connect_scan_task.systems_count,
         )
 
-    def _property_set(self):
-        """Define set of properties for _filter_set."""
+    def _host_property_set(self):
+        """Define set of properties of hosts and their parents for _filter_set."""
         cluster_property_spec = vmodl.query.PropertyCollector.PropertySpec(
             all=False,
             type=vim.ComputeResource,
@@ -313,6 +302,17 @@ class InspectTaskRunner(ScanTaskRunner):
             ],
         )
 
+        property_set = [
+            cluster_property_spec,
+            dc_property_spec,
+            folder_property_spec,
+            host_property_spec,
+        ]
+
+        return property_set
+
+    def _vm_property_set(self):
+        """Define set of properties of virtual machines for _filter_set."""
         vm_property_spec = vmodl.query.PropertyCollector.PropertySpec(
             all=False,
             type=vim.VirtualMachine,
@@ -330,20 +330,13 @@ class InspectTaskRunner(ScanTaskRunner):
             ],
         )
 
-        property_set = [
-            cluster_property_spec,
-            dc_property_spec,
-            folder_property_spec,
-            host_property_spec,
-            vm_property_spec,
-        ]
-
-        return property_set
+        return [vm_property_spec]
 
-    def _filter_set(self, root_folder):
+    def _filter_set(self, root_folder, property_set):
         """Create a filter set for the retrieve properties function.
 
         :param root_folder: root folder of the vcenter hierarchy
+        :param property_set: properties of the objects to retrieve
         """
         # Create traversal set
         folder_to_child_entity = vmodl.query.PropertyCollector.TraversalSpec(
@@ -394,7 +387,7 @@ class InspectTaskRunner(ScanTaskRunner):
         # Create filter set
         filter_spec = [
             vmodl.query.PropertyCollector.FilterSpec(
-                objectSet=object_set, propSet=self._property_set()
+                objectSet=object_set, propSet=property_set
             )
         ]
 
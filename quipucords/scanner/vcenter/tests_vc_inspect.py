@@ -10,13 +10,16 @@
 #
 """Test the vcenter inspect capabilities."""
 
+import gc
 import json
+import weakref
 from datetime import datetime
+from itertools import islice
 from multiprocessing import Value
 from unittest.mock import ANY, Mock, patch
 
-from django.test import TestCase
-from pyVmomi import vim  # pylint: disable=no-name-in-module
+from django.test import TestCase, override_settings
+from pyVmomi import vim, vmodl  # pylint: disable=no-name-in-module
 
 from api.models import Credential, ScanJob, ScanTask, Source
 from scanner.test_util import create_scan_job
@@ -28,6 +31,92 @@ def invalid_login():
     raise vim.fault.InvalidLogin()
 
 
+class FakePropertyCollector:
+    """Property collector of a vCenter with a datacenter, hosts and VMs.
+
+    Pages of objects are created as they are retrieved, and the number of
+    objects retrieved and still referenced is tracked.
+    """
+
+    def __init__(self, hosts, vms):
+        """Initialize FakePropertyCollector."""
+        self.hosts = hosts
+        self.vms = vms
+        self.live_objects = weakref.WeakSet()
+        self.peak_live_objects = 0
+        self.pages = {}
+
+    def RetrievePropertiesEx(self, specSet, options):  # pylint: disable=invalid-name
+        """Retrieve the first page of the objects of specSet."""
+        types = {spec.type for spec in specSet[0].propSet}
+        if vim.VirtualMachine in types:
+            objects, count = self._vms(), self.vms
+        else:
+            objects, count = self._hosts(), 3 + self.hosts
+        token = str(len(self.pages))
+        self.pages[token] = (objects, count, options.maxObjects)
+        return self.ContinueRetrievePropertiesEx(token)
+
+    def ContinueRetrievePropertiesEx(self, token):  # pylint: disable=invalid-name
+        """Retrieve the next page of objects."""
+        gc.collect()
+        objects, count, max_objects = self.pages.pop(token)
+        page = list(islice(objects, max_objects))
+        self.live_objects.update(page)
+        self.peak_live_objects = max(self.peak_live_objects, len(self.live_objects))
+        count -= len(page)
+        if count:
+            self.pages[token] = (objects, count, max_objects)
+        else:
+            token = None
+        return vmodl.query.PropertyCollector.RetrieveResult(token=token, objects=page)
+
+    def CancelRetrievePropertiesEx(self, token):  # pylint: disable=invalid-name
+        """Forget the objects left to retrieve."""
+        del self.pages[token]
+
+    def _hosts(self):
+        """Yield the datacenter, its host folder, cluster and hosts."""
+        datacenter = vim.Datacenter("datacenter-1")
+        folder = vim.Folder("group-h1")
+        cluster = vim.ClusterComputeResource("domain-c1")
+        yield vim.ObjectContent(
+            obj=datacenter, propSet=[vim.DynamicProperty(name="name", val="dc1")]
+        )
+        yield vim.ObjectContent(
+            obj=folder, propSet=[vim.DynamicProperty(name="parent", val=datacenter)]
+        )
+        yield vim.ObjectContent(
+            obj=cluster,
+            propSet=[
+                vim.DynamicProperty(name="name", val="cluster1"),
+                vim.DynamicProperty(name="parent", val=folder),
+            ],
+        )
+        for host in range(self.hosts):
+            yield vim.ObjectContent(
+                obj=vim.HostSystem(f"host-{host}"),
+                propSet=[
+                    vim.DynamicProperty(name="parent", val=cluster),
+                    vim.DynamicProperty(name="summary.config.name", val=f"host{host}"),
+                ],
+            )
+
+    def _vms(self):
+        """Yield the VMs, spread over the hosts."""
+        for vm_id in range(self.vms):
+            yield vim.ObjectContent(
+                obj=vim.VirtualMachine(f"vm-{vm_id}"),
+                propSet=[
+                    vim.DynamicProperty(name="name", val=f"vm{vm_id}"),
+                    vim.DynamicProperty(
+                        name="runtime.host",
+                        val=vim.HostSystem(f"host-{vm_id % self.hosts}"),
+                    ),
+                ],
+            )
+
+
 # pylint: disable=too-many-instance-attributes
 class InspectTaskRunnerTest(TestCase):
     """Tests against the InspectTaskRunner class and functions."""
@@ -223,6 +312,7 @@ class InspectTaskRunnerTest(TestCase):
             return_value=(mac_addresses, ip_addresses),
         ):
             self.runner.parse_vm_props(props, host_dict)
+            self.runner.fact_writer.flush()
 
             inspect_result = self.scan_task.inspection_result
             sys_results = inspect_result.systems.all()
@@ -301,6 +391,28 @@ class InspectTaskRunnerTest(TestCase):
             mock_parse_host_props.assert_called_with(ANY, ANY)
             mock_parse_vm_props.assert_called_with(ANY, ANY)
 
+    def test_retrieve_properties_bounded(self):
+        """Test VMs are retrieved and written without keeping them all."""
+        content = Mock()
+        content.rootFolder = vim.Folder("group-d1")
+        content.propertyCollector = FakePropertyCollector(hosts=5, vms=1000)
+
+        with override_settings(QPC_VCENTER_MAX_OBJECTS=50):
+            self.runner.retrieve_properties(content)
+
+        # the previous page may still be referenced while the next is retrieved
+        self.assertLessEqual(content.propertyCollector.peak_live_objects, 2 * 50)
+        self.assertFalse(content.propertyCollector.pages)
+        systems = self.scan_task.inspection_result.systems
+        self.assertEqual(systems.count(), 1000)
+        vm_facts = {
+            fact.name: json.loads(fact.value)
+            for fact in systems.get(name="vm7").facts.all()
+        }
+        self.assertEqual(vm_facts["vm.host.name"], "host2")
+        self.assertEqual(vm_facts["vm.cluster"], "cluster1")
+        self.assertEqual(vm_facts["vm.datacenter"], "dc1")
+
     def test_inspect(self):
         """Test the inspect method."""
         with patch(
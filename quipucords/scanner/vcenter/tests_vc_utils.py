@@ -12,11 +12,24 @@
 
 from unittest.mock import ANY, Mock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from pyVmomi import vmodl  # pylint: disable=no-name-in-module
 
 from api.models import Credential, ScanTask, Source, SourceOptions
 from scanner.test_util import create_scan_job
-from scanner.vcenter.utils import vcenter_connect
+from scanner.vcenter.utils import retrieve_property_pages, vcenter_connect
+
+
+def mock_property_pages(pages):
+    """Return a content whose property collector retrieves pages."""
+    content = Mock()
+    results = [
+        Mock(objects=page, token=str(number) if number < len(pages) else None)
+        for number, page in enumerate(pages, 1)
+    ]
+    content.propertyCollector.RetrievePropertiesEx.return_value = results[0]
+    content.propertyCollector.ContinueRetrievePropertiesEx.side_effect = results[1:]
+    return content
 
 
 class VCenterUtilsTest(TestCase):
@@ -59,3 +72,55 @@ class VCenterUtilsTest(TestCase):
             mock_smart_connect.assert_called_once_with(
                 host=ANY, user=ANY, pwd=ANY, port=ANY
             )
+
+    @override_settings(QPC_VCENTER_MAX_OBJECTS=2)
+    def test_retrieve_property_pages(self):
+        """Test the pages of properties are retrieved one by one."""
+        content = mock_property_pages([["a", "b"], ["c", "d"], ["e"]])
+        property_collector = content.propertyCollector
+
+        pages = retrieve_property_pages(content, ["spec"])
+        self.assertEqual(next(pages), ["a", "b"])
+        property_collector.ContinueRetrievePropertiesEx.assert_not_called()
+        self.assertEqual(list(pages), [["c", "d"], ["e"]])
+
+        options = property_collector.RetrievePropertiesEx.call_args.kwargs["options"]
+        self.assertEqual(options.maxObjects, 2)
+        property_collector.CancelRetrievePropertiesEx.assert_not_called()
+
+    def test_retrieve_property_pages_canceled(self):
+        """Test the retrieval is canceled when pages are left unread."""
+        content = mock_property_pages([["a", "b"], ["c", "d"], ["e"]])
+        pages = retrieve_property_pages(content, ["spec"], max_objects=2)
+        next(pages)
+        next(pages)
+        pages.close()
+        content.propertyCollector.CancelRetrievePropertiesEx.assert_called_once_with(
+            "2"
+        )
+
+    def test_retrieve_property_pages_continue_error(self):
+        """Test the retrieval is not canceled when the next page fails."""
+        content = mock_property_pages([["a", "b"], ["c", "d"]])
+        property_collector = content.propertyCollector
+        property_collector.ContinueRetrievePropertiesEx.side_effect = (
+            vmodl.fault.InvalidArgument()
+        )
+        pages = retrieve_property_pages(content, ["spec"], max_objects=2)
+        next(pages)
+        with self.assertRaises(vmodl.fault.InvalidArgument):
+            next(pages)
+        property_collector.CancelRetrievePropertiesEx.assert_not_called()
+
+    def test_retrieve_property_pages_cancel_error(self):
+        """Test a failed cancel is logged instead of raised."""
+        content = mock_property_pages([["a", "b"], ["c", "d"]])
+        property_collector = content.propertyCollector
+        property_collector.CancelRetrievePropertiesEx.side_effect = (
+            vmodl.fault.InvalidArgument()
+        )
+        pages = retrieve_property_pages(content, ["spec"], max_objects=2)
+        next(pages)
+        with self.assertLogs("scanner.vcenter.utils", "WARNING"):
+            pages.close()
+        property_collector.CancelRetrievePropertiesEx.assert_called_once_with("1")
@@ -10,13 +10,18 @@
 #
 """Utilities used for VCenter operations."""
 import atexit
+import logging
 import ssl
 
+from django.conf import settings
 from pyVim.connect import Disconnect, SmartConnect, SmartConnectNoSSL
 from pyVmomi import vmodl  # pylint: disable=no-name-in-module
 
 from api.vault import decrypt_data_as_unicode
 
+# Get an instance of a logger
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
 
 def vcenter_connect(scan_task):
     """Connect to VCenter.
@@ -64,34 +69,48 @@ def vcenter_connect(scan_task):
     return vcenter
 
 
-def retrieve_properties(content, filter_spec_set, max_objects=None):
-    """Retrieve properties from a vCenter in an efficient manner.
+def retrieve_property_pages(content, filter_spec_set, max_objects=None):
+    """Retrieve properties from a vCenter one page at a time.
+
+    The retrieval is canceled on the vCenter if the pages are not all
+    consumed.
 
     :param content: Service content from vcenter.RetrieveContent() call
+    :param filter_spec_set: Array of FilterSpec of the objects to retrieve
     :param max_objects: An optional maximum number of objects to return in
-                        in a single page
-    :returns: Array of Object Content
+                        in a single page. Defaults to
+                        settings.QPC_VCENTER_MAX_OBJECTS.
+    :returns: Iterator of arrays of Object Content
     """
+    if max_objects is None:
+        max_objects = settings.QPC_VCENTER_MAX_OBJECTS
     options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=max_objects)
+    property_collector = content.propertyCollector
 
-    retrieve_properties_ex = content.propertyCollector.RetrievePropertiesEx
-    continue_retrieve_properties_ex = (
-        content.propertyCollector.ContinueRetrievePropertiesEx
+    result = property_collector.RetrievePropertiesEx(
+        specSet=filter_spec_set, options=options
     )
-
-    objects = []
-
-    result = retrieve_properties_ex(specSet=filter_spec_set, options=options)
-    while result is not None:
-        objects.extend(result.objects)
-
-        token = result.token
-        if token is None:
-            break
-
-        result = continue_retrieve_properties_ex(token)
-
-    return objects
+    token = None
+    try:
+        while result is not None:
+            token = result.token
+            yield result.objects
+
+            if token is None:
+                break
+
+            # release the page before retrieving the next one
+            result = None
+            next_token, token = token, None
+            result = property_collector.ContinueRetrievePropertiesEx(next_token)
+    finally:
+        if token is not None:
+            try:
+                property_collector.CancelRetrievePropertiesEx(token)
+            except vmodl.MethodFault as error:
+                logger.warning(
+                    "Could not cancel vCenter properties retrieval: %s", error
+                )
 
 
 class HostRawFacts:  # pylint: disable=too-few-public-methods